@@ -45,12 +45,12 @@ def get_personal_data_definition(filename):
     return lis
 
 # check if regulations exist for a particular law, else add empty json
-for d in regulations_dir:
+for d in regulations_dirs():
     regulation_name = d.split("/")[-1]
     if not regulations or regulation_name not in regulations.keys():
         regulations[regulation_name] = {}
 
-for d in regulations_dir:
+for d in regulations_dirs():
     print(f"For the regulation: {d}")
     regulation_name = d.split("/")[-1]
     current_file = None
@@ -4,9 +4,10 @@ Integrates Claude API for intelligent table selection and PII analysis
 """
 
 import anthropic
+import asyncio
 import json
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
 from env_config import env_config
@@ -27,6 +28,12 @@ class PiiDecision:
     confidence: float
     encryption_key_hint: Optional[str] = None
 
+class PartialTableAnalysis(Exception):
+    """Table analysis that fell back to rule-based results for some or all tables; carries the full result"""
+    def __init__(self, message: str, recommendations: List[TableRecommendation]):
+        super().__init__(message)
+        self.recommendations = recommendations
+
 class AIAssistant:
     def __init__(self, api_key: Optional[str] = None):
         """Initialize AI Assistant with Claude API"""
@@ -69,7 +76,7 @@ class AIAssistant:
         avg_table_size = 0
         
         for i in range(sample_size):
-            table_json = json.dumps(tables[i], indent=1)
+            table_json = json.dumps(tables[i], separators=(',', ':'))
             avg_table_size += len(table_json)
         
         avg_table_size = avg_table_size // sample_size
@@ -89,113 +96,151 @@ class AIAssistant:
         self.logger.info(f"Estimated {tokens_per_table} tokens per table, using batch size: {optimal_batch_size}")
         return optimal_batch_size
     
-    async def analyze_tables_for_pii(self, tables: List[Dict[str, Any]]) -> List[TableRecommendation]:
+    async def analyze_tables_for_pii(self, tables: List[Dict[str, Any]],
+                                     on_progress: Optional[Callable[[int, int], None]] = None,
+                                     raise_on_fallback: bool = False) -> List[TableRecommendation]:
         """
         Use AI to analyze table structures and recommend which ones likely contain PII
         Uses batch processing to handle large datasets within token limits
         
         Args:
             tables: List of table metadata (name, schema, columns, sample data)
+            on_progress: Optional callback invoked as (batches_done, total_batches) after each batch
+            raise_on_fallback: Raise PartialTableAnalysis (carrying the result) if any batch fell back to
+                rule-based analysis, so callers can avoid caching it
         
         Returns:
             List of TableRecommendation objects ranked by PII likelihood
         """
         if not self.is_available():
             # Fallback to rule-based analysis
-            return self._fallback_table_analysis(tables)
+            recommendations = self._fallback_table_analysis(tables)
+            if raise_on_fallback:
+                raise PartialTableAnalysis("AI assistant is not available", recommendations)
+            return recommendations
         
         try:
-            # Filter out dbo schema tables first to reduce data size
-            filtered_tables = [t for t in tables if t.get('schema', '').lower() != 'dbo']
-            
-            # Prepare table information for AI analysis with reduced data
-            table_info = []
-            for table in filtered_tables:
-                # Limit column info to reduce token usage
-                columns = table.get('columns', [])
-                if len(columns) > 20:  # Limit columns per table
-                    columns = columns[:20]
-                
-                table_summary = {
-                    'name': table.get('table', 'Unknown'),
-                    'schema': table.get('schema', 'Unknown'),
-                    'columns': [col.get('column', 'Unknown') for col in columns if isinstance(col, dict)],
-                    'row_count': table.get('row_count', 0)
-                }
-                table_info.append(table_summary)
-            
-            # Process tables in batches to avoid token limits
-            batch_size = self._optimize_batch_size(table_info)
             all_recommendations = []
-            
-            for i in range(0, len(table_info), batch_size):
-                batch = table_info[i:i + batch_size]
-                batch_num = i//batch_size + 1
-                total_batches = (len(table_info) + batch_size - 1)//batch_size
-                
-                self.logger.info(f"Processing batch {batch_num} of {total_batches} ({len(batch)} tables)")
-                
-                try:
-                    # Create AI prompt for this batch
-                    prompt = self._create_table_analysis_prompt(batch)
-                    
-                    # Log token usage for debugging
-                    self._log_token_usage(prompt, batch_num, len(batch))
-                    
-                    # Double-check token count
-                    estimated_tokens = self._estimate_token_count(prompt)
-                    if estimated_tokens > 190000:  # Safety check
-                        self.logger.warning(f"Batch {batch_num} estimated at {estimated_tokens} tokens, splitting further")
-                        # Split this batch in half
-                        mid = len(batch) // 2
-                        smaller_batches = [batch[:mid], batch[mid:]] if mid > 0 else [batch]
-                        
-                        for sub_idx, sub_batch in enumerate(smaller_batches):
-                            if sub_batch:  # Only process non-empty batches
-                                sub_prompt = self._create_table_analysis_prompt(sub_batch)
-                                self._log_token_usage(sub_prompt, f"{batch_num}.{sub_idx+1}", len(sub_batch))
-                                
-                                response = self.client.messages.create(
-                                    model=env_config.ai_model_name,
-                                    max_tokens=env_config.ai_max_tokens,
-                                    temperature=env_config.ai_temperature,
-                                    messages=[{"role": "user", "content": sub_prompt}]
-                                )
-                                batch_recommendations = self._parse_table_recommendations(response.content[0].text)
-                                all_recommendations.extend(batch_recommendations)
-                    else:
-                        # Normal batch processing
-                        response = self.client.messages.create(
-                            model=env_config.ai_model_name,
-                            max_tokens=env_config.ai_max_tokens,
-                            temperature=env_config.ai_temperature,
-                            messages=[{"role": "user", "content": prompt}]
-                        )
-                        
-                        # Parse AI response for this batch
-                        batch_recommendations = self._parse_table_recommendations(response.content[0].text)
-                        all_recommendations.extend(batch_recommendations)
-                    
-                except Exception as batch_error:
-                    self.logger.warning(f"Batch {batch_num} failed: {str(batch_error)}, falling back to rule-based analysis")
-                    # Fallback to rule-based for this batch
-                    batch_tables = [filtered_tables[j] for j in range(i, min(i + batch_size, len(filtered_tables)))]
-                    batch_fallback = self._fallback_table_analysis(batch_tables)
-                    all_recommendations.extend(batch_fallback)
+            failed_batches = 0
+            async for batch_num, total_batches, batch_recommendations, used_fallback in self.iter_table_recommendations(tables):
+                all_recommendations.extend(batch_recommendations)
+                failed_batches += used_fallback
+                if on_progress:
+                    on_progress(batch_num, total_batches)
             
             # Sort all recommendations by confidence score
             all_recommendations.sort(key=lambda x: x.confidence_score, reverse=True)
             
             # Return top 30 recommendations
-            return all_recommendations[:30]
+            recommendations = all_recommendations[:30]
             
         except Exception as e:
             self.logger.error(f"AI table analysis failed: {str(e)}")
-            return self._fallback_table_analysis(tables)
+            recommendations = self._fallback_table_analysis(tables)
+            if raise_on_fallback:
+                raise PartialTableAnalysis(f"AI table analysis failed: {e}", recommendations) from e
+            return recommendations
+        
+        if failed_batches and raise_on_fallback:
+            raise PartialTableAnalysis(f"{failed_batches} batch(es) used rule-based analysis", recommendations)
+        return recommendations
+    
+    async def iter_table_recommendations(self, tables: List[Dict[str, Any]]) -> AsyncIterator[Tuple[int, int, List[TableRecommendation], bool]]:
+        """
+        Stream AI table recommendations batch by batch as each Claude response arrives
+        
+        Args:
+            tables: List of table metadata (name, schema, columns, sample data)
+        
+        Yields:
+            (batch_num, total_batches, recommendations, used_fallback) per batch, unranked; used_fallback
+            is True when the batch failed and its recommendations come from rule-based analysis
+        """
+        # Filter out dbo schema tables first to reduce data size
+        filtered_tables = [t for t in tables if t.get('schema', '').lower() != 'dbo']
+        
+        # Prepare table information for AI analysis with reduced data
+        table_info = []
+        for table in filtered_tables:
+            # Limit column info to reduce token usage
+            columns = table.get('columns', [])
+            if len(columns) > 20:  # Limit columns per table
+                columns = columns[:20]
+            
+            table_summary = {
+                'name': table.get('table', 'Unknown'),
+                'schema': table.get('schema', 'Unknown'),
+                'columns': [col.get('column', 'Unknown') for col in columns if isinstance(col, dict)],
+                'row_count': table.get('row_count', 0)
+            }
+            table_info.append(table_summary)
+        
+        # Process tables in batches to avoid token limits
+        batch_size = self._optimize_batch_size(table_info)
+        
+        for i in range(0, len(table_info), batch_size):
+            batch = table_info[i:i + batch_size]
+            batch_num = i//batch_size + 1
+            total_batches = (len(table_info) + batch_size - 1)//batch_size
+            
+            self.logger.info(f"Processing batch {batch_num} of {total_batches} ({len(batch)} tables)")
+            
+            batch_recommendations = []
+            used_fallback = False
+            try:
+                # Create AI prompt for this batch
+                prompt = self._create_table_analysis_prompt(batch)
+                
+                # Log token usage for debugging
+                self._log_token_usage(prompt, batch_num, len(batch))
+                
+                # Double-check token count
+                estimated_tokens = self._estimate_token_count(prompt)
+                if estimated_tokens > 190000:  # Safety check
+                    self.logger.warning(f"Batch {batch_num} estimated at {estimated_tokens} tokens, splitting further")
+                    # Split this batch in half
+                    mid = len(batch) // 2
+                    smaller_batches = [batch[:mid], batch[mid:]] if mid > 0 else [batch]
+                    
+                    for sub_idx, sub_batch in enumerate(smaller_batches):
+                        if sub_batch:  # Only process non-empty batches
+                            sub_prompt = self._create_table_analysis_prompt(sub_batch)
+                            self._log_token_usage(sub_prompt, f"{batch_num}.{sub_idx+1}", len(sub_batch))
+                            
+                            response = await asyncio.to_thread(
+                                self.client.messages.create,
+                                model=env_config.ai_model_name,
+                                max_tokens=env_config.ai_max_tokens,
+                                temperature=env_config.ai_temperature,
+                                messages=[{"role": "user", "content": sub_prompt}]
+                            )
+                            batch_recommendations.extend(self._parse_table_recommendations(response.content[0].text))
+                else:
+                    # Normal batch processing
+                    # Sync client call on a worker thread so the event loop stays free between batches
+                    response = await asyncio.to_thread(
+                        self.client.messages.create,
+                        model=env_config.ai_model_name,
+                        max_tokens=env_config.ai_max_tokens,
+                        temperature=env_config.ai_temperature,
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                    
+                    # Parse AI response for this batch
+                    batch_recommendations = self._parse_table_recommendations(response.content[0].text)
+                
+            except Exception as batch_error:
+                self.logger.warning(f"Batch {batch_num} failed: {str(batch_error)}, falling back to rule-based analysis")
+                # Fallback to rule-based for this batch
+                batch_tables = [filtered_tables[j] for j in range(i, min(i + batch_size, len(filtered_tables)))]
+                batch_recommendations = self._fallback_table_analysis(batch_tables)
+                used_fallback = True
+            
+            yield batch_num, total_batches, batch_recommendations, used_fallback
     
     def _create_table_analysis_prompt(self, tables: List[Dict]) -> str:
         """Create prompt for AI table analysis"""
-        tables_json = json.dumps(tables, indent=1)  # Compact JSON formatting
+        tables_json = json.dumps(tables, separators=(',', ':'))  # Compact JSON: no indentation or padding tokens
         
         return f"""
         As a data privacy expert, analyze these database tables and identify which ones are most likely to contain Personally Identifiable Information (PII).
@@ -446,7 +491,9 @@ class AIAssistant:
         try:
             prompt = self._create_pii_action_prompt(pii_type, value_sample, context)
             
-            response = self.client.messages.create(
+            # Sync client call on a worker thread, so concurrent suggestions (asyncio.gather) overlap
+            response = await asyncio.to_thread(
+                self.client.messages.create,
                 model=env_config.ai_model_name,
                 max_tokens=env_config.ai_max_tokens,
                 temperature=env_config.ai_temperature,
@@ -11,6 +11,20 @@ import logging
 from dataclasses import dataclass
 from config import PII_PATTERNS, PII_COLUMN_INDICATORS, SCAN_CONFIG
 
+def _build_pattern_cache() -> Tuple[Dict[str, re.Pattern], re.Pattern]:
+    """Compile every PII regex once per process, plus a combined any-match prefilter"""
+    compiled = {}
+    for pii_type, config in PII_PATTERNS.items():
+        try:
+            compiled[pii_type] = re.compile(config['pattern'], re.IGNORECASE)
+        except re.error as e:
+            logging.getLogger(__name__).error(f"Failed to compile pattern for {pii_type}: {e}")
+    # One alternation lets cells without any PII be rejected in a single scan
+    combined = re.compile('|'.join(f'(?:{p.pattern})' for p in compiled.values()), re.IGNORECASE)
+    return compiled, combined
+
+_COMPILED_PATTERNS, _ANY_PII_PATTERN = _build_pattern_cache()
+
 @dataclass
 class PIIMatch:
     """Represents a PII match found in data"""
@@ -41,14 +55,8 @@ class PIIDetector:
         self.patterns = self._compile_patterns()
     
     def _compile_patterns(self) -> Dict[str, re.Pattern]:
-        """Compile regex patterns for PII detection"""
-        compiled_patterns = {}
-        for pii_type, config in PII_PATTERNS.items():
-            try:
-                compiled_patterns[pii_type] = re.compile(config['pattern'], re.IGNORECASE)
-            except re.error as e:
-                self.logger.error(f"Failed to compile pattern for {pii_type}: {e}")
-        return compiled_patterns
+        """Return the regex patterns for PII detection (compiled once at import)"""
+        return _COMPILED_PATTERNS
     
     def analyze_column_name(self, column_name: str) -> List[str]:
         """Analyze column name for PII indicators"""
@@ -80,6 +88,10 @@ class PIIDetector:
         if not isinstance(text, str) or not text.strip():
             return []
         
+        # Most cells hold no PII; skip the per-pattern scans when nothing matches at all
+        if not _ANY_PII_PATTERN.search(text):
+            return []
+        
         matches = []
         for pii_type, pattern in self.patterns.items():
             for match in pattern.finditer(text):
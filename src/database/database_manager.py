@@ -139,7 +139,7 @@ class DatabaseManager:
         
         return pd.DataFrame(data)
     
-    def execute_query(self, connection_id: str, query: str) -> pd.DataFrame:
+    def execute_query(self, connection_id: str, query: str, params: Optional[List] = None) -> pd.DataFrame:
         """Execute a SQL query and return results"""
         if connection_id not in self.connections:
             raise ValueError(f"Invalid connection ID: {connection_id}")
@@ -91,6 +91,7 @@ class RealDatabaseManager:
             
             self.connections[connection_id] = {
                 'connection': connection,
+                'connection_string': connection_string,
                 'profile_name': profile_name,
                 'server': profile['server'],
                 'database': profile['database'],
@@ -203,6 +204,67 @@ class RealDatabaseManager:
             self.logger.error(f"Error getting columns: {str(e)}")
             raise Exception(f"Failed to get columns: {str(e)}")
     
+    def get_multiple_table_columns(self, connection_id: str, tables: List[Dict[str, str]]) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Get columns for several tables in one INFORMATION_SCHEMA round-trip
+        
+        Args:
+            connection_id: Database connection ID
+            tables: List of dicts with 'schema' and 'table' keys
+            
+        Returns:
+            Dictionary mapping "schema.table" to the same column dicts as get_table_columns
+        """
+        if connection_id not in self.connections:
+            raise ValueError(f"Invalid connection ID: {connection_id}")
+        
+        results = {f"{t['schema']}.{t['table']}": [] for t in tables}
+        if not results:
+            return results
+        
+        connection = self.connections[connection_id]['connection']
+        
+        # SQL Server has no row-value IN, so match each (schema, table) pair with its own condition
+        conditions = " OR ".join(["(TABLE_SCHEMA = ? AND TABLE_NAME = ?)"] * len(tables))
+        params = [value for t in tables for value in (t['schema'], t['table'])]
+        query = f"""
+        SELECT 
+            TABLE_SCHEMA as table_schema,
+            TABLE_NAME as table_name,
+            COLUMN_NAME as column_name,
+            DATA_TYPE as data_type,
+            CHARACTER_MAXIMUM_LENGTH as max_length,
+            IS_NULLABLE as is_nullable,
+            COLUMN_DEFAULT as default_value
+        FROM INFORMATION_SCHEMA.COLUMNS 
+        WHERE {conditions}
+        ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+        """
+        
+        try:
+            cursor = connection.cursor()
+            
+            try:
+                cursor.execute(query, params)
+                
+                for row in cursor.fetchall():
+                    results.setdefault(f"{row.table_schema}.{row.table_name}", []).append({
+                        'column': row.column_name,
+                        'type': row.data_type,
+                        'max_length': row.max_length,
+                        'nullable': row.is_nullable,
+                        'default': row.default_value
+                    })
+                
+                return results
+                
+            finally:
+                cursor.close()
+            
+        except Exception as e:
+            self.logger.error(f"Error getting columns: {str(e)}")
+            raise Exception(f"Failed to get columns: {str(e)}")
+    
     def sample_table_data(self, connection_id: str, schema: str, table: str, limit: int = 100) -> pd.DataFrame:
         """Get sample data from a table with enhanced error handling and connection management"""
         if connection_id not in self.connections:
@@ -278,31 +340,12 @@ class RealDatabaseManager:
                     self.logger.debug(f"Executing safe query for {schema}.{table}")
                     cursor.execute(safe_query)
                     columns = [column[0] for column in cursor.description]
+                    # pyodbc reports each column's Python type, so conversions are chosen per column, not per cell
+                    column_types = [column[1] for column in cursor.description]
                     
-                    # Fetch rows with robust data type handling
-                    rows = []
+                    # Fetch the raw rows
                     try:
-                        for row in cursor.fetchall():
-                            converted_row = []
-                            for i, value in enumerate(row):
-                                try:
-                                    if value is None:
-                                        converted_row.append(None)
-                                    elif isinstance(value, (str, int, float, bool)):
-                                        converted_row.append(value)
-                                    elif isinstance(value, (bytes, bytearray)):
-                                        # Convert binary data to readable string
-                                        try:
-                                            converted_row.append(value.decode('utf-8', errors='ignore'))
-                                        except:
-                                            converted_row.append(f"<binary:{len(value)}bytes>")
-                                    else:
-                                        # Convert other types (datetime, decimal, etc.) to string
-                                        converted_row.append(str(value))
-                                except Exception as conv_error:
-                                    # Fallback for any conversion issues
-                                    converted_row.append(f"<error:{type(value).__name__}>")
-                            rows.append(converted_row)
+                        rows = [tuple(row) for row in cursor.fetchall()]
                     except Exception as fetch_error:
                         self.logger.warning(f"Error fetching rows from {schema}.{table}: {fetch_error}")
                         rows = []
@@ -310,6 +353,16 @@ class RealDatabaseManager:
                     # Create DataFrame
                     if rows:
                         df = pd.DataFrame(rows, columns=columns)
+                        for col, col_type in zip(columns, column_types):
+                            if col_type in (str, int, float, bool):
+                                continue
+                            values = df[col]
+                            if col_type in (bytes, bytearray):
+                                # Convert binary data to readable string
+                                df[col] = values.map(lambda v: v.decode('utf-8', errors='ignore'), na_action='ignore')
+                            else:
+                                # Convert other types (datetime, decimal, etc.) to string in one pass; NULLs stay None
+                                df[col] = values.astype(str).where(values.notna(), None)
                         self.logger.info(f"Successfully sampled {len(rows)} rows from {schema}.{table}")
                     else:
                         df = pd.DataFrame(columns=columns)
@@ -443,38 +496,28 @@ class RealDatabaseManager:
             limit: Number of rows to sample (default 10)
             
         Returns:
-            List of dictionaries representing sample rows
+            List of dictionaries representing sample rows; values are plain
+            Python str/int/float/bool/None so they serialize on json.dumps's C path
         """
         try:
             # Use async version to get DataFrame
             df = await self.sample_table_data_async(connection_id, schema, table, limit)
             
             # Convert DataFrame to list of dictionaries
-            if df is not None and not df.empty and 'Error' not in df.columns:
+            if len(df) > 0 and 'Error' not in df.columns:
                 # Convert to dict and handle any problematic data types
-                sample_data = []
-                for _, row in df.iterrows():
-                    row_dict = {}
-                    for col, value in row.items():
-                        # Convert problematic types to strings for JSON serialization
-                        try:
-                            if pd.isna(value):
-                                row_dict[col] = None
-                            elif isinstance(value, (str, int, float, bool)):
-                                row_dict[col] = value
-                            else:
-                                # Convert datetime, decimal, etc. to string
-                                row_dict[col] = str(value)
-                        except:
-                            row_dict[col] = str(value)
-                    sample_data.append(row_dict)
+                notna = df.notna()
+                cols = df.columns.tolist()
+                # astype(object) boxes numpy scalars into native Python int/float/bool
+                values = df.astype(object).where(notna, None).to_numpy()
+                sample_data = [dict(zip(cols, row)) for row in values]
                 
                 return sample_data[:limit]  # Ensure we don't exceed limit
             else:
                 return []
                 
         except Exception as e:
-            self.logger.warning(f"Could not async sample data from {table}: {str(e)}")
+            self.logger.warning("Could not async sample data from %s: %s", table, e)
             return []
     
     def sample_multiple_tables_sync(self, connection_id: str, tables: List[Dict[str, str]], limit: int = 100) -> Dict[str, pd.DataFrame]:
@@ -551,15 +594,15 @@ class RealDatabaseManager:
             self.logger.error(f"Error getting row count: {str(e)}")
             return 0
     
-    def execute_query(self, connection_id: str, query: str) -> pd.DataFrame:
-        """Execute a SQL query and return results"""
+    def execute_query(self, connection_id: str, query: str, params: Optional[List] = None) -> pd.DataFrame:
+        """Execute a SQL query (with optional ``?`` parameters) and return results"""
         if connection_id not in self.connections:
             raise ValueError(f"Invalid connection ID: {connection_id}")
         
         connection = self.connections[connection_id]['connection']
         
         try:
-            df = pd.read_sql(query, connection)
+            df = pd.read_sql(query, connection, params=params)
             return df
             
         except Exception as e:
@@ -647,6 +690,28 @@ class RealDatabaseManager:
             self.logger.error(f"Error searching columns: {str(e)}")
             return []
     
+    def open_worker_connection(self, connection_id: str):
+        """
+        Open an additional connection with the same settings as an existing one,
+        for worker threads that must not share its ODBC connection. The caller closes it.
+        """
+        if connection_id not in self.connections:
+            raise ValueError(f"Invalid connection ID: {connection_id}")
+        
+        return pyodbc.connect(self.connections[connection_id]['connection_string'])
+    
+    def open_worker_connection_id(self, connection_id: str, worker_name: str) -> str:
+        """
+        Register a worker's own connection (see open_worker_connection) under a derived ID,
+        so the manager's methods can run on it. The caller releases it with disconnect().
+        """
+        worker_connection_id = f"{connection_id}#{worker_name}"
+        self.connections[worker_connection_id] = {
+            **self.connections[connection_id],
+            'connection': self.open_worker_connection(connection_id)
+        }
+        return worker_connection_id
+    
     def disconnect(self, connection_id: str):
         """Disconnect from database"""
         if connection_id in self.connections:
@@ -662,8 +727,9 @@ class RealDatabaseManager:
         """Get connection information"""
         if connection_id in self.connections:
             conn_info = self.connections[connection_id].copy()
-            # Don't return the actual connection object
+            # Don't return the actual connection object or the credentials
             conn_info.pop('connection', None)
+            conn_info.pop('connection_string', None)
             return conn_info
         return {}
     
@@ -693,36 +759,26 @@ class RealDatabaseManager:
             limit: Number of rows to sample (default 10)
             
         Returns:
-            List of dictionaries representing sample rows
+            List of dictionaries representing sample rows; values are plain
+            Python str/int/float/bool/None so they serialize on json.dumps's C path
         """
         try:
             # Use existing sample_table_data method to get DataFrame
             df = self.sample_table_data(connection_id, schema, table, limit)
             
             # Convert DataFrame to list of dictionaries
-            if df is not None and not df.empty:
+            if len(df) > 0:
                 # Convert to dict and handle any problematic data types
-                sample_data = []
-                for _, row in df.iterrows():
-                    row_dict = {}
-                    for col, value in row.items():
-                        # Convert problematic types to strings for JSON serialization
-                        try:
-                            if pd.isna(value):
-                                row_dict[col] = None
-                            elif isinstance(value, (str, int, float, bool)):
-                                row_dict[col] = value
-                            else:
-                                # Convert datetime, decimal, etc. to string
-                                row_dict[col] = str(value)
-                        except:
-                            row_dict[col] = str(value)
-                    sample_data.append(row_dict)
+                notna = df.notna()
+                cols = df.columns.tolist()
+                # astype(object) boxes numpy scalars into native Python int/float/bool
+                values = df.astype(object).where(notna, None).to_numpy()
+                sample_data = [dict(zip(cols, row)) for row in values]
                 
                 return sample_data[:limit]  # Ensure we don't exceed limit
             else:
                 return []
                 
         except Exception as e:
-            self.logger.warning(f"Could not sample data from {table}: {str(e)}")
+            self.logger.warning("Could not sample data from %s: %s", table, e)
             return []
@@ -4,11 +4,76 @@ Uses VS Code's SQL Server extension tools for database connections
 """
 
 import pandas as pd
+from collections import namedtuple
 from typing import List, Dict, Tuple, Optional
 import logging
 import json
+from faker import Faker
 from config import DATABASE_PROFILES
 
+# Shared generator: building Faker() loads every provider, so do it once per process.
+# The fixed seed keeps demo samples reproducible between runs.
+Faker.seed(0)
+_FAKER = Faker()
+
+# Demo column metadata for common PII-containing tables, built once at import
+ColumnInfo = namedtuple('ColumnInfo', 'column type max_length nullable')
+
+_COLUMN_MAPPINGS = {
+    'Users': (
+        ColumnInfo('UserID', 'int', None, 'NO'),
+        ColumnInfo('FirstName', 'nvarchar', 50, 'YES'),
+        ColumnInfo('LastName', 'nvarchar', 50, 'YES'),
+        ColumnInfo('Email', 'nvarchar', 255, 'YES'),
+        ColumnInfo('Phone', 'nvarchar', 20, 'YES'),
+        ColumnInfo('SSN', 'nvarchar', 11, 'YES'),
+        ColumnInfo('DateOfBirth', 'date', None, 'YES'),
+        ColumnInfo('Address', 'nvarchar', 500, 'YES')
+    ),
+    'Customers': (
+        ColumnInfo('CustomerID', 'int', None, 'NO'),
+        ColumnInfo('CompanyName', 'nvarchar', 100, 'YES'),
+        ColumnInfo('ContactName', 'nvarchar', 100, 'YES'),
+        ColumnInfo('ContactEmail', 'nvarchar', 255, 'YES'),
+        ColumnInfo('BillingAddress', 'nvarchar', 500, 'YES'),
+        ColumnInfo('CreditCardNumber', 'nvarchar', 20, 'YES'),
+        ColumnInfo('TaxID', 'nvarchar', 15, 'YES')
+    ),
+    'Employees': (
+        ColumnInfo('EmployeeID', 'int', None, 'NO'),
+        ColumnInfo('FullName', 'nvarchar', 100, 'YES'),
+        ColumnInfo('PersonalEmail', 'nvarchar', 255, 'YES'),
+        ColumnInfo('HomePhone', 'nvarchar', 20, 'YES'),
+        ColumnInfo('HomeAddress', 'nvarchar', 500, 'YES'),
+        ColumnInfo('SocialSecurityNumber', 'nvarchar', 11, 'YES'),
+        ColumnInfo('MedicalRecordNumber', 'nvarchar', 20, 'YES'),
+        ColumnInfo('EmergencyContactPhone', 'nvarchar', 20, 'YES')
+    ),
+    'PersonalInfo': (
+        ColumnInfo('PersonID', 'int', None, 'NO'),
+        ColumnInfo('Race', 'nvarchar', 50, 'YES'),
+        ColumnInfo('Ethnicity', 'nvarchar', 50, 'YES'),
+        ColumnInfo('Religion', 'nvarchar', 50, 'YES'),
+        ColumnInfo('PoliticalAffiliation', 'nvarchar', 50, 'YES'),
+        ColumnInfo('HealthConditions', 'nvarchar', 1000, 'YES'),
+        ColumnInfo('BiometricID', 'nvarchar', 100, 'YES')
+    ),
+    'PaymentInfo': (
+        ColumnInfo('PaymentID', 'int', None, 'NO'),
+        ColumnInfo('CreditCardNumber', 'nvarchar', 20, 'YES'),
+        ColumnInfo('BankAccountNumber', 'nvarchar', 20, 'YES'),
+        ColumnInfo('RoutingNumber', 'nvarchar', 9, 'YES'),
+        ColumnInfo('CardHolderName', 'nvarchar', 100, 'YES'),
+        ColumnInfo('BillingAddress', 'nvarchar', 500, 'YES')
+    )
+}
+
+_DEFAULT_COLUMNS = (
+    ColumnInfo('ID', 'int', None, 'NO'),
+    ColumnInfo('Name', 'nvarchar', 100, 'YES'),
+    ColumnInfo('Data', 'nvarchar', 500, 'YES')
+)
+
 class VSCodeSQLManager:
     """Database manager that uses VS Code SQL Server extension tools"""
     
@@ -74,102 +139,60 @@ class VSCodeSQLManager:
         if connection_id not in self.connections:
             raise ValueError(f"Invalid connection ID: {connection_id}")
         
-        # Sample column data based on common PII-containing tables
-        column_mappings = {
-            'Users': [
-                {'column': 'UserID', 'type': 'int', 'max_length': None, 'nullable': 'NO'},
-                {'column': 'FirstName', 'type': 'nvarchar', 'max_length': 50, 'nullable': 'YES'},
-                {'column': 'LastName', 'type': 'nvarchar', 'max_length': 50, 'nullable': 'YES'},
-                {'column': 'Email', 'type': 'nvarchar', 'max_length': 255, 'nullable': 'YES'},
-                {'column': 'Phone', 'type': 'nvarchar', 'max_length': 20, 'nullable': 'YES'},
-                {'column': 'SSN', 'type': 'nvarchar', 'max_length': 11, 'nullable': 'YES'},
-                {'column': 'DateOfBirth', 'type': 'date', 'max_length': None, 'nullable': 'YES'},
-                {'column': 'Address', 'type': 'nvarchar', 'max_length': 500, 'nullable': 'YES'}
-            ],
-            'Customers': [
-                {'column': 'CustomerID', 'type': 'int', 'max_length': None, 'nullable': 'NO'},
-                {'column': 'CompanyName', 'type': 'nvarchar', 'max_length': 100, 'nullable': 'YES'},
-                {'column': 'ContactName', 'type': 'nvarchar', 'max_length': 100, 'nullable': 'YES'},
-                {'column': 'ContactEmail', 'type': 'nvarchar', 'max_length': 255, 'nullable': 'YES'},
-                {'column': 'BillingAddress', 'type': 'nvarchar', 'max_length': 500, 'nullable': 'YES'},
-                {'column': 'CreditCardNumber', 'type': 'nvarchar', 'max_length': 20, 'nullable': 'YES'},
-                {'column': 'TaxID', 'type': 'nvarchar', 'max_length': 15, 'nullable': 'YES'}
-            ],
-            'Employees': [
-                {'column': 'EmployeeID', 'type': 'int', 'max_length': None, 'nullable': 'NO'},
-                {'column': 'FullName', 'type': 'nvarchar', 'max_length': 100, 'nullable': 'YES'},
-                {'column': 'PersonalEmail', 'type': 'nvarchar', 'max_length': 255, 'nullable': 'YES'},
-                {'column': 'HomePhone', 'type': 'nvarchar', 'max_length': 20, 'nullable': 'YES'},
-                {'column': 'HomeAddress', 'type': 'nvarchar', 'max_length': 500, 'nullable': 'YES'},
-                {'column': 'SocialSecurityNumber', 'type': 'nvarchar', 'max_length': 11, 'nullable': 'YES'},
-                {'column': 'MedicalRecordNumber', 'type': 'nvarchar', 'max_length': 20, 'nullable': 'YES'},
-                {'column': 'EmergencyContactPhone', 'type': 'nvarchar', 'max_length': 20, 'nullable': 'YES'}
-            ],
-            'PersonalInfo': [
-                {'column': 'PersonID', 'type': 'int', 'max_length': None, 'nullable': 'NO'},
-                {'column': 'Race', 'type': 'nvarchar', 'max_length': 50, 'nullable': 'YES'},
-                {'column': 'Ethnicity', 'type': 'nvarchar', 'max_length': 50, 'nullable': 'YES'},
-                {'column': 'Religion', 'type': 'nvarchar', 'max_length': 50, 'nullable': 'YES'},
-                {'column': 'PoliticalAffiliation', 'type': 'nvarchar', 'max_length': 50, 'nullable': 'YES'},
-                {'column': 'HealthConditions', 'type': 'nvarchar', 'max_length': 1000, 'nullable': 'YES'},
-                {'column': 'BiometricID', 'type': 'nvarchar', 'max_length': 100, 'nullable': 'YES'}
-            ],
-            'PaymentInfo': [
-                {'column': 'PaymentID', 'type': 'int', 'max_length': None, 'nullable': 'NO'},
-                {'column': 'CreditCardNumber', 'type': 'nvarchar', 'max_length': 20, 'nullable': 'YES'},
-                {'column': 'BankAccountNumber', 'type': 'nvarchar', 'max_length': 20, 'nullable': 'YES'},
-                {'column': 'RoutingNumber', 'type': 'nvarchar', 'max_length': 9, 'nullable': 'YES'},
-                {'column': 'CardHolderName', 'type': 'nvarchar', 'max_length': 100, 'nullable': 'YES'},
-                {'column': 'BillingAddress', 'type': 'nvarchar', 'max_length': 500, 'nullable': 'YES'}
-            ]
-        }
-        
-        return column_mappings.get(table, [
-            {'column': 'ID', 'type': 'int', 'max_length': None, 'nullable': 'NO'},
-            {'column': 'Name', 'type': 'nvarchar', 'max_length': 100, 'nullable': 'YES'},
-            {'column': 'Data', 'type': 'nvarchar', 'max_length': 500, 'nullable': 'YES'}
-        ])
+        # Hand out plain dicts so callers see the same shape as RealDatabaseManager
+        return [col._asdict() for col in _COLUMN_MAPPINGS.get(table, _DEFAULT_COLUMNS)]
     
-    def sample_table_data_via_vscode(self, connection_id: str, schema: str, table: str, limit: int = 100) -> pd.DataFrame:
-        """Generate sample data that represents what we'd get from real tables"""
-        if connection_id not in self.connections:
-            raise ValueError(f"Invalid connection ID: {connection_id}")
+    def _generate_sample_columns(self, table: str, limit: int) -> Tuple[List[str], List[list]]:
+        """Generate sample column values for a demo table as parallel name/value lists"""
+        fake = _FAKER
+        n = min(max(limit, 1), 100)
         
-        from faker import Faker
-        fake = Faker()
+        # Bind frequently used providers once so the comprehensions skip attribute lookups
+        first_name = fake.first_name
+        last_name = fake.last_name
+        email = fake.email
+        phone = fake.phone_number
+        ssn = fake.ssn
+        name_ = fake.name
+        address = fake.address
+        company = fake.company
+        credit_card = fake.credit_card_number
+        dob = fake.date_of_birth
+        rand_el = fake.random_element
+        rand_num = fake.random_number
         
         # Generate realistic sample data based on table type
         if table == 'Users':
             data = {
-                'UserID': range(1, min(limit, 100) + 1),
-                'FirstName': [fake.first_name() for _ in range(min(limit, 100))],
-                'LastName': [fake.last_name() for _ in range(min(limit, 100))],
-                'Email': [fake.email() for _ in range(min(limit, 100))],
-                'Phone': [fake.phone_number() for _ in range(min(limit, 100))],
-                'SSN': [fake.ssn() for _ in range(min(limit, 100))],
-                'DateOfBirth': [fake.date_of_birth() for _ in range(min(limit, 100))],
-                'Address': [fake.address().replace('\n', ' ') for _ in range(min(limit, 100))]
+                'UserID': range(1, n + 1),
+                'FirstName': [first_name() for _ in range(n)],
+                'LastName': [last_name() for _ in range(n)],
+                'Email': [email() for _ in range(n)],
+                'Phone': [phone() for _ in range(n)],
+                'SSN': [ssn() for _ in range(n)],
+                'DateOfBirth': [dob() for _ in range(n)],
+                'Address': [address().replace('\n', ' ') for _ in range(n)]
             }
         elif table == 'Customers':
             data = {
-                'CustomerID': range(1, min(limit, 100) + 1),
-                'CompanyName': [fake.company() for _ in range(min(limit, 100))],
-                'ContactName': [fake.name() for _ in range(min(limit, 100))],
-                'ContactEmail': [fake.company_email() for _ in range(min(limit, 100))],
-                'BillingAddress': [fake.address().replace('\n', ' ') for _ in range(min(limit, 100))],
-                'CreditCardNumber': [fake.credit_card_number() for _ in range(min(limit, 100))],
-                'TaxID': [fake.ein() for _ in range(min(limit, 100))]
+                'CustomerID': range(1, n + 1),
+                'CompanyName': [company() for _ in range(n)],
+                'ContactName': [name_() for _ in range(n)],
+                'ContactEmail': [fake.company_email() for _ in range(n)],
+                'BillingAddress': [address().replace('\n', ' ') for _ in range(n)],
+                'CreditCardNumber': [credit_card() for _ in range(n)],
+                'TaxID': [fake.ein() for _ in range(n)]
             }
         elif table == 'Employees':
             data = {
-                'EmployeeID': range(1, min(limit, 100) + 1),
-                'FullName': [fake.name() for _ in range(min(limit, 100))],
-                'PersonalEmail': [fake.email() for _ in range(min(limit, 100))],
-                'HomePhone': [fake.phone_number() for _ in range(min(limit, 100))],
-                'HomeAddress': [fake.address().replace('\n', ' ') for _ in range(min(limit, 100))],
-                'SocialSecurityNumber': [fake.ssn() for _ in range(min(limit, 100))],
-                'MedicalRecordNumber': [f"MRN{fake.random_number(digits=8)}" for _ in range(min(limit, 100))],
-                'EmergencyContactPhone': [fake.phone_number() for _ in range(min(limit, 100))]
+                'EmployeeID': range(1, n + 1),
+                'FullName': [name_() for _ in range(n)],
+                'PersonalEmail': [email() for _ in range(n)],
+                'HomePhone': [phone() for _ in range(n)],
+                'HomeAddress': [address().replace('\n', ' ') for _ in range(n)],
+                'SocialSecurityNumber': [ssn() for _ in range(n)],
+                'MedicalRecordNumber': [f"MRN{rand_num(digits=8)}" for _ in range(n)],
+                'EmergencyContactPhone': [phone() for _ in range(n)]
             }
         elif table == 'PersonalInfo':
             races = ['White', 'Black', 'Asian', 'Hispanic', 'Native American', 'Pacific Islander', 'Mixed']
@@ -177,32 +200,53 @@ class VSCodeSQLManager:
             political = ['Democrat', 'Republican', 'Independent', 'Green', 'Libertarian', 'Other']
             
             data = {
-                'PersonID': range(1, min(limit, 100) + 1),
-                'Race': [fake.random_element(races) for _ in range(min(limit, 100))],
-                'Ethnicity': [fake.random_element(['Hispanic', 'Non-Hispanic']) for _ in range(min(limit, 100))],
-                'Religion': [fake.random_element(religions) for _ in range(min(limit, 100))],
-                'PoliticalAffiliation': [fake.random_element(political) for _ in range(min(limit, 100))],
-                'HealthConditions': [fake.sentence() for _ in range(min(limit, 100))],
-                'BiometricID': [f"BIO{fake.random_number(digits=12)}" for _ in range(min(limit, 100))]
+                'PersonID': range(1, n + 1),
+                'Race': [rand_el(races) for _ in range(n)],
+                'Ethnicity': [rand_el(['Hispanic', 'Non-Hispanic']) for _ in range(n)],
+                'Religion': [rand_el(religions) for _ in range(n)],
+                'PoliticalAffiliation': [rand_el(political) for _ in range(n)],
+                'HealthConditions': [fake.sentence() for _ in range(n)],
+                'BiometricID': [f"BIO{rand_num(digits=12)}" for _ in range(n)]
             }
         elif table == 'PaymentInfo':
             data = {
-                'PaymentID': range(1, min(limit, 100) + 1),
-                'CreditCardNumber': [fake.credit_card_number() for _ in range(min(limit, 100))],
-                'BankAccountNumber': [fake.random_number(digits=12) for _ in range(min(limit, 100))],
-                'RoutingNumber': [fake.routing_number() for _ in range(min(limit, 100))],
-                'CardHolderName': [fake.name() for _ in range(min(limit, 100))],
-                'BillingAddress': [fake.address().replace('\n', ' ') for _ in range(min(limit, 100))]
+                'PaymentID': range(1, n + 1),
+                'CreditCardNumber': [credit_card() for _ in range(n)],
+                'BankAccountNumber': [rand_num(digits=12) for _ in range(n)],
+                'RoutingNumber': [fake.routing_number() for _ in range(n)],
+                'CardHolderName': [name_() for _ in range(n)],
+                'BillingAddress': [address().replace('\n', ' ') for _ in range(n)]
             }
         else:
             # Generic data for unknown tables
             data = {
-                'ID': range(1, min(limit, 100) + 1),
-                'Name': [fake.name() for _ in range(min(limit, 100))],
-                'Data': [fake.text(max_nb_chars=200) for _ in range(min(limit, 100))]
+                'ID': range(1, n + 1),
+                'Name': [name_() for _ in range(n)],
+                'Data': [fake.text(max_nb_chars=200) for _ in range(n)]
             }
         
-        return pd.DataFrame(data)
+        return list(data.keys()), [list(values) for values in data.values()]
+    
+    def sample_table_data_via_vscode(self, connection_id: str, schema: str, table: str, limit: int = 100) -> pd.DataFrame:
+        """Generate sample data that represents what we'd get from real tables"""
+        if connection_id not in self.connections:
+            raise ValueError(f"Invalid connection ID: {connection_id}")
+        
+        col_names, col_lists = self._generate_sample_columns(table, limit)
+        return pd.DataFrame(dict(zip(col_names, col_lists)))
+    
+    def _sample_as_records(self, connection_id: str, table: str, limit: int) -> List[Dict]:
+        """Generate sample rows directly as JSON-friendly dicts, skipping DataFrame construction"""
+        if connection_id not in self.connections:
+            raise ValueError(f"Invalid connection ID: {connection_id}")
+        
+        col_names, col_lists = self._generate_sample_columns(table, limit)
+        # Dates are the only non JSON-native values produced, so convert whole columns at once
+        col_lists = [
+            values if isinstance(values[0], (str, int, float, bool)) else [str(v) for v in values]
+            for values in col_lists
+        ]
+        return [dict(zip(col_names, row)) for row in zip(*col_lists)]
     
     def get_tables(self, connection_id: str) -> List[Dict[str, str]]:
         """Wrapper for get_tables_via_vscode"""
@@ -278,36 +322,13 @@ class VSCodeSQLManager:
             limit: Number of rows to sample (default 10)
             
         Returns:
-            List of dictionaries representing sample rows
+            List of dictionaries representing sample rows; values are plain
+            Python str/int/float/bool/None so they serialize on json.dumps's C path
         """
         try:
-            # Use existing sample_table_data method to get DataFrame
-            df = self.sample_table_data(connection_id, schema, table, limit)
-            
-            # Convert DataFrame to list of dictionaries
-            if df is not None and not df.empty:
-                # Convert to dict and handle any problematic data types
-                sample_data = []
-                for _, row in df.iterrows():
-                    row_dict = {}
-                    for col, value in row.items():
-                        # Convert problematic types to strings for JSON serialization
-                        try:
-                            if pd.isna(value):
-                                row_dict[col] = None
-                            elif isinstance(value, (str, int, float, bool)):
-                                row_dict[col] = value
-                            else:
-                                # Convert datetime, decimal, etc. to string
-                                row_dict[col] = str(value)
-                        except:
-                            row_dict[col] = str(value)
-                    sample_data.append(row_dict)
-                
-                return sample_data[:limit]  # Ensure we don't exceed limit
-            else:
-                return []
+            # Build records straight from the generated columns; no DataFrame round-trip
+            return self._sample_as_records(connection_id, table, limit)
                 
         except Exception as e:
-            self.logger.warning(f"Could not sample data from {table}: {str(e)}")
+            self.logger.warning("Could not sample data from %s: %s", table, e)
             return []
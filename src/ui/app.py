@@ -5,7 +5,8 @@ Simplified workflow: Database → AI Discovery → PII Analysis → Data Encrypt
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
+import pyodbc
 from datetime import datetime
 import os
 import time
@@ -15,15 +16,108 @@ import base64
 import json
 import re
 import difflib
-import PyPDF2
-from typing import List, Dict, Optional
+import asyncio
+import queue
+import threading
+import concurrent.futures
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from string import Template
+from typing import List, Dict, Optional, Tuple
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+try:
+    # orjson parses AI responses several times faster; its JSONDecodeError subclasses json's
+    from orjson import loads as _json_loads, dumps as _orjson_dumps, OPT_INDENT_2 as _ORJSON_INDENT_2
+except ImportError:
+    # orjson not installed, use the stdlib parser
+    _json_loads = json.loads
+    _orjson_dumps = None
+
+def _json_bytes(obj, pretty: bool = True) -> bytes:
+    """UTF-8 JSON for display/download, with orjson when available (2-space indent when pretty)"""
+    if _orjson_dumps is not None:
+        try:
+            return _orjson_dumps(obj, option=_ORJSON_INDENT_2 if pretty else 0)
+        except TypeError:
+            pass  # e.g. non-string keys, which only the stdlib encoder accepts
+    return json.dumps(obj, indent=2 if pretty else None).encode('utf-8')
+
+# Copy-on-write: derived frames (column selections, renames, filtered views) share data until written,
+# so the column assignments in the encryption-prep pipeline no longer copy defensively
+try:
+    pd.set_option('mode.copy_on_write', True)
+except KeyError:
+    # pandas without copy-on-write support (its OptionError subclasses KeyError)
+    pass
+
+# First {...} block in an AI response, for replies wrapped in prose or markdown fences
+_JSON_BLOCK_RX = re.compile(r'\{.*\}', re.S)
+
+# Above this many rows, display helpers return plain DataFrames rather than Stylers
+_MAX_STYLED_ROWS = 1000
+
+# Check Results Table display headers and st.dataframe column configs (search results / recent additions)
+_RESULTS_COLUMN_MAPPING = {
+    'id': 'ID',
+    'name': '👤 Name',
+    'source': '📍 Source',
+    'probability': '📊 Probability',
+    'key': '🔑 Key',
+    'encrypt_key': '🔐 Encryption Key',
+    'similarity_score': '🎯 Similarity Score'
+}
+
+_RESULTS_COLUMN_CONFIG = {
+    "ID": st.column_config.NumberColumn("ID", width="small"),
+    "👤 Name": st.column_config.TextColumn("👤 Name", width="medium"),
+    "📍 Source": st.column_config.TextColumn("📍 Source", width="large"),
+    "📊 Probability": st.column_config.NumberColumn("📊 Probability", width="small", format="%.2f"),
+    "🔑 Key": st.column_config.TextColumn("🔑 Key", width="medium"),
+    "🔐 Encryption Key": st.column_config.TextColumn("🔐 Encryption Key", width="medium"),
+    "🎯 Similarity Score": st.column_config.NumberColumn("🎯 Similarity Score", width="small", format="%.2f"),
+}
+
+_RECENT_COLUMN_CONFIG = {
+    "👤 Name": st.column_config.TextColumn("👤 Name", width="medium"),
+    "📍 Source": st.column_config.TextColumn("📍 Source", width="large"),
+    "📊 Probability": st.column_config.NumberColumn("📊 Probability", width="small", format="%.2f"),
+}
+
+# Match-count banner above the search results
+_FOUND_BANNER_HTML = (
+    "<div style='background: linear-gradient(90deg, #4CAF50 0%, #45a049 100%); "
+    "padding: 15px; border-radius: 10px; text-align: center; margin: 10px 0;'>"
+    "<h3 style='color: white; margin: 0; font-weight: bold;'>✅ Found {count} matching record{plural}</h3>"
+    "</div>"
+)
+
+def _format_decimal(values: pd.Series) -> pd.Series:
+    """Two-decimal text for display, 'N/A' for missing values"""
+    return values.map('{:.2f}'.format, na_action='ignore').fillna('N/A')
+
+def _truncate_text(values: pd.Series, width: int) -> pd.Series:
+    """Cut values longer than width to their first width characters plus '...'"""
+    text = values.astype(str)
+    return (text.str.slice(0, width) + '...').where(text.str.len() > width, text)
+
+@lru_cache(maxsize=32)
+def _style_pattern_regex(patterns: tuple) -> re.Pattern:
+    """Compile style substrings into one alternation; ordered lookaheads keep first-pattern-wins"""
+    return re.compile('(?s)^(?:' + '|'.join(f'(?=.*?{re.escape(p)})(?P<g{i}>)' for i, p in enumerate(patterns)) + ')')
 
 def create_enhanced_dataframe(data, column_mappings=None, format_columns=None, style_columns=None):
     """Create an enhanced, styled DataFrame for better display"""
     if not data:
         return None
     
-    df = pd.DataFrame(data)
+    # Column-oriented input ({col: [...]}) maps straight onto column blocks; row
+    # records go through from_records rather than the generic constructor
+    if isinstance(data, dict):
+        df = pd.DataFrame(data)
+    else:
+        df = pd.DataFrame.from_records(data)
     
     # Apply column mappings if provided
     if column_mappings:
@@ -35,31 +129,46 @@ def create_enhanced_dataframe(data, column_mappings=None, format_columns=None, s
             if col in df.columns:
                 df[col] = df[col].apply(formatter)
     
-    # Apply styling if provided
+    # Apply styling if provided. Large frames skip the Styler entirely: st.dataframe then
+    # ships a plain Arrow buffer instead of per-cell style metadata
     styled_df = df
-    if style_columns:
-        def apply_style(val, col_styles):
-            for pattern, style in col_styles.items():
-                if pattern in str(val):
-                    return style
-            return ''
-        
-        for col, styles in style_columns.items():
-            if col in df.columns:
-                styled_df = styled_df.style.applymap(lambda x: apply_style(x, styles), subset=[col])
+    if style_columns and len(df) <= _MAX_STYLED_ROWS:
+        def column_css(series, col_styles):
+            # Single regex pass per column; the group that matched selects the style
+            matched = series.astype(str).str.extract(_style_pattern_regex(tuple(col_styles))).notna().to_numpy()
+            styles = np.array(list(col_styles.values()), dtype=object)
+            return np.where(matched.any(axis=1), styles[matched.argmax(axis=1)], '')
+        
+        styled_cols = [col for col in style_columns if col in df.columns and style_columns[col]]
+        if styled_cols:
+            # One column-wise pass instead of a Python callback per cell
+            styled_df = df.style.apply(lambda s: column_css(s, style_columns[s.name]), axis=0, subset=styled_cols)
     
     return styled_df
 
+_PRIORITY_CSS = {
+    'HIGH': 'background-color: #ffcdd2; color: #d32f2f; font-weight: bold;',
+    'NAME': 'background-color: #ffcdd2; color: #d32f2f; font-weight: bold;',
+    'MEDIUM': 'background-color: #fff3e0; color: #f57c00; font-weight: bold;',
+    'LOW': 'background-color: #e8f5e8; color: #2e7d32; font-weight: bold;'
+}
+_DEFAULT_CSS = 'color: #333; font-weight: normal;'
+
+# Priority/type colouring used by the encryption and results previews
+_RESULT_PRIORITY_CSS = {
+    'HIGH': 'background-color: #ffcdd2; color: #d32f2f; font-weight: bold;',
+    'MEDIUM': 'background-color: #fff3e0; color: #f57c00; font-weight: bold;',
+    'NAME': 'background-color: #ffebee; color: #c62828; font-weight: bold;'
+}
+_RESULT_DEFAULT_CSS = 'background-color: #e8f5e8; color: #2e7d32; font-weight: bold;'
+
 def get_priority_style(val):
     """Get styling for priority/type values"""
-    if val in ['HIGH', 'NAME']:
-        return 'background-color: #ffcdd2; color: #d32f2f; font-weight: bold;'
-    elif val == 'MEDIUM':
-        return 'background-color: #fff3e0; color: #f57c00; font-weight: bold;'
-    elif val == 'LOW':
-        return 'background-color: #e8f5e8; color: #2e7d32; font-weight: bold;'
-    else:
-        return 'color: #333; font-weight: normal;'
+    return _PRIORITY_CSS.get(val, _DEFAULT_CSS)
+
+def style_priority_column(series):
+    """Column-wise priority styling: one vectorized dict map instead of a per-cell callback"""
+    return series.map(_RESULT_PRIORITY_CSS).fillna(_RESULT_DEFAULT_CSS)
 
 # Import our enhanced modules
 import sys
@@ -71,7 +180,7 @@ from database.real_database_manager import RealDatabaseManager
 from database.vscode_sql_manager import VSCodeSQLManager
 from database.multi_database_manager import MultiDatabaseManager
 from core.pii_detector import PIIDetector
-from core.ai_assistant import AIAssistant, ai_assistant
+from core.ai_assistant import AIAssistant, PartialTableAnalysis, ai_assistant
 from core.results_manager import ResultsManager, results_manager, PiiDetectionResult
 from core.encryption_manager import EncryptionManager, encryption_manager, data_protection
 from core.utils import setup_logging, format_risk_score, mask_pii_value
@@ -89,7 +198,19 @@ st.set_page_config(
 # Initialize logging
 logger = setup_logging()
 
+# Shared, process-wide singletons (built once, reused across reruns and sessions)
+@st.cache_resource
+def get_pii_detector():
+    return PIIDetector()
+
+@st.cache_resource(max_entries=8)
+def get_ai_assistant(api_key: str):
+    # Anthropic keys start with "sk-"; anything else (e.g. a half-typed key) falls back to the .env key
+    api_key = (api_key or '').strip()
+    return AIAssistant(api_key=api_key if api_key.startswith('sk-') else None)
+
 # Initialize session state
+# MultiDatabaseManager holds connection state, so like db_manager it is per session
 if 'multi_db_manager' not in st.session_state:
     st.session_state.multi_db_manager = MultiDatabaseManager(use_real_data=True)
     
@@ -102,7 +223,7 @@ if 'db_manager' not in st.session_state:
         st.session_state.connection_type = "VSCode"
     
 if 'pii_detector' not in st.session_state:
-    st.session_state.pii_detector = PIIDetector()
+    st.session_state.pii_detector = get_pii_detector()
 
 if 'ai_assistant' not in st.session_state:
     st.session_state.ai_assistant = ai_assistant
@@ -131,6 +252,111 @@ if 'ai_api_key' not in st.session_state:
 if 'logger' not in st.session_state:
     st.session_state.logger = logger
 
+# Recommendation priorities pre-selected for encryption preparation
+_SELECTED_PRIORITIES = frozenset({"HIGH", "MEDIUM"})
+
+# SAP ECC demo database whose customer/personnel tables are analyzed first
+_SAP_ECC_DATABASE = "ECC60jkl_HACK"
+
+# Schema metadata is cached across reruns so widget changes don't repeat catalog round-trips.
+# The manager is passed in (underscore = not hashed) so the lookups can run on worker threads;
+# connection ids are derived from the profile name, so they key the cache per database.
+# _query_connection_id (not hashed) is the worker's own connection the lookup actually runs on.
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_tables(_db_manager, connection_id: str) -> list:
+    return _db_manager.get_tables(connection_id)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_columns(_db_manager, connection_id: str, schema: str, table: str, _query_connection_id: str = None) -> list:
+    return _db_manager.get_table_columns(_query_connection_id or connection_id, schema, table)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_row_count(_db_manager, connection_id: str, schema: str, table: str, _query_connection_id: str = None) -> int:
+    return _db_manager.get_table_row_count(_query_connection_id or connection_id, schema, table)
+
+def _fetch_table_details(db_manager, connection_id: str, schema: str, table: str,
+                         query_connection_id: str = None) -> Tuple[list, int]:
+    """Columns and row count for one table (runs on a discovery worker thread)"""
+    return (_cached_columns(db_manager, connection_id, schema, table, query_connection_id),
+            _cached_row_count(db_manager, connection_id, schema, table, query_connection_id))
+
+@st.cache_resource
+def _shared_event_loop() -> asyncio.AbstractEventLoop:
+    """One asyncio loop for the whole server, running on a daemon thread and reused across reruns and sessions"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="ai-event-loop", daemon=True).start()
+    return loop
+
+def _run_on_shared_loop(make_coro, on_progress=None):
+    """Run make_coro(report) on the shared loop and wait for it; progress reported by the coroutine
+    is replayed through on_progress here, on the script thread, so Streamlit elements can update"""
+    progress = queue.SimpleQueue()
+    future = asyncio.run_coroutine_threadsafe(make_coro(lambda *args: progress.put(args)), _shared_event_loop())
+    while True:
+        done, _ = concurrent.futures.wait([future], timeout=0.1)
+        while not progress.empty():
+            args = progress.get()
+            if on_progress:
+                on_progress(*args)
+        if done:
+            return future.result()
+
+def _schema_signature(tables: list) -> str:
+    """Hash of schema, table, column names and row counts (not sample data) for result caching"""
+    shape = [
+        (t['schema'], t['table'], sorted(t['column_names']), t.get('row_count', 0))
+        for t in tables
+    ]
+    return hashlib.blake2b(json.dumps(shape).encode('utf-8'), digest_size=16).hexdigest()
+
+def _assistant_identity(assistant) -> str:
+    """Cache-key identity of an AI assistant: its class and a hash of its API key (never the key itself)"""
+    api_key = getattr(assistant, 'api_key', None) or ''
+    return f"{type(assistant).__name__}:{hashlib.blake2b(api_key.encode('utf-8'), digest_size=8).hexdigest()}"
+
+_TABLE_RECOMMENDATIONS_TTL = 3600  # seconds
+
+@st.cache_resource
+def _table_recommendations_store() -> dict:
+    """Process-wide {(database, schema signature, model, assistant): (stored_at, recommendations)}"""
+    return {}
+
+def _cached_table_recommendations(database_name: str, tables: list, assistant, on_progress=None) -> list:
+    """AI table analysis, reused for an hour while the analyzed schema, model and assistant are unchanged.
+
+    Only the recommendations are cached, never Streamlit elements: on a miss the analysis runs here and
+    reports per-batch progress through on_progress; a hit returns at once. Results where any batch fell
+    back to rule-based analysis are returned but not stored.
+    """
+    key = (database_name, _schema_signature(tables), env_config.ai_model_name, _assistant_identity(assistant))
+    store = _table_recommendations_store()
+    now = time.time()
+    for stale_key in [k for k, (stored_at, _) in list(store.items()) if now - stored_at >= _TABLE_RECOMMENDATIONS_TTL]:
+        store.pop(stale_key, None)
+    
+    cached = store.get(key)
+    if cached is not None:
+        return list(cached[1])
+    
+    try:
+        recommendations = _run_on_shared_loop(
+            lambda report: assistant.analyze_tables_for_pii(tables, on_progress=report, raise_on_fallback=True),
+            on_progress
+        )
+    except PartialTableAnalysis as partial:
+        # Use the AI batches that succeeded, but don't cache results that are partly rule-based
+        logger.warning(f"AI table analysis incomplete, not caching: {partial}")
+        return partial.recommendations
+    store[key] = (now, recommendations)
+    return list(recommendations)
+
+def _clear_schema_cache():
+    """Drop cached schema metadata and AI table analysis (e.g. after disconnecting)"""
+    _cached_tables.clear()
+    _cached_columns.clear()
+    _cached_row_count.clear()
+    _table_recommendations_store().clear()
+
 # Import utility functions for regulations processing
 def make_prompt(system_message, user_message):
     """Create a prompt structure for AI interaction"""
@@ -147,12 +373,16 @@ def ask_ai_with_claude(prompt):
             system_msg = prompt[0]["content"] if len(prompt) > 0 else ""
             user_msg = prompt[1]["content"] if len(prompt) > 1 else ""
             
-            # Use the existing AI assistant
+            # Use the existing AI assistant. Both blocks are marked for prompt caching so
+            # re-processing the same regulation PDF reuses the cached prefix server-side.
             response = st.session_state.ai_assistant.client.messages.create(
                 model="claude-3-5-haiku-latest",
                 max_tokens=4000,
-                system=system_msg,
-                messages=[{"role": "user", "content": user_msg}]
+                system=[{"type": "text", "text": system_msg, "cache_control": {"type": "ephemeral"}}],
+                messages=[{
+                    "role": "user",
+                    "content": [{"type": "text", "text": user_msg, "cache_control": {"type": "ephemeral"}}]
+                }]
             )
             return response.content[0].text
         else:
@@ -162,20 +392,34 @@ def ask_ai_with_claude(prompt):
 
 def read_pdf_text(uploaded_file):
     """Extract text from uploaded PDF file"""
-    text = ""
+    # Imported here so only the regulations page pays the PDF library import cost;
+    # PDFium is much faster than PyPDF2, which stays as the fallback
+    try:
+        import pypdfium2
+    except ImportError:
+        pypdfium2 = None
+    
     try:
-        reader = PyPDF2.PdfReader(uploaded_file)
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
+        if pypdfium2 is not None:
+            pdf = pypdfium2.PdfDocument(uploaded_file.getvalue())
+            try:
+                page_texts = (page.get_textpage().get_text_range() for page in pdf)
+                # Collect page texts and join once rather than growing a string per page
+                parts = [page_text + "\n" for page_text in page_texts if page_text]
+            finally:
+                pdf.close()
+        else:
+            import PyPDF2
+            reader = PyPDF2.PdfReader(uploaded_file)
+            parts = [page_text + "\n" for page_text in (page.extract_text() for page in reader.pages) if page_text]
     except Exception as e:
         st.error(f"Error reading PDF: {str(e)}")
         return ""
-    return text
+    return "".join(parts)
 
-def get_personal_data_definition(pdf_text):
-    """Extract personal data definitions from PDF text using AI"""
+@st.cache_data(show_spinner=False)
+def _compute_definition(pdf_hash: str, _pdf_text: str) -> dict:
+    """Run the AI extraction once per distinct PDF; the cache is keyed by content hash only"""
     system_prompt = """You are an expert in laws and regulations. Based on the input text, generate a comprehensive list of attributes that denote personal data according to the regulation.
 
     Please provide:
@@ -192,31 +436,76 @@ def get_personal_data_definition(pdf_text):
     
     Do not make assumptions beyond what's explicitly stated in the document."""
     
-    prompt = make_prompt(system_prompt, pdf_text)
+    prompt = make_prompt(system_prompt, _pdf_text)
     response = ask_ai_with_claude(prompt)
     
+    # Raising keeps unavailable/failed AI calls out of the cache so a retry hits the API again
+    if response.startswith(("AI assistant not available", "Error processing with AI")):
+        raise RuntimeError(response)
+    
     try:
         # Try to parse as JSON
-        json_response = json.loads(response)
+        json_response = _json_loads(response)
         return json_response
     except json.JSONDecodeError:
-        # If not valid JSON, return a structured response
-        return {
-            "regulation_name": "Unknown Regulation",
-            "description": "Regulation document processed",
-            "personal_data_attributes": response.split(",") if "," in response else [response],
-            "key_requirements": ["See full document for details"],
-            "processing_note": "Raw AI response (not structured JSON)",
-            "raw_response": response
-        }
+        # Retry on the embedded JSON block before giving up on structure
+        match = _JSON_BLOCK_RX.search(response)
+        if match:
+            try:
+                return _json_loads(match.group(0))
+            except json.JSONDecodeError:
+                pass
+        return _definition_fallback(response)
+
+def _definition_fallback(response: str) -> dict:
+    """Structured response used when the AI output is not valid JSON"""
+    return {
+        "regulation_name": "Unknown Regulation",
+        "description": "Regulation document processed",
+        "personal_data_attributes": response.split(",") if "," in response else [response],
+        "key_requirements": ["See full document for details"],
+        "processing_note": "Raw AI response (not structured JSON)",
+        "raw_response": response
+    }
+
+def get_personal_data_definition(pdf_text, pdf_hash=None):
+    """Extract personal data definitions from PDF text using AI"""
+    if pdf_hash is None:
+        pdf_hash = hashlib.sha256(pdf_text.encode('utf-8')).hexdigest()
+    
+    try:
+        return _compute_definition(pdf_hash, pdf_text)
+    except RuntimeError as e:
+        return _definition_fallback(str(e))
+
+# Sidebar progress rows styled like st.success / st.info boxes
+_PROGRESS_DONE_TPL = Template("<div style='background: #E8F5E8; color: #2E7D32; padding: 10px 14px; border-radius: 8px; margin: 6px 0;'>✅ $step</div>")
+_PROGRESS_TODO_TPL = Template("<div style='background: #E3F2FD; color: #1565C0; padding: 10px 14px; border-radius: 8px; margin: 6px 0;'>⏳ $step</div>")
+
+def _workflow_state() -> tuple:
+    """Return (has_connection, has_recommendations, has_encryption_data) for this session"""
+    return (
+        st.session_state.current_connection is not None,
+        len(st.session_state.ai_table_recommendations) > 0,
+        st.session_state.get('encryption_preparation_results') is not None
+    )
+
+@st.cache_resource
+def _logo_bytes() -> Optional[bytes]:
+    """Read the sidebar logo once per process (None when the file is missing)"""
+    logo_path = os.path.join(os.path.dirname(__file__), "logo2.png")
+    if not os.path.exists(logo_path):
+        return None
+    with open(logo_path, 'rb') as f:
+        return f.read()
 
 def main():
     # Clean sidebar navigation with logo
     try:
         # Display logo in sidebar
-        logo_path = os.path.join(os.path.dirname(__file__), "logo2.png")
-        if os.path.exists(logo_path):
-            st.sidebar.image(logo_path, width=200)
+        logo_bytes = _logo_bytes()
+        if logo_bytes:
+            st.sidebar.image(logo_bytes, width=200)
         else:
             st.sidebar.title("📋 Navigation")
     except Exception:
@@ -233,7 +522,7 @@ def main():
     )
     if ai_api_key != st.session_state.ai_api_key:
         st.session_state.ai_api_key = ai_api_key
-        st.session_state.ai_assistant = AIAssistant(api_key=ai_api_key)
+        st.session_state.ai_assistant = get_ai_assistant(ai_api_key)
     
     # Clean AI status indicator
     ai_status = "✅ Ready" if st.session_state.ai_assistant.is_available() else "⚠️ Limited Mode"
@@ -242,10 +531,10 @@ def main():
     # Workflow progress - cleaner format
     st.sidebar.subheader("📊 Progress")
     
-    # Check progress
-    has_connection = st.session_state.current_connection is not None
-    has_recommendations = len(st.session_state.ai_table_recommendations) > 0
-    has_encryption_data = st.session_state.get('encryption_preparation_results') is not None
+    # Check progress (stored so the dashboard can reuse it later in this rerun)
+    workflow_state = _workflow_state()
+    st.session_state['_wf_cache'] = workflow_state
+    has_connection, has_recommendations, has_encryption_data = workflow_state
     
     # Clean progress indicators
     progress_items = [
@@ -255,26 +544,19 @@ def main():
         ("Results", has_encryption_data)
     ]
     
-    for step, completed in progress_items:
-        if completed:
-            st.sidebar.success(f"✅ {step}")
-        else:
-            st.sidebar.info(f"⏳ {step}")
+    # One markdown element for all steps instead of a widget per step
+    st.sidebar.markdown(
+        "".join(_PROGRESS_DONE_TPL.substitute(step=step) if completed else _PROGRESS_TODO_TPL.substitute(step=step)
+                for step, completed in progress_items),
+        unsafe_allow_html=True
+    )
     
     # Clean page selection
     if 'current_page' not in st.session_state:
         st.session_state.current_page = "Dashboard"
     
     # Get the index of the current page for the selectbox
-    page_options = [
-        "Dashboard",
-        "1. Connect to Database", 
-        "2. AI Discovery", 
-        "3. Encryption Preparation",
-        "4. Results Display",
-        "5. Check Results Table",
-        "6. Upload Regulations"
-    ]
+    page_options = list(_PAGES)
     
     try:
         current_index = page_options.index(st.session_state.current_page)
@@ -295,20 +577,7 @@ def main():
     # Route to pages based on current_page in session state
     current_page = st.session_state.current_page
     
-    if current_page == "Dashboard":
-        show_dashboard()
-    elif current_page == "1. Connect to Database":
-        show_connect_database()
-    elif current_page == "2. AI Discovery":
-        show_ai_discovery()
-    elif current_page == "3. Encryption Preparation":
-        show_encryption_preparation()
-    elif current_page == "4. Results Display":
-        show_results_display()
-    elif current_page == "5. Check Results Table":
-        show_check_results_table()
-    elif current_page == "6. Upload Regulations":
-        show_upload_regulations()
+    _PAGES.get(current_page, show_dashboard)()
 
 def show_dashboard():
     """Clean and professional dashboard with workflow overview"""
@@ -318,10 +587,8 @@ def show_dashboard():
     st.header("🎯 PII Detection and Encryption Dashboard")
     st.markdown("Follow the workflow below:")
     
-    # Progress indicator
-    has_connection = st.session_state.current_connection is not None
-    has_recommendations = len(st.session_state.ai_table_recommendations) > 0
-    has_encryption_data = st.session_state.get('encryption_preparation_results') is not None
+    # Progress indicator (main() already derived it for the sidebar this rerun)
+    has_connection, has_recommendations, has_encryption_data = st.session_state.get('_wf_cache') or _workflow_state()
     
     progress = 0
     if has_connection: progress += 1
@@ -399,17 +666,75 @@ def show_dashboard():
         
         # Show quick stats when complete
         if st.session_state.get('encryption_preparation_results'):
-            results = st.session_state.encryption_preparation_results
-            name_records = len([r for r in results if r.get('Column_Type') == 'NAME'])
+            stats = _encryption_stats()
             
             stats_col1, stats_col2, stats_col3 = st.columns(3)
             with stats_col1:
-                st.metric("Total Records", f"{len(results):,}")
+                st.metric("Total Records", f"{stats['total']:,}")
             with stats_col2:
-                st.metric("Name Records", f"{name_records:,}")
+                st.metric("Name Records", f"{stats['name']:,}")
             with stats_col3:
                 st.metric("Tables Processed", len(st.session_state.ai_table_recommendations))
 
+# HTML cards for the connect page, built once at import; only the database name varies per rerun
+_CONNECTION_CARD_TPL = Template("""
+<div style='border: 2px solid $border; border-radius: 12px; padding: 20px; margin: 16px 0; background: linear-gradient(135deg, $bg_from 0%, $bg_to 100%); box-shadow: 0 2px 4px rgba(0,0,0,0.05);'>
+    <div style='display: flex; justify-content: space-between; align-items: center;'>
+        <div style='flex: 1;'>
+            <h3 style='color: $title_color; margin: 0 0 8px 0;'>🗄️ $name</h3>
+            <p style='color: $text_color; margin: 4px 0; font-size: 14px;'>$subtitle</p>
+        </div>
+        <div style='text-align: center;'>
+            <div style='background: $border; color: white; padding: 8px 16px; border-radius: 20px; font-size: 14px; font-weight: 500;'>
+                $badge
+            </div>
+        </div>
+    </div>
+</div>
+""")
+
+_ACTIVE_CONNECTION_CARD_TPL = Template(_CONNECTION_CARD_TPL.safe_substitute(
+    border='#4CAF50', bg_from='#E8F5E8', bg_to='#F1F8E9', title_color='#2E7D32',
+    text_color='#388E3C', subtitle='Connected • Ready for PII Analysis', badge='🟢 ONLINE'
+))
+
+_PREVIEW_CONNECTION_CARD_TPL = Template(_CONNECTION_CARD_TPL.safe_substitute(
+    border='#1976D2', bg_from='#E3F2FD', bg_to='#F8FDF8', title_color='#1565C0',
+    text_color='#424242', subtitle='Ready for secure PII analysis', badge='✅ Ready'
+))
+
+_DB_TILE_TPL = Template("""
+<div style='border: 2px solid $border; border-radius: 12px; padding: 16px; margin: 8px 0; background: linear-gradient(135deg, $bg_from 0%, $bg_to 100%);'>
+    <h4 style='color: $title_color; margin: 0 0 8px 0;'>$icon $name</h4>
+    <p style='color: #424242; margin: 4px 0; font-size: 14px;'><strong>$kind</strong></p>
+    <p style='color: #666; margin: 2px 0; font-size: 13px;'>$details</p>
+</div>
+""")
+
+_DB_TILES = {
+    'AdventureWorks2019': _DB_TILE_TPL.substitute(
+        border='#1E88E5', bg_from='#E3F2FD', bg_to='#F3E5F5', title_color='#1565C0', icon='🏢',
+        name='AdventureWorks2019', kind='Microsoft Sample Database', details='HR, Sales & Product Data • ~70 tables'
+    ),
+    'ECC60jkl_HACK': _DB_TILE_TPL.substitute(
+        border='#FB8C00', bg_from='#FFF3E0', bg_to='#FCE4EC', title_color='#E65100', icon='🔧',
+        name='ECC60jkl_HACK', kind='SAP ECC System', details='Enterprise Resource Planning • Complex data'
+    ),
+    'Jde920_demo': _DB_TILE_TPL.substitute(
+        border='#8E24AA', bg_from='#F3E5F5', bg_to='#E8F5E8', title_color='#6A1B9A', icon='⚡',
+        name='Jde920_demo', kind='JD Edwards Demo', details='ERP Demo Environment • Business apps'
+    ),
+    'ORACLE_EBS_HACK': _DB_TILE_TPL.substitute(
+        border='#D32F2F', bg_from='#FFEBEE', bg_to='#FFF3E0', title_color='#C62828', icon='🏛️',
+        name='ORACLE_EBS_HACK', kind='Oracle E-Business Suite', details='Enterprise business data • EBS modules'
+    ),
+}
+
+_GENERIC_DB_TILE_TPL = Template(_DB_TILE_TPL.safe_substitute(
+    border='#546E7A', bg_from='#ECEFF1', bg_to='#F5F5F5', title_color='#37474F', icon='🗄️',
+    kind='Enterprise Database', details='Business data • Various structures'
+))
+
 def show_connect_database():
     """Step 1: Connect to Database - Clean Customer-Friendly UI"""
     # Step 1 Header
@@ -433,21 +758,7 @@ def show_connect_database():
         st.subheader("✅ Active Connection")
         
         # Clean connection status card
-        st.markdown(f"""
-        <div style='border: 2px solid #4CAF50; border-radius: 12px; padding: 20px; margin: 16px 0; background: linear-gradient(135deg, #E8F5E8 0%, #F1F8E9 100%); box-shadow: 0 2px 4px rgba(0,0,0,0.05);'>
-            <div style='display: flex; justify-content: space-between; align-items: center;'>
-                <div style='flex: 1;'>
-                    <h3 style='color: #2E7D32; margin: 0 0 8px 0;'>🗄️ {st.session_state.current_connection}</h3>
-                    <p style='color: #388E3C; margin: 4px 0; font-size: 14px;'>Connected • Ready for PII Analysis</p>
-                </div>
-                <div style='text-align: center;'>
-                    <div style='background: #4CAF50; color: white; padding: 8px 16px; border-radius: 20px; font-size: 14px; font-weight: 500;'>
-                        🟢 ONLINE
-                    </div>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_ACTIVE_CONNECTION_CARD_TPL.substitute(name=st.session_state.current_connection), unsafe_allow_html=True)
         
         # Connection management
         with st.expander("⚙️ Connection Management", expanded=False):
@@ -461,6 +772,9 @@ def show_connect_database():
                     st.session_state.analysis_results = None
                     if 'encryption_preparation_results' in st.session_state:
                         del st.session_state.encryption_preparation_results
+                    st.session_state.pop('encryption_results_df', None)
+                    st.session_state.pop('encryption_stats', None)
+                    _clear_schema_cache()
                     st.success("� Successfully disconnected.")
                     st.rerun()
     
@@ -470,21 +784,7 @@ def show_connect_database():
         st.subheader(f"🎯 Ready to Connect: **{selected_profile}**")
         
         # Create a clean, modern connection preview card
-        st.markdown(f"""
-        <div style='border: 2px solid #1976D2; border-radius: 12px; padding: 20px; margin: 16px 0; background: linear-gradient(135deg, #E3F2FD 0%, #F8FDF8 100%); box-shadow: 0 2px 4px rgba(0,0,0,0.05);'>
-            <div style='display: flex; justify-content: space-between; align-items: center;'>
-                <div style='flex: 1;'>
-                    <h3 style='color: #1565C0; margin: 0 0 8px 0;'>🗄️ {selected_profile}</h3>
-                    <p style='color: #424242; margin: 4px 0; font-size: 14px;'>Ready for secure PII analysis</p>
-                </div>
-                <div style='text-align: center;'>
-                    <div style='background: #1976D2; color: white; padding: 8px 16px; border-radius: 20px; font-size: 14px; font-weight: 500;'>
-                        ✅ Ready
-                    </div>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_PREVIEW_CONNECTION_CARD_TPL.substitute(name=selected_profile), unsafe_allow_html=True)
         
         # Connection features in a clean layout
         col1, col2, col3 = st.columns(3)
@@ -510,22 +810,18 @@ def show_connect_database():
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    # Simulate realistic connection steps
+                    # Connection steps (no artificial delays: sleeping blocks the script thread)
                     status_text.text("🔍 Validating database credentials...")
-                    time.sleep(0.5)
                     progress_bar.progress(0.2)
                     
                     status_text.text("🔐 Establishing secure tunnel...")
-                    time.sleep(0.5)
                     progress_bar.progress(0.5)
                     
                     status_text.text("📊 Verifying database accessibility...")
-                    time.sleep(0.5)
                     progress_bar.progress(0.8)
                     
                     status_text.text("✅ Connection established!")
                     progress_bar.progress(1.0)
-                    time.sleep(0.5)
                     
                     # Clear the progress and show success
                     progress_container.empty()
@@ -540,7 +836,6 @@ def show_connect_database():
                     st.info("🚀 **Ready for AI Discovery!** Proceeding to table analysis...")
                     
                     # Auto-navigate to next step
-                    time.sleep(1)
                     st.session_state.current_page = "2. AI Discovery"
                     st.rerun()
                     
@@ -582,50 +877,7 @@ def show_connect_database():
             with cols[i % 2]:
                 # Create clean, modern database cards with better colors
                 with st.container():
-                    if db_name == 'AdventureWorks2019':
-                        st.markdown("""
-                        <div style='border: 2px solid #1E88E5; border-radius: 12px; padding: 16px; margin: 8px 0; background: linear-gradient(135deg, #E3F2FD 0%, #F3E5F5 100%);'>
-                            <h4 style='color: #1565C0; margin: 0 0 8px 0;'>🏢 AdventureWorks2019</h4>
-                            <p style='color: #424242; margin: 4px 0; font-size: 14px;'><strong>Microsoft Sample Database</strong></p>
-                            <p style='color: #666; margin: 2px 0; font-size: 13px;'>HR, Sales & Product Data • ~70 tables</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                    elif db_name == 'ECC60jkl_HACK':
-                        st.markdown("""
-                        <div style='border: 2px solid #FB8C00; border-radius: 12px; padding: 16px; margin: 8px 0; background: linear-gradient(135deg, #FFF3E0 0%, #FCE4EC 100%);'>
-                            <h4 style='color: #E65100; margin: 0 0 8px 0;'>🔧 ECC60jkl_HACK</h4>
-                            <p style='color: #424242; margin: 4px 0; font-size: 14px;'><strong>SAP ECC System</strong></p>
-                            <p style='color: #666; margin: 2px 0; font-size: 13px;'>Enterprise Resource Planning • Complex data</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                    elif db_name == 'Jde920_demo':
-                        st.markdown("""
-                        <div style='border: 2px solid #8E24AA; border-radius: 12px; padding: 16px; margin: 8px 0; background: linear-gradient(135deg, #F3E5F5 0%, #E8F5E8 100%);'>
-                            <h4 style='color: #6A1B9A; margin: 0 0 8px 0;'>⚡ Jde920_demo</h4>
-                            <p style='color: #424242; margin: 4px 0; font-size: 14px;'><strong>JD Edwards Demo</strong></p>
-                            <p style='color: #666; margin: 2px 0; font-size: 13px;'>ERP Demo Environment • Business apps</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                    elif db_name == 'ORACLE_EBS_HACK':
-                        st.markdown("""
-                        <div style='border: 2px solid #D32F2F; border-radius: 12px; padding: 16px; margin: 8px 0; background: linear-gradient(135deg, #FFEBEE 0%, #FFF3E0 100%);'>
-                            <h4 style='color: #C62828; margin: 0 0 8px 0;'>🏛️ ORACLE_EBS_HACK</h4>
-                            <p style='color: #424242; margin: 4px 0; font-size: 14px;'><strong>Oracle E-Business Suite</strong></p>
-                            <p style='color: #666; margin: 2px 0; font-size: 13px;'>Enterprise business data • EBS modules</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                    else:
-                        st.markdown(f"""
-                        <div style='border: 2px solid #546E7A; border-radius: 12px; padding: 16px; margin: 8px 0; background: linear-gradient(135deg, #ECEFF1 0%, #F5F5F5 100%);'>
-                            <h4 style='color: #37474F; margin: 0 0 8px 0;'>🗄️ {db_name}</h4>
-                            <p style='color: #424242; margin: 4px 0; font-size: 14px;'><strong>Enterprise Database</strong></p>
-                            <p style='color: #666; margin: 2px 0; font-size: 13px;'>Business data • Various structures</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    st.markdown(_DB_TILES.get(db_name) or _GENERIC_DB_TILE_TPL.substitute(name=db_name), unsafe_allow_html=True)
                     
         st.markdown("### 📋 Complete Database Information")
         for db_name in analysis_databases.keys():
@@ -773,28 +1025,23 @@ def show_ai_discovery():
                 progress_bar.progress(0.1)
                 
                 connection_id = st.session_state.db_manager.connect_to_database(database_name)
-                time.sleep(0.5)
                 
                 # Step 2: Get tables from database
                 # st.write("🔄 Step 2: Scanning database schema...")
                 progress_bar.progress(0.3)
                 
-                tables_info = st.session_state.db_manager.get_tables(connection_id)
+                tables_info = _cached_tables(st.session_state.db_manager, connection_id)
                 
                 # Database-specific table prioritization for ECC60jkl_HACK (SAP ECC)
-                if database_name == "ECC60jkl_HACK":
-                    priority_tables = []
-                    other_tables = []
+                if database_name == _SAP_ECC_DATABASE and tables_info:
+                    # Column-wise name arrays so the split is a couple of vectorized string ops
+                    table_names = np.char.upper(np.array([t.get('table', t.get('name', '')) for t in tables_info], dtype=str))
+                    schema_names = np.char.lower(np.array([t.get('schema', '') for t in tables_info], dtype=str))
                     
-                    for table in tables_info:
-                        table_name = table.get('table', table.get('name', '')).upper()
-                        schema_name = table.get('schema', '').lower()
-                        
-                        # Prioritize dbo.KNA1 (Customer Master) and dbo.P* tables (Personnel/HR tables in SAP)
-                        if schema_name == 'dbo' and (table_name == 'KNA1' or table_name.startswith('P')):
-                            priority_tables.append(table)
-                        else:
-                            other_tables.append(table)
+                    # Prioritize dbo.KNA1 (Customer Master) and dbo.P* tables (Personnel/HR tables in SAP)
+                    is_priority = (schema_names == 'dbo') & ((table_names == 'KNA1') | np.char.startswith(table_names, 'P'))
+                    priority_tables = [tables_info[i] for i in np.flatnonzero(is_priority)]
+                    other_tables = [tables_info[i] for i in np.flatnonzero(~is_priority)]
                     
                     # Combine priority tables first, then others
                     tables_info = priority_tables + other_tables
@@ -828,8 +1075,6 @@ def show_ai_discovery():
                 #             st.write(f"  ... and {len(tables_info) - 10} more tables")
                 #             break
                 
-                time.sleep(0.5)
-                
                 # Step 3: Get detailed table information
                 # st.write("🔄 Step 3: Analyzing table structures and columns...")
                 progress_bar.progress(0.5)
@@ -837,35 +1082,72 @@ def show_ai_discovery():
                 detailed_tables = []
                 skipped_tables = []
                 
-                for table_info in tables_info:  # ANALYZE ALL TABLES - no limit!
-                    table_name = table_info.get('table', table_info.get('name', ''))
-                    schema_name = table_info.get('schema', database_name)
-                    
-                    # ENHANCED: Skip tables that start with 'dbo' - these are typically system/utility tables
-                    # But log them so we can see what we're skipping
-                    # if schema_name.lower() == 'dbo':
-                    #     skipped_tables.append(f"{schema_name}.{table_name}")
-                    #     st.session_state.logger.info(f"Skipping dbo table: {schema_name}.{table_name}")
-                    #     continue
-                    
-                    # Get column information
-                    try:
-                        columns = st.session_state.db_manager.get_table_columns(connection_id, schema_name, table_name)
-                        row_count = st.session_state.db_manager.get_table_row_count(connection_id, schema_name, table_name)
-                        
-                        detailed_table = {
-                            'table': table_name,
-                            'schema': schema_name,
-                            'columns': columns,
-                            'row_count': row_count
-                        }
-                        detailed_tables.append(detailed_table)
+                # Fetch columns + row count for all tables concurrently (ANALYZE ALL TABLES - no limit!)
+                # Each worker queries over its own ODBC connection, since the session's connection
+                # cannot serve several threads at once; managers without that support stay sequential
+                db_manager = st.session_state.db_manager
+                can_open_workers = hasattr(db_manager, 'open_worker_connection_id')
+                worker_state = threading.local()
+                worker_connection_ids = []
+                
+                def fetch_table_details(schema_name, table_name):
+                    """_fetch_table_details over the calling thread's connection, opened on first use"""
+                    query_connection_id = getattr(worker_state, 'connection_id', None)
+                    if can_open_workers and query_connection_id is None:
+                        query_connection_id = db_manager.open_worker_connection_id(
+                            connection_id, f"discovery-{threading.get_ident()}")
+                        worker_state.connection_id = query_connection_id
+                        worker_connection_ids.append(query_connection_id)
+                    return _fetch_table_details(db_manager, connection_id, schema_name, table_name, query_connection_id)
+                
+                script_ctx = get_script_run_ctx()
+                try:
+                    with concurrent.futures.ThreadPoolExecutor(
+                        max_workers=16 if can_open_workers else 1,
+                        initializer=lambda: add_script_run_ctx(threading.current_thread(), script_ctx)
+                    ) as executor:
+                        futures = {}
+                        for table_info in tables_info:
+                            table_name = table_info.get('table', table_info.get('name', ''))
+                            schema_name = table_info.get('schema', database_name)
+                            
+                            # ENHANCED: Skip tables that start with 'dbo' - these are typically system/utility tables
+                            # But log them so we can see what we're skipping
+                            # if schema_name.lower() == 'dbo':
+                            #     skipped_tables.append(f"{schema_name}.{table_name}")
+                            #     st.session_state.logger.info(f"Skipping dbo table: {schema_name}.{table_name}")
+                            #     continue
+                            
+                            future = executor.submit(fetch_table_details, schema_name, table_name)
+                            futures[future] = (schema_name, table_name)
                         
-                    except Exception as e:
-                        st.session_state.logger.warning(f"Could not get details for table {table_name}: {e}")
-                        continue
+                        # Get column information as each table completes
+                        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                            schema_name, table_name = futures[future]
+                            progress_bar.progress(0.5 + 0.2 * done / len(futures))
+                            try:
+                                columns, row_count = future.result()
+                                
+                                detailed_table = {
+                                    'table': table_name,
+                                    'schema': schema_name,
+                                    'columns': columns,
+                                    # Column names extracted once; the managers report them under 'column'
+                                    'column_names': [col.get('column', '') for col in columns],
+                                    'row_count': row_count
+                                }
+                                detailed_tables.append(detailed_table)
+                                
+                            except Exception as e:
+                                st.session_state.logger.warning(f"Could not get details for table {table_name}: {e}")
+                                continue
+                finally:
+                    for query_connection_id in worker_connection_ids:
+                        db_manager.disconnect(query_connection_id)
                 
-                time.sleep(0.5)
+                # Keep the prioritized table order regardless of completion order
+                table_order = {(t.get('schema', database_name), t.get('table', t.get('name', ''))): i for i, t in enumerate(tables_info)}
+                detailed_tables.sort(key=lambda t: table_order[(t['schema'], t['table'])])
                 
                 # Step 4: Sample data analysis (if enabled) - ASYNC VERSION
                 if analyze_column_data:
@@ -895,8 +1177,8 @@ def show_ai_discovery():
                         if table_key in sample_results:
                             df = sample_results[table_key]
                             if not df.empty and 'Error' not in df.columns:
-                                # Convert DataFrame to list of dicts for compatibility
-                                table['sample_data'] = df.to_dict('records')
+                                # Keep the DataFrame; column samples are read column-wise from it
+                                table['sample_data'] = df
                                 st.session_state.logger.info(f"✅ Sampled {len(df)} rows from {table_key}")
                             else:
                                 table['sample_data'] = None
@@ -905,8 +1187,6 @@ def show_ai_discovery():
                             table['sample_data'] = None
                             st.session_state.logger.warning(f"⚠️ No results for {table_key}")
                     
-                    time.sleep(0.2)  # Reduced wait time since we're much faster now
-                
                 # Step 5: AI Analysis
                 st.write("🔄 AI analysis and recommendations...")
                 progress_bar.progress(0.9)
@@ -914,20 +1194,40 @@ def show_ai_discovery():
                 # Use AI assistant to analyze tables
                 if ai_available:
                     try:
-                        # Use async AI analysis
-                        import asyncio
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        ai_recommendations = loop.run_until_complete(
-                            st.session_state.ai_assistant.analyze_tables_for_pii(detailed_tables)
+                        # Use async AI analysis on the shared long-lived loop; batches report in as they arrive
+                        batch_status = st.empty()
+                        
+                        def on_ai_batch(done, total):
+                            progress_bar.progress(0.9 + 0.1 * done / total)
+                            batch_status.text(f"🤖 Analyzed batch {done}/{total}")
+                        
+                        ai_recommendations = _cached_table_recommendations(
+                            database_name, detailed_tables, st.session_state.ai_assistant, on_ai_batch
                         )
-                        loop.close()
+                        batch_status.empty()
+                        
+                        # Match all columns against every estimated PII type up front (one pass per type)
+                        table_columns = {
+                            (t['schema'], t['table']): t['column_names']
+                            for t in detailed_tables if t['column_names']
+                        }
+                        estimated_types = [pii_type for ai_rec in ai_recommendations
+                                           if ai_rec.confidence_score >= confidence_threshold
+                                           for pii_type in ai_rec.estimated_pii_types]
+                        found_by_type = _match_columns_by_type(table_columns, estimated_types)
+                        
+                        # Index tables once by (schema, table), with a by-name fallback for recommendations
+                        # without a schema (first occurrence wins, as a linear scan would)
+                        tables_by_key = {(t['schema'], t['table']): t for t in reversed(detailed_tables)}
+                        tables_by_name = {t['table']: t for t in reversed(detailed_tables)}
                         
                         # Convert AI recommendations to our format
                         formatted_recommendations = []
                         for ai_rec in ai_recommendations:
                             # Get the table details for additional info
-                            table_details = next((t for t in detailed_tables if t['table'] == ai_rec.table_name), {})
+                            table_details = (tables_by_key.get((ai_rec.schema, ai_rec.table_name))
+                                             or tables_by_name.get(ai_rec.table_name, {}))
+                            table_key = (table_details.get('schema'), table_details.get('table'))
                             
                             formatted_rec = {
                                 "table_name": ai_rec.table_name,
@@ -938,15 +1238,19 @@ def show_ai_discovery():
                                 "pii_columns": []
                             }
                             
+                            # Below-threshold tables are only counted, never displayed - skip column matching
+                            if ai_rec.confidence_score < confidence_threshold:
+                                formatted_recommendations.append(formatted_rec)
+                                continue
+                            
                             # Create PII columns info from AI estimated types and actual columns
-                            if table_details.get('columns'):
-                                # Get actual column names for this table
-                                actual_columns = [col.get('column_name', col.get('name', '')) for col in table_details['columns']]
+                            if table_details.get('column_names'):
+                                # Flexible fallback: first column per PII type, from a single pass over the columns
+                                flexible_columns = _first_column_per_type(table_columns.get(table_key, []))
                                 
-                                # For each estimated PII type, try to find matching columns
+                                # For each estimated PII type, look up the precomputed matching columns
                                 for pii_type in ai_rec.estimated_pii_types:
-                                    # Find columns that match this PII type
-                                    matching_columns = find_columns_for_pii_type(actual_columns, pii_type)
+                                    matching_columns = found_by_type.get(pii_type, {}).get(table_key, [])
                                     
                                     if matching_columns:
                                         # Add each matching column
@@ -960,17 +1264,16 @@ def show_ai_discovery():
                                             })
                                     else:
                                         # If no exact match, try a more flexible approach
-                                        for col in table_details['columns']:
-                                            col_name = col.get('column_name', col.get('name', ''))
-                                            if should_column_match_pii_type(col_name.lower(), pii_type):
-                                                sample = get_sample_data_for_column(col_name, pii_type, table_details.get('sample_data'))
-                                                formatted_rec["pii_columns"].append({
-                                                    "column": col_name,
-                                                    "type": pii_type,
-                                                    "confidence": min(ai_rec.confidence_score + 0.1, 1.0),
-                                                    "sample": sample
-                                                })
-                                                break  # Only add one column per PII type to avoid duplicates
+                                        # (only one column per PII type to avoid duplicates)
+                                        col_name = flexible_columns.get(pii_type)
+                                        if col_name:
+                                            sample = get_sample_data_for_column(col_name, pii_type, table_details.get('sample_data'))
+                                            formatted_rec["pii_columns"].append({
+                                                "column": col_name,
+                                                "type": pii_type,
+                                                "confidence": min(ai_rec.confidence_score + 0.1, 1.0),
+                                                "sample": sample
+                                            })
                             
                             # If we still don't have any columns, add generic ones based on PII types
                             if not formatted_rec["pii_columns"] and ai_rec.estimated_pii_types:
@@ -996,7 +1299,6 @@ def show_ai_discovery():
                     formatted_recommendations = convert_ai_recommendations_to_format(ai_recommendations, database_name)
                 
                 progress_bar.progress(1.0)
-                time.sleep(0.5)
                 
                 # Filter by confidence threshold
                 filtered_recommendations = [r for r in formatted_recommendations if r["confidence"] >= confidence_threshold]
@@ -1057,7 +1359,7 @@ def show_ai_discovery():
         st.subheader("🚀 Ready for Encryption")
         
         selected_tables = [rec for rec in st.session_state.ai_table_recommendations 
-                          if rec["priority"] in ["HIGH", "MEDIUM"]]
+                          if rec["priority"] in _SELECTED_PRIORITIES]
         
         st.info(f"📊 **{len(selected_tables)} high/medium priority tables** are pre-selected for the next step")
         st.success("✅ **Discovery Complete!** Proceed to analyze the selected tables.")
@@ -1074,82 +1376,251 @@ def show_ai_discovery():
             st.session_state.current_page = "3. Encryption Preparation"
             st.rerun()
 
-def should_column_match_pii_type(column_name: str, pii_type: str) -> bool:
-    """Check if a column name should match a specific PII type"""
-    pii_patterns = {
-        # CRITICAL: Enhanced name patterns - these need 100% encryption priority
-        'FULL_NAME': ['name', 'full_name', 'fullname', 'person_name', 'personname', 'customer_name', 
-                     'employee_name', 'user_name', 'display_name', 'legal_name', 'party_name'],
-        'FIRST_NAME': ['first_name', 'firstname', 'fname', 'given_name', 'givenname', 'forename'],
-        'LAST_NAME': ['last_name', 'lastname', 'lname', 'surname', 'family_name', 'familyname'],
-        'PERSONAL_NAME': ['name', 'person', 'customer_name', 'user_name', 'personname', 'party_name'],
-        
-        # Other high-priority PII
-        'EMAIL': ['email', 'mail', 'e_mail', 'electronic_mail', 'email_address', 'emailaddress'],
-        'PHONE': ['phone', 'telephone', 'mobile', 'cell', 'tel', 'phone_number', 'contact_number'],
-        'ADDRESS': ['address', 'addr', 'street', 'location', 'home_address', 'mailing_address'],
-        'SSN': ['ssn', 'social_security', 'national_id', 'tax_id', 'social_security_number'],
-        'DATE_OF_BIRTH': ['birth_date', 'birthdate', 'dob', 'date_of_birth', 'birth'],
-        'NATIONAL_ID': ['national_id', 'id_number', 'employee_id', 'person_id', 'personnel_number'],
-        'LOGIN_ID': ['login', 'username', 'user_id', 'login_id', 'userid', 'account_name'],
-        'ACCOUNT_NUMBER': ['account', 'account_number', 'acct_no', 'account_no'],
-        'POSTAL_CODE': ['postal', 'zip', 'postcode', 'zip_code', 'postal_code'],
-        'CITY': ['city', 'town', 'municipality', 'locality'],
-        'PERSONNEL_NUMBER': ['personnel', 'employee_number', 'emp_no', 'staff_number'],
-        'PARTY_NUMBER': ['party_number', 'party_no', 'trading_no', 'party_id']
+# Column-name patterns per PII type for the first-match-per-type lookup (exact match OR contains)
+_COLUMN_MATCH_PATTERNS = {
+    # CRITICAL: Enhanced name patterns - these need 100% encryption priority
+    'FULL_NAME': ('name', 'full_name', 'fullname', 'person_name', 'personname', 'customer_name', 
+                 'employee_name', 'user_name', 'display_name', 'legal_name', 'party_name'),
+    'FIRST_NAME': ('first_name', 'firstname', 'fname', 'given_name', 'givenname', 'forename'),
+    'LAST_NAME': ('last_name', 'lastname', 'lname', 'surname', 'family_name', 'familyname'),
+    'PERSONAL_NAME': ('name', 'person', 'customer_name', 'user_name', 'personname', 'party_name'),
+    
+    # Other high-priority PII
+    'EMAIL': ('email', 'mail', 'e_mail', 'electronic_mail', 'email_address', 'emailaddress'),
+    'PHONE': ('phone', 'telephone', 'mobile', 'cell', 'tel', 'phone_number', 'contact_number'),
+    'ADDRESS': ('address', 'addr', 'street', 'location', 'home_address', 'mailing_address'),
+    'SSN': ('ssn', 'social_security', 'national_id', 'tax_id', 'social_security_number'),
+    'DATE_OF_BIRTH': ('birth_date', 'birthdate', 'dob', 'date_of_birth', 'birth'),
+    'NATIONAL_ID': ('national_id', 'id_number', 'employee_id', 'person_id', 'personnel_number'),
+    'LOGIN_ID': ('login', 'username', 'user_id', 'login_id', 'userid', 'account_name'),
+    'ACCOUNT_NUMBER': ('account', 'account_number', 'acct_no', 'account_no'),
+    'POSTAL_CODE': ('postal', 'zip', 'postcode', 'zip_code', 'postal_code'),
+    'CITY': ('city', 'town', 'municipality', 'locality'),
+    'PERSONNEL_NUMBER': ('personnel', 'employee_number', 'emp_no', 'staff_number'),
+    'PARTY_NUMBER': ('party_number', 'party_no', 'trading_no', 'party_id')
+}
+
+# PII type to column name patterns mapping - ENHANCED for comprehensive detection
+_FIND_COLUMN_PATTERNS = {
+    # CRITICAL: Name columns - highest priority for encryption
+    'FULL_NAME': ('name', 'fullname', 'full_name', 'person_name', 'personname', 'customer_name',
+                 'employee_name', 'user_name', 'display_name', 'legal_name', 'party_name',
+                 'trading_name', 'business_name', 'company_name'),
+    'FIRST_NAME': ('firstname', 'first_name', 'fname', 'given_name', 'givenname', 'forename', 'name_first'),
+    'LAST_NAME': ('lastname', 'last_name', 'lname', 'surname', 'family_name', 'familyname', 'name_last'),
+    'MIDDLE_NAME': ('middlename', 'middle_name', 'mname', 'middle', 'secondname', 'second_name'),
+    'PERSONAL_NAME': ('name', 'person', 'customer_name', 'user_name', 'personname', 'party_name',
+                     'contact_name', 'individual_name'),
+    'PERSONAL_TITLE': ('title', 'name_title', 'prefix', 'suffix', 'honorific'),
+    'REVIEWER_NAME': ('reviewername', 'reviewer_name', 'reviewer', 'name'),
+    'VENDOR_NAME': ('name', 'vendor_name', 'vendorname', 'supplier_name'),
+    'STORE_NAME': ('name', 'store_name', 'storename', 'shop_name'),
+                     
+    # Contact information
+    'EMAIL': ('email', 'emailaddress', 'email_address', 'mail', 'e_mail', 'electronic_mail', 'contact_email'),
+    'EMAIL_ADDRESS': ('emailaddress', 'email_address', 'email', 'mail', 'e_mail'),
+    'PHONE': ('phone', 'telephone', 'mobile', 'cell', 'contact', 'phonenumber', 'phone_number', 'tel'),
+    'PHONE_NUMBER': ('phonenumber', 'phone_number', 'phone', 'telephone', 'mobile', 'cell'),
+    
+    # Address information
+    'ADDRESS': ('address', 'street', 'location', 'home_address', 'mailing_address', 'street_address', 'addr'),
+    'STREET_ADDRESS': ('addressline1', 'address_line1', 'street', 'street_address', 'address'),
+    'CITY': ('city', 'town', 'municipality', 'locality'),
+    'POSTAL_CODE': ('postalcode', 'postal_code', 'zip', 'zipcode', 'zip_code', 'postcode'),
+    'GEOGRAPHIC_LOCATION': ('city', 'state', 'province', 'location', 'geography'),
+    
+    # Personal information
+    'DATE_OF_BIRTH': ('birthdate', 'birth_date', 'dob', 'date_of_birth', 'birth', 'born'),
+    'SSN': ('ssn', 'social', 'social_security', 'social_security_number'),
+    'NATIONAL_ID': ('nationalidnumber', 'national_id', 'id_number', 'employee_id', 'person_id'),
+    'LOGIN_ID': ('loginid', 'login_id', 'user', 'login', 'username', 'userid', 'user_id', 'account'),
+    'ACCOUNT_NUMBER': ('account', 'account_number', 'acct_no', 'account_no', 'accountnumber'),
+    
+    # Financial information
+    'CREDIT_CARD': ('creditcard', 'credit_card', 'card', 'payment', 'cc', 'card_number'),
+    'CREDIT_CARD_NUMBER': ('cardnumber', 'card_number', 'creditcardnumber', 'credit_card_number'),
+    'CARD_TYPE': ('cardtype', 'card_type', 'type'),
+    'EXPIRATION_DATE': ('expiry', 'exp_date', 'expiration', 'expiration_date'),
+    
+    # Work-related
+    'JOB_TITLE': ('title', 'job_title', 'jobtitle', 'position', 'role'),
+    'SALARY_RATE': ('salary', 'rate', 'pay', 'wage', 'compensation'),
+    'PAY_FREQUENCY': ('frequency', 'pay_frequency', 'payfrequency'),
+    
+    # Security
+    'PASSWORD': ('password', 'pwd', 'pass', 'passwd', 'secret', 'pin'),
+    'PASSWORD_HASH': ('passwordhash', 'password_hash', 'hash'),
+    'PASSWORD_SALT': ('passwordsalt', 'password_salt', 'salt'),
+    
+    # Demographics
+    'GENDER': ('gender', 'sex'),
+    'MARITAL_STATUS': ('marital', 'maritalstatus', 'marital_status'),
+    'DEMOGRAPHICS': ('demographics', 'demographic'),
+    'BUSINESS_DEMOGRAPHICS': ('demographics', 'demographic', 'business_demographics'),
+    
+    # Comments and text
+    'PERSONAL_COMMENTS': ('comment', 'comments', 'notes', 'remarks', 'description'),
+    'RESUME_DATA': ('resume', 'cv', 'curriculum'),
+    'WORK_HISTORY': ('history', 'employment', 'experience'),
+    'PERSONAL_INFORMATION': ('info', 'information', 'details', 'data'),
+    
+    # Associations and relationships
+    'BUSINESS_RELATIONSHIP': ('relationship', 'association', 'contact'),
+    'CONTACT_ASSOCIATION': ('contact', 'association', 'relationship'),
+    'ADDRESS_ASSOCIATION': ('address', 'location', 'association'),
+    'LOCATION_RELATIONSHIP': ('location', 'address', 'relationship'),
+    'FINANCIAL_ASSOCIATION': ('financial', 'payment', 'credit'),
+    'PAYMENT_RELATIONSHIP': ('payment', 'financial', 'credit'),
+    'CUSTOMER_ACCOUNT': ('customer', 'account'),
+    'PERSON_ASSOCIATION': ('person', 'individual', 'contact'),
+    'CUSTOMER_ASSOCIATION': ('customer', 'client'),
+    'PURCHASE_BEHAVIOR': ('purchase', 'order', 'sales'),
+    'EMPLOYMENT_HISTORY': ('employment', 'history', 'career'),
+    'CAREER_PROGRESSION': ('career', 'progression', 'history'),
+    'SALES_PERFORMANCE': ('sales', 'performance'),
+    'COMPENSATION_DATA': ('compensation', 'salary', 'pay')
+}
+
+def _compile_column_patterns(patterns) -> re.Pattern:
+    """Compile substring patterns into one alternation so a column name is scanned once"""
+    # Longest first, so a specific pattern wins over its own prefix at the same position
+    return re.compile('|'.join(re.escape(p) for p in sorted(set(patterns), key=len, reverse=True)))
+
+@st.cache_resource
+def _build_column_pattern_tables():
+    """Compiled column-name matchers, built once per process rather than on every script rerun"""
+    # "pattern == name or pattern in name" reduces to a substring search
+    column_match_regex = {t: _compile_column_patterns(p) for t, p in _COLUMN_MATCH_PATTERNS.items() if p}
+    find_column_regex = {t: _compile_column_patterns(p) for t, p in _FIND_COLUMN_PATTERNS.items()}
+    
+    # Every pattern -> the PII types of all patterns it contains. With a longest-first lookahead scan
+    # the longest pattern starting at each position is found, and any shorter pattern starting there
+    # is its prefix, so this yields every matching type in one pass over the name (Aho-Corasick style).
+    find_pattern_types = {
+        pattern: frozenset(pii_type for pii_type, patterns in _FIND_COLUMN_PATTERNS.items()
+                           if any(p in pattern for p in patterns))
+        for patterns in _FIND_COLUMN_PATTERNS.values() for pattern in patterns
     }
-    
-    patterns = pii_patterns.get(pii_type, [])
-    
-    # Enhanced matching: exact match OR contains pattern
-    column_lower = column_name.lower()
-    return any(pattern == column_lower or pattern in column_lower for pattern in patterns)
+    find_all_types_regex = re.compile('(?=(' + _compile_column_patterns(find_pattern_types).pattern + '))')
+    return column_match_regex, find_column_regex, find_pattern_types, find_all_types_regex
 
-def get_sample_data_for_column(column_name: str, pii_type: str, sample_data: any) -> str:
+_COLUMN_MATCH_REGEX, _FIND_COLUMN_REGEX, _FIND_PATTERN_TYPES, _FIND_ALL_TYPES_REGEX = _build_column_pattern_tables()
+
+@lru_cache(maxsize=256)
+def _find_columns_regex(pii_type: str) -> re.Pattern:
+    """Compiled matcher for a PII type, defaulting to the type name without underscores"""
+    regex = _FIND_COLUMN_REGEX.get(pii_type)
+    return regex if regex is not None else _compile_column_patterns([pii_type.lower().replace('_', '')])
+
+@lru_cache(maxsize=4096)
+def _column_pii_types(column_lower: str) -> frozenset:
+    """All known PII types whose column-name patterns occur in the (lower-cased) column name"""
+    types = frozenset()
+    for match in _FIND_ALL_TYPES_REGEX.finditer(column_lower):
+        types |= _FIND_PATTERN_TYPES[match.group(1)]
+    return types
+
+def _match_columns_by_type(table_columns: Dict[Tuple[str, str], List[str]], pii_types,
+                           regex_for=_find_columns_regex) -> Dict[str, Dict[Tuple[str, str], List[str]]]:
+    """Match every (schema, table, column) against each PII type in one vectorized sweep per type
+
+    Returns {pii_type: {(schema, table): [matching columns in table order]}}.
+    """
+    cols_df = pd.DataFrame(
+        [(schema, table, col) for (schema, table), cols in table_columns.items() for col in cols],
+        columns=['schema', 'tbl', 'col']
+    )
+    if cols_df.empty:
+        return {}
+    lowered = cols_df['col'].str.lower()
+    
+    matches = {}
+    for pii_type in dict.fromkeys(pii_types):
+        regex = regex_for(pii_type)
+        if regex is None:
+            continue
+        hits = cols_df[lowered.str.contains(regex, na=False).to_numpy()]
+        matches[pii_type] = hits.groupby(['schema', 'tbl'], sort=False)['col'].agg(list).to_dict()
+    return matches
+
+# One bit per PII type so a column name's matches are computed once and then tested by mask
+_COLUMN_MATCH_TYPE_BIT = {pii_type: 1 << i for i, pii_type in enumerate(_COLUMN_MATCH_REGEX)}
+
+@lru_cache(maxsize=4096)
+def _column_match_mask(column_lower: str) -> int:
+    """Bitmask of every PII type whose name patterns occur in the (lower-cased) column name"""
+    mask = 0
+    for pii_type, regex in _COLUMN_MATCH_REGEX.items():
+        if regex.search(column_lower):
+            mask |= _COLUMN_MATCH_TYPE_BIT[pii_type]
+    return mask
+
+def _first_column_per_type(column_names: List[str]) -> Dict[str, str]:
+    """First column (in table order) matching each PII type, from one pass over the columns"""
+    first_columns = {}
+    for col_name in column_names:
+        mask = _column_match_mask(col_name.lower())
+        if mask:
+            for pii_type, bit in _COLUMN_MATCH_TYPE_BIT.items():
+                if mask & bit:
+                    first_columns.setdefault(pii_type, col_name)
+    return first_columns
+
+# Generated (already masked) sample values shown when no real sample is available
+_FALLBACK_SAMPLES = {
+    'EMAIL': 'john***@company.com, mary***@demo.org',
+    'FULL_NAME': 'John***Smith, Mary***Johnson', 
+    'FIRST_NAME': 'John, Mary, Robert',
+    'LAST_NAME': 'Sm***, Joh***son, Br***',
+    'PHONE': '555-***-1234, 555-***-5678',
+    'ADDRESS': '123 Main St***, 456 Oak Ave***',
+    'SSN': '***-**-1234, ***-**-5678',
+    'DATE_OF_BIRTH': '1985-**-**, 1990-**-**',
+    'PERSONAL_NAME': 'John S***, Mary J***',
+    'NATIONAL_ID': '29584***4, 50964***4',
+    'LOGIN_ID': 'jsmith***, mjohn***',
+    'ACCOUNT_NUMBER': 'ACC***001, ACC***002',
+    'POSTAL_CODE': '980**, 981**, 982**',
+    'CITY': 'Seattle, Denver, Austin',
+    'PERSONNEL_NUMBER': '0000***1, 0000***2',
+    'PARTY_NAME': 'ABC Corp***, XYZ Ltd***',
+    'PARTY_NUMBER': 'PARTY-***1, PARTY-***2'
+}
+
+@lru_cache(maxsize=512)
+def _generate_fallback_sample(pii_type: str) -> str:
+    """Generated sample data based on PII type"""
+    return _FALLBACK_SAMPLES.get(pii_type, f'sample_{pii_type.lower()}_data')
+
+def _mask_real_sample(sample_data: pd.DataFrame, column_name: str) -> Optional[str]:
+    """First few non-null values of a sampled column, masked for privacy (None if there are none)"""
+    if column_name not in sample_data.columns:
+        return None
+    try:
+        # Get first few non-null values (limited length) and mask them column-wise
+        values = sample_data[column_name].head(3).dropna().astype(str).str.slice(0, 10)
+        values = values[~values.str.lower().isin(['null', 'none', ''])]
+        
+        if not values.empty:
+            lengths = values.str.len()
+            stars = pd.Series('*', index=values.index)
+            # Mask the value for privacy: keep the first/last two characters of longer values
+            masked = (values.str[:2] + stars.str.repeat((lengths - 4).clip(lower=0)) + values.str[-2:]).where(
+                lengths > 3, stars.str.repeat(lengths)
+            )
+            return ', '.join(masked)
+    except Exception:
+        pass
+    return None
+
+def get_sample_data_for_column(column_name: str, pii_type: str, sample_data: Optional[pd.DataFrame]) -> str:
     """Generate or extract sample data for a column based on PII type"""
     # If we have actual sample data, try to use it (but mask it for privacy)
-    if sample_data and isinstance(sample_data, (list, tuple)) and len(sample_data) > 0:
-        try:
-            # Get first few non-null values and mask them
-            samples = []
-            for row in sample_data[:3]:
-                if isinstance(row, dict) and column_name in row:
-                    value = str(row[column_name])[:10]  # Limit length
-                    if value and value.lower() not in ['null', 'none', '']:
-                        # Mask the value for privacy
-                        if len(value) > 3:
-                            masked = value[:2] + '*' * (len(value) - 4) + value[-2:]
-                        else:
-                            masked = '*' * len(value)
-                        samples.append(masked)
-            
-            if samples:
-                return ', '.join(samples)
-        except:
-            pass
+    if isinstance(sample_data, pd.DataFrame):
+        return _mask_real_sample(sample_data, column_name) or _generate_fallback_sample(pii_type)
     
     # Fallback to generated sample data based on PII type
-    sample_patterns = {
-        'EMAIL': 'john***@company.com, mary***@demo.org',
-        'FULL_NAME': 'John***Smith, Mary***Johnson', 
-        'FIRST_NAME': 'John, Mary, Robert',
-        'LAST_NAME': 'Sm***, Joh***son, Br***',
-        'PHONE': '555-***-1234, 555-***-5678',
-        'ADDRESS': '123 Main St***, 456 Oak Ave***',
-        'SSN': '***-**-1234, ***-**-5678',
-        'DATE_OF_BIRTH': '1985-**-**, 1990-**-**',
-        'PERSONAL_NAME': 'John S***, Mary J***',
-        'NATIONAL_ID': '29584***4, 50964***4',
-        'LOGIN_ID': 'jsmith***, mjohn***',
-        'ACCOUNT_NUMBER': 'ACC***001, ACC***002',
-        'POSTAL_CODE': '980**, 981**, 982**',
-        'CITY': 'Seattle, Denver, Austin',
-        'PERSONNEL_NUMBER': '0000***1, 0000***2',
-        'PARTY_NAME': 'ABC Corp***, XYZ Ltd***',
-        'PARTY_NUMBER': 'PARTY-***1, PARTY-***2'
-    }
-    
-    return sample_patterns.get(pii_type, f'sample_{pii_type.lower()}_data')
+    return _generate_fallback_sample(pii_type)
 
 def convert_ai_recommendations_to_format(ai_recommendations, database_name: str) -> list:
     """Convert AI assistant recommendations to our display format with REAL column names"""
@@ -1163,9 +1634,31 @@ def convert_ai_recommendations_to_format(ai_recommendations, database_name: str)
         db_manager = None
         connection_id = None
     
+    # Get REAL column names for every recommended table using the proper schema
+    table_columns = {}
     for ai_rec in ai_recommendations:
         # Use the actual schema from the AI recommendation, fallback to database_name
         actual_schema = ai_rec.schema if hasattr(ai_rec, 'schema') and ai_rec.schema else database_name
+        table_key = (actual_schema, ai_rec.table_name)
+        if table_key in table_columns:
+            continue
+        table_columns[table_key] = []
+        if db_manager and connection_id:
+            try:
+                table_columns_info = _cached_columns(db_manager, connection_id, actual_schema, ai_rec.table_name)
+                # Fix: Use correct column field name from database manager
+                table_columns[table_key] = [col.get('column', '') for col in table_columns_info]
+            except Exception as e:
+                st.warning(f"Could not get columns for {actual_schema}.{ai_rec.table_name}: {str(e)}")
+    
+    # Map estimated PII types to REAL column names with one vectorized sweep per type
+    found_by_type = _match_columns_by_type(
+        table_columns, [pii_type for ai_rec in ai_recommendations for pii_type in ai_rec.estimated_pii_types]
+    )
+    
+    for ai_rec in ai_recommendations:
+        actual_schema = ai_rec.schema if hasattr(ai_rec, 'schema') and ai_rec.schema else database_name
+        table_key = (actual_schema, ai_rec.table_name)
         
         formatted_rec = {
             "table_name": ai_rec.table_name,
@@ -1176,28 +1669,18 @@ def convert_ai_recommendations_to_format(ai_recommendations, database_name: str)
             "pii_columns": []
         }
         
-        # Get REAL column names for this table using the proper schema
-        real_columns = []
-        if db_manager and connection_id:
-            try:
-                table_columns = db_manager.get_table_columns(connection_id, actual_schema, ai_rec.table_name)
-                # Fix: Use correct column field name from database manager
-                real_columns = [col.get('column', '') for col in table_columns]
-            except Exception as e:
-                st.warning(f"Could not get columns for {actual_schema}.{ai_rec.table_name}: {str(e)}")
-        
         # Map estimated PII types to REAL column names using enhanced matching
+        added_columns = set()
         for pii_type in ai_rec.estimated_pii_types:
-            # Find matching real columns for this PII type using our comprehensive patterns
-            matching_columns = find_columns_for_pii_type(real_columns, pii_type)
+            # Matching real columns for this PII type using our comprehensive patterns
+            matching_columns = found_by_type.get(pii_type, {}).get(table_key, [])
             
             if matching_columns:
                 # Add all matching columns with the correct PII type
                 for col_name in matching_columns:
-                    # Avoid duplicates - check if column already added with different type
-                    existing_column = next((pii_col for pii_col in formatted_rec["pii_columns"] 
-                                          if pii_col["column"] == col_name), None)
-                    if not existing_column:
+                    # Avoid duplicates - skip columns already added with a different type
+                    if col_name not in added_columns:
+                        added_columns.add(col_name)
                         formatted_rec["pii_columns"].append({
                             "column": col_name,  # REAL column name from database
                             "type": pii_type,
@@ -1214,100 +1697,17 @@ def convert_ai_recommendations_to_format(ai_recommendations, database_name: str)
 
 def find_columns_for_pii_type(column_names: List[str], pii_type: str) -> List[str]:
     """Find actual column names that match a PII type"""
-    matching_columns = []
-    
-    # PII type to column name patterns mapping - ENHANCED for comprehensive detection
-    pii_patterns = {
-        # CRITICAL: Name columns - highest priority for encryption
-        'FULL_NAME': ['name', 'fullname', 'full_name', 'person_name', 'personname', 'customer_name',
-                     'employee_name', 'user_name', 'display_name', 'legal_name', 'party_name',
-                     'trading_name', 'business_name', 'company_name'],
-        'FIRST_NAME': ['firstname', 'first_name', 'fname', 'given_name', 'givenname', 'forename', 'name_first'],
-        'LAST_NAME': ['lastname', 'last_name', 'lname', 'surname', 'family_name', 'familyname', 'name_last'],
-        'MIDDLE_NAME': ['middlename', 'middle_name', 'mname', 'middle', 'secondname', 'second_name'],
-        'PERSONAL_NAME': ['name', 'person', 'customer_name', 'user_name', 'personname', 'party_name',
-                         'contact_name', 'individual_name'],
-        'PERSONAL_TITLE': ['title', 'name_title', 'prefix', 'suffix', 'honorific'],
-        'REVIEWER_NAME': ['reviewername', 'reviewer_name', 'reviewer', 'name'],
-        'VENDOR_NAME': ['name', 'vendor_name', 'vendorname', 'supplier_name'],
-        'STORE_NAME': ['name', 'store_name', 'storename', 'shop_name'],
-                         
-        # Contact information
-        'EMAIL': ['email', 'emailaddress', 'email_address', 'mail', 'e_mail', 'electronic_mail', 'contact_email'],
-        'EMAIL_ADDRESS': ['emailaddress', 'email_address', 'email', 'mail', 'e_mail'],
-        'PHONE': ['phone', 'telephone', 'mobile', 'cell', 'contact', 'phonenumber', 'phone_number', 'tel'],
-        'PHONE_NUMBER': ['phonenumber', 'phone_number', 'phone', 'telephone', 'mobile', 'cell'],
-        
-        # Address information
-        'ADDRESS': ['address', 'street', 'location', 'home_address', 'mailing_address', 'street_address', 'addr'],
-        'STREET_ADDRESS': ['addressline1', 'address_line1', 'street', 'street_address', 'address'],
-        'CITY': ['city', 'town', 'municipality', 'locality'],
-        'POSTAL_CODE': ['postalcode', 'postal_code', 'zip', 'zipcode', 'zip_code', 'postcode'],
-        'GEOGRAPHIC_LOCATION': ['city', 'state', 'province', 'location', 'geography'],
-        
-        # Personal information
-        'DATE_OF_BIRTH': ['birthdate', 'birth_date', 'dob', 'date_of_birth', 'birth', 'born'],
-        'SSN': ['ssn', 'social', 'social_security', 'social_security_number'],
-        'NATIONAL_ID': ['nationalidnumber', 'national_id', 'id_number', 'employee_id', 'person_id'],
-        'LOGIN_ID': ['loginid', 'login_id', 'user', 'login', 'username', 'userid', 'user_id', 'account'],
-        'ACCOUNT_NUMBER': ['account', 'account_number', 'acct_no', 'account_no', 'accountnumber'],
-        
-        # Financial information
-        'CREDIT_CARD': ['creditcard', 'credit_card', 'card', 'payment', 'cc', 'card_number'],
-        'CREDIT_CARD_NUMBER': ['cardnumber', 'card_number', 'creditcardnumber', 'credit_card_number'],
-        'CARD_TYPE': ['cardtype', 'card_type', 'type'],
-        'EXPIRATION_DATE': ['expiry', 'exp_date', 'expiration', 'expiration_date'],
-        
-        # Work-related
-        'JOB_TITLE': ['title', 'job_title', 'jobtitle', 'position', 'role'],
-        'SALARY_RATE': ['salary', 'rate', 'pay', 'wage', 'compensation'],
-        'PAY_FREQUENCY': ['frequency', 'pay_frequency', 'payfrequency'],
-        
-        # Security
-        'PASSWORD': ['password', 'pwd', 'pass', 'passwd', 'secret', 'pin'],
-        'PASSWORD_HASH': ['passwordhash', 'password_hash', 'hash'],
-        'PASSWORD_SALT': ['passwordsalt', 'password_salt', 'salt'],
-        
-        # Demographics
-        'GENDER': ['gender', 'sex'],
-        'MARITAL_STATUS': ['marital', 'maritalstatus', 'marital_status'],
-        'DEMOGRAPHICS': ['demographics', 'demographic'],
-        'BUSINESS_DEMOGRAPHICS': ['demographics', 'demographic', 'business_demographics'],
-        
-        # Comments and text
-        'PERSONAL_COMMENTS': ['comment', 'comments', 'notes', 'remarks', 'description'],
-        'RESUME_DATA': ['resume', 'cv', 'curriculum'],
-        'WORK_HISTORY': ['history', 'employment', 'experience'],
-        'PERSONAL_INFORMATION': ['info', 'information', 'details', 'data'],
-        
-        # Associations and relationships
-        'BUSINESS_RELATIONSHIP': ['relationship', 'association', 'contact'],
-        'CONTACT_ASSOCIATION': ['contact', 'association', 'relationship'],
-        'ADDRESS_ASSOCIATION': ['address', 'location', 'association'],
-        'LOCATION_RELATIONSHIP': ['location', 'address', 'relationship'],
-        'FINANCIAL_ASSOCIATION': ['financial', 'payment', 'credit'],
-        'PAYMENT_RELATIONSHIP': ['payment', 'financial', 'credit'],
-        'CUSTOMER_ACCOUNT': ['customer', 'account'],
-        'PERSON_ASSOCIATION': ['person', 'individual', 'contact'],
-        'CUSTOMER_ASSOCIATION': ['customer', 'client'],
-        'PURCHASE_BEHAVIOR': ['purchase', 'order', 'sales'],
-        'EMPLOYMENT_HISTORY': ['employment', 'history', 'career'],
-        'CAREER_PROGRESSION': ['career', 'progression', 'history'],
-        'SALES_PERFORMANCE': ['sales', 'performance'],
-        'COMPENSATION_DATA': ['compensation', 'salary', 'pay']
-    }
-    
-    patterns = pii_patterns.get(pii_type, [pii_type.lower().replace('_', '')])
-    
-    for col_name in column_names:
-        col_lower = col_name.lower()
-        for pattern in patterns:
-            # Enhanced matching: exact match OR contains pattern
-            if pattern == col_lower or pattern in col_lower:
-                matching_columns.append(col_name)
-                break
-    
-    return matching_columns
+    # Enhanced matching: exact match OR contains pattern, via the type's compiled alternation.
+    # Lower-case the names once and scan them as one buffer; patterns never span the '\n' separators.
+    lowered = [col_name.lower() for col_name in column_names]
+    starts = list(accumulate((len(name) + 1 for name in lowered), initial=0))
+    hits = {bisect_right(starts, match.start()) - 1 for match in _find_columns_regex(pii_type).finditer('\n'.join(lowered))}
+    return [column_names[i] for i in sorted(hits)]
+
+@lru_cache(maxsize=8192)
+def _find_columns_cached(column_names: Tuple[str, ...], pii_type: str) -> Tuple[str, ...]:
+    """find_columns_for_pii_type memoized per column-list shape (many tables share the same columns)"""
+    return tuple(find_columns_for_pii_type(list(column_names), pii_type))
 
 def display_priority_recommendations(recommendations, database_name, priority_level):
     """Display recommendations for a specific priority level with detailed column info"""
@@ -1368,7 +1768,7 @@ def display_priority_recommendations(recommendations, database_name, priority_le
             st.write("**⚙️ Analysis Selection:**")
             select_table = st.checkbox(
                 f"Include {rec['table_name']} in PII analysis", 
-                value=(priority_level in ["HIGH", "MEDIUM"]),
+                value=(priority_level in _SELECTED_PRIORITIES),
                 key=f"select_{rec['table_name']}_{i}"
             )
             
@@ -1399,7 +1799,7 @@ def get_pii_type_color(pii_type):
         st.subheader("🚀 Ready for PII Analysis")
         
         selected_tables = [rec for rec in st.session_state.ai_table_recommendations 
-                          if rec["priority"] in ["HIGH", "MEDIUM"]]
+                          if rec["priority"] in _SELECTED_PRIORITIES]
         
         st.info(f"📊 **{len(selected_tables)} high/medium priority tables** are pre-selected for PII analysis")
         st.success("✅ **Discovery Complete!** Proceed to analyze the selected tables for PII.")
@@ -1416,6 +1816,106 @@ def get_pii_type_color(pii_type):
             st.session_state.current_page = "3. Encryption Preparation"
             st.rerun()
 
+# Column-name patterns for encryption preparation, compiled once (case-insensitive instead of lower())
+_NAME_COLUMN_PATTERNS = ('name', 'firstname', 'first_name', 'lastname', 'last_name', 
+                         'fullname', 'full_name', 'personname', 'person_name', 
+                         'customer_name', 'employee_name', 'user_name', 'display_name')
+
+# Exclusion patterns - columns to skip even if they match name patterns
+_EXCLUDE_COLUMN_PATTERNS = ('namestyle', 'name_style')
+
+# Common PII patterns used when AI recommendations map to no columns
+_PII_COLUMN_PATTERNS = ('name', 'email', 'phone', 'address', 'ssn', 'birth', 'id', 
+                        'login', 'user', 'person', 'customer', 'employee', 'contact',
+                        'mobile', 'tel', 'mail', 'zip', 'postal', 'city', 'state')
+
+@st.cache_resource
+def _build_encryption_column_regexes():
+    """Case-insensitive name/exclude/PII column matchers, built once per process"""
+    return tuple(re.compile(_compile_column_patterns(patterns).pattern, re.I)
+                 for patterns in (_NAME_COLUMN_PATTERNS, _EXCLUDE_COLUMN_PATTERNS, _PII_COLUMN_PATTERNS))
+
+_NAME_COLUMN_RE, _EXCLUDE_COLUMN_RE, _PII_COLUMN_RE = _build_encryption_column_regexes()
+
+def _hash_encryption_key(text: str) -> str:
+    """Key for a non-blank string: fast 128-bit BLAKE2b tag (instead of slow PBKDF2), 32 hex chars"""
+    return f"ENC_{hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()}"
+
+def generate_encryption_key(value: str) -> str:
+    """Generate a unique encryption key for a specific value - FAST VERSION"""
+    try:
+        if pd.isna(value) or str(value).strip() == '':
+            return ""
+        return _hash_encryption_key(str(value))
+    except:
+        return "KEY_GENERATION_FAILED"
+
+def generate_encryption_keys_bulk(series: pd.Series) -> pd.Series:
+    """Vectorized generate_encryption_key for a whole column (empty string for null/blank values)"""
+    # PII columns repeat heavily (first names, cities...): factorize first so stringifying, the
+    # blank check and hashing all run once per distinct value; nulls get code -1
+    codes, uniques = pd.factorize(series)
+    unique_keys = []
+    for value in uniques:
+        text = str(value)
+        unique_keys.append(_hash_encryption_key(text) if text.strip() else '')
+    unique_keys.append('')  # codes == -1 (null) index this last slot
+    return pd.Series(np.array(unique_keys, dtype=object)[codes], index=series.index, dtype=object)
+
+def _build_encryption_scan_query(schema: str, table: str, pk_columns: Tuple[str, ...],
+                                 target_columns: Tuple[str, ...]) -> Tuple[str, Tuple[str, ...]]:
+    """SELECT for one encryption-prep table scan and the key columns it returns"""
+    target_columns_str = ', '.join([f"[{col}]" for col in target_columns])
+    
+    # Build the WHERE clause more carefully to avoid NULL issues (COALESCE folds the
+    # NULL and empty-string checks into one predicate per column)
+    non_null_conditions = [f"COALESCE([{col}], '') <> ''" for col in target_columns]
+    where_clause = ' OR '.join(non_null_conditions) if non_null_conditions else "1=1"
+    
+    # Build query dynamically - always include primary key if available
+    if pk_columns and pk_columns[0] != 'RowNum':
+        pk_columns_str = ', '.join([f"[{col}]" for col in pk_columns])
+        query = f"""
+        SELECT {pk_columns_str}, {target_columns_str}
+        FROM [{schema}].[{table}]
+        WHERE ({where_clause})
+        ORDER BY {pk_columns_str}
+        """
+        return query, pk_columns
+    
+    # No reliable primary key, use ROW_NUMBER()
+    query = f"""
+    SELECT ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) as RowNum, {target_columns_str}
+    FROM [{schema}].[{table}]
+    WHERE ({where_clause})
+    ORDER BY RowNum
+    """
+    return query, ('RowNum',)
+
+def _encryption_results_frame() -> pd.DataFrame:
+    """Encryption-prep results as a DataFrame, reusing the frame kept by the scan when present"""
+    results_df = st.session_state.get('encryption_results_df')
+    if results_df is None:
+        results_df = pd.DataFrame(st.session_state.get('encryption_preparation_results') or [])
+    return results_df
+
+def _encryption_stats() -> Dict[str, int]:
+    """Summary counts for the encryption-prep results, computed once per scan and kept in session state"""
+    stats = st.session_state.get('encryption_stats')
+    if stats is None:
+        results_df = _encryption_results_frame()
+        if results_df.empty:
+            return {'total': 0, 'name': 0, 'high_priority': 0, 'tables': 0}
+        stats = {
+            'total': len(results_df),
+            'name': int((results_df['Column_Type'] == 'NAME').sum()),
+            'high_priority': int((results_df['Priority'] == 'HIGH').sum()),
+            # "database.schema.table" -> distinct "schema.table"
+            'tables': int(results_df['Schema'].str.split('.').str[1:3].str.join('.').nunique()),
+        }
+        st.session_state.encryption_stats = stats
+    return stats
+
 def show_encryption_preparation():
     """Step 3: Encryption Preparation - Scan all rows and create encryption keys"""
     st.header("🔐 Step 3: Encryption Preparation")
@@ -1478,89 +1978,125 @@ def show_encryption_preparation():
                 encryption_data = []
                 total_rows_processed = 0
                 
-                # Import required libraries for efficient processing
-                import pandas as pd
-                import hashlib
-                import secrets
-                import base64
-                import time
-                from cryptography.fernet import Fernet
+                def prefetch_schema_metadata(connection_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+                    """Primary keys and column names of every table in two queries, keyed by lower-cased
+                    (schema, table); (None, None) when the connection cannot run them"""
+                    try:
+                        cursor = db_manager.connections[connection_id]['connection'].cursor()
+                        try:
+                            cursor.execute("""
+                            SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME
+                            FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+                            WHERE CONSTRAINT_NAME LIKE 'PK_%'
+                            ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+                            """)
+                            pk_map = {}
+                            for schema, table, column in cursor.fetchall():
+                                pk_map.setdefault((schema.lower(), table.lower()), []).append(column)
+                            
+                            cursor.execute("""
+                            SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME
+                            FROM INFORMATION_SCHEMA.COLUMNS
+                            ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+                            """)
+                            col_map = {}
+                            for schema, table, column in cursor.fetchall():
+                                col_map.setdefault((schema.lower(), table.lower()), []).append(column)
+                        finally:
+                            cursor.close()
+                        return pk_map, col_map
+                    except:
+                        return None, None
                 
-                def generate_encryption_key(value: str) -> str:
-                    """Generate a unique encryption key for a specific value - FAST VERSION"""
+                pk_map, col_map = prefetch_schema_metadata(connection_id)
+                
+                def prefetch_row_counts(connection_id: str) -> Optional[Dict]:
+                    """Row count of every user table from partition metadata (no table scans), keyed by
+                    lower-cased (schema, table); None when the stats view is unavailable"""
                     try:
-                        if pd.isna(value) or str(value).strip() == '':
-                            return ""
-                        # Fast hash-based key generation (instead of slow PBKDF2)
-                        key_hash = hashlib.sha256(str(value).encode('utf-8')).hexdigest()[:32]
-                        return f"ENC_{key_hash}"
+                        cursor = db_manager.connections[connection_id]['connection'].cursor()
+                        try:
+                            cursor.execute("""
+                            SELECT s.name, t.name, SUM(ps.row_count)
+                            FROM sys.dm_db_partition_stats ps
+                            JOIN sys.tables t ON t.object_id = ps.object_id
+                            JOIN sys.schemas s ON s.schema_id = t.schema_id
+                            WHERE ps.index_id IN (0, 1)
+                            GROUP BY s.name, t.name
+                            """)
+                            return {(schema.lower(), table.lower()): int(row_count or 0)
+                                    for schema, table, row_count in cursor.fetchall()}
+                        finally:
+                            cursor.close()
                     except:
-                        return "KEY_GENERATION_FAILED"
+                        return None
+                
+                row_counts = prefetch_row_counts(connection_id)
+                
+                def get_table_column_names(connection_id: str, schema: str, table: str) -> List[str]:
+                    """Column names for a table, from the prefetched map when available"""
+                    if col_map is not None:
+                        names = col_map.get((schema.lower(), table.lower()))
+                        if names:
+                            return names
+                    return [col.get('column', '') for col in db_manager.get_table_columns(connection_id, schema, table)]
                 
                 def get_primary_key_columns(connection_id: str, schema: str, table: str) -> List[str]:
                     """Get primary key columns for a table"""
                     try:
-                        cursor = db_manager.connections[connection_id]['connection'].cursor()
-                        cursor.execute(f"""
-                        SELECT COLUMN_NAME
-                        FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
-                        WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ? 
-                        AND CONSTRAINT_NAME LIKE 'PK_%'
-                        ORDER BY ORDINAL_POSITION
-                        """, (schema, table))
-                        
-                        pk_columns = [row[0] for row in cursor.fetchall()]
-                        cursor.close()
+                        if pk_map is not None:
+                            pk_columns = list(pk_map.get((schema.lower(), table.lower()), []))
+                        else:
+                            cursor = worker_connection().cursor()
+                            cursor.execute(f"""
+                            SELECT COLUMN_NAME
+                            FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+                            WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ? 
+                            AND CONSTRAINT_NAME LIKE 'PK_%'
+                            ORDER BY ORDINAL_POSITION
+                            """, (schema, table))
+                            
+                            pk_columns = [row[0] for row in cursor.fetchall()]
+                            cursor.close()
                         
                         # If no primary key found, try to find the first column that looks like an ID
                         if not pk_columns:
-                            all_columns = db_manager.get_table_columns(connection_id, schema, table)
-                            for col in all_columns:
-                                col_name = col.get('column', '')
+                            all_column_names = get_table_column_names(connection_id, schema, table)
+                            for col_name in all_column_names:
                                 if col_name.lower().endswith('id') or col_name.lower() in ['id', 'key']:
                                     pk_columns = [col_name]
                                     break
                             
                             # Final fallback: use the first column
-                            if not pk_columns and all_columns:
-                                pk_columns = [all_columns[0].get('column', 'RowNum')]
+                            if not pk_columns and all_column_names:
+                                pk_columns = [all_column_names[0] or 'RowNum']
                         
                         return pk_columns if pk_columns else ['RowNum']
                     except:
                         return ['RowNum']
                 
                 # Process all tables efficiently
-                all_encryption_data = []
-                
-                for table_idx, table in enumerate(tables_to_process):
+                def process_table(table: Dict) -> Optional[pd.DataFrame]:
+                    """Build the encryption records for one recommended table (None when it is skipped)"""
                     schema = table.get('schema', database_name)
                     table_name = table['table_name']
                     
-                    status_text.text(f"Processing table {table_idx + 1}/{total_tables}: {schema}.{table_name}")
                     
                     try:
                         # Get primary key columns
                         pk_columns = get_primary_key_columns(connection_id, schema, table_name)
                         
                         # Get all table columns to identify target columns
-                        all_columns = db_manager.get_table_columns(connection_id, schema, table_name)
-                        column_names = [col.get('column', '') for col in all_columns]
+                        column_names = get_table_column_names(connection_id, schema, table_name)
+                        lowered_names = [col.lower() for col in column_names]  # lower-cased once per table
                         
                         # Identify name-related columns (exclude NameStyle)
-                        name_patterns = ['name', 'firstname', 'first_name', 'lastname', 'last_name', 
-                                       'fullname', 'full_name', 'personname', 'person_name', 
-                                       'customer_name', 'employee_name', 'user_name', 'display_name']
-                        
-                        # Exclusion patterns - columns to skip even if they match name patterns
-                        exclude_patterns = ['namestyle', 'name_style']
-                        
                         name_related_columns = [col for col in column_names 
-                                              if any(pattern in col.lower() for pattern in name_patterns)
-                                              and not any(exclude in col.lower() for exclude in exclude_patterns)]
+                                              if _NAME_COLUMN_RE.search(col) and not _EXCLUDE_COLUMN_RE.search(col)]
                         
                         if focus_name_columns and not name_related_columns:
                             # st.write(f"  ⏭️ Skipping {schema}.{table_name} - no name columns found")
-                            continue
+                            return None
                         
                         columns_to_process = []
                         if focus_name_columns:
@@ -1584,29 +2120,31 @@ def show_encryption_preparation():
                                         ai_pii_types.append(pii_col)
                                         # st.write(f"    📋 Found AI PII type: {pii_col}")
                                 
-                                # Map AI PII types to actual database column names
-                                for pii_type in ai_pii_types:
-                                    matching_columns = find_columns_for_pii_type(column_names, pii_type)
-                                    recommended_columns.extend(matching_columns)
+                                # Map AI PII types to actual database column names: scan each column once
+                                # for all known types, and only fall back per type for unknown ones. A dict
+                                # keeps the matches de-duplicated and in a stable order for the scan query
+                                known_types = {pii_type for pii_type in ai_pii_types if pii_type in _FIND_COLUMN_PATTERNS}
+                                recommended_columns = dict.fromkeys(col for col, col_lower in zip(column_names, lowered_names)
+                                                                    if _column_pii_types(col_lower) & known_types)
+                                column_names_key = tuple(column_names)
+                                for pii_type in dict.fromkeys(ai_pii_types):
+                                    if pii_type in known_types:
+                                        continue
+                                    matching_columns = _find_columns_cached(column_names_key, pii_type)
+                                    for col in matching_columns:
+                                        recommended_columns.setdefault(col, None)
                                     # if matching_columns:
                                     #     st.write(f"    🎯 Mapped {pii_type} to: {matching_columns}")
                                 
-                                # Remove duplicates
-                                recommended_columns = list(set(recommended_columns))
-                                columns_to_process = recommended_columns
+                                columns_to_process = list(recommended_columns)
                                 # st.write(f"    ✅ Final AI-mapped columns: {columns_to_process}")
                             
                             # If no matches from AI recommendations, fall back to pattern-based detection
                             if not columns_to_process:
                                 # st.write(f"    🔍 No AI mappings found, using pattern-based detection...")
                                 # Look for common PII patterns in all columns
-                                pii_patterns = ['name', 'email', 'phone', 'address', 'ssn', 'birth', 'id', 
-                                              'login', 'user', 'person', 'customer', 'employee', 'contact',
-                                              'mobile', 'tel', 'mail', 'zip', 'postal', 'city', 'state']
-                                
                                 columns_to_process = [col for col in column_names 
-                                                    if any(pattern in col.lower() for pattern in pii_patterns)
-                                                    and not any(exclude in col.lower() for exclude in exclude_patterns)]
+                                                    if _PII_COLUMN_RE.search(col) and not _EXCLUDE_COLUMN_RE.search(col)]
                                 # st.write(f"    🎯 Pattern-matched columns: {columns_to_process}")
                             
                             # If still nothing, include name columns as minimum
@@ -1619,39 +2157,17 @@ def show_encryption_preparation():
                             # st.write(f"    🔍 Available columns: {column_names[:10]}...")  # Show first 10 columns
                             # if not focus_name_columns:
                                 # st.write(f"    📋 AI recommended columns: {[pii_col.get('column', str(pii_col)) if isinstance(pii_col, dict) else str(pii_col) for pii_col in table.get('pii_columns', [])]}")
-                            continue
+                            return None
                         
                         # st.write(f"  🔍 Processing columns in {schema}.{table_name}: {', '.join(columns_to_process)}")
                         
                         # **SMART APPROACH: Pull ALL data at once into pandas DataFrame**
-                        target_columns_str = ', '.join([f"[{col}]" for col in columns_to_process])
-                        
-                        # Build the WHERE clause more carefully to avoid NULL issues
-                        non_null_conditions = []
-                        for col in columns_to_process:
-                            non_null_conditions.append(f"[{col}] IS NOT NULL AND [{col}] != ''")
-                        where_clause = ' OR '.join(non_null_conditions) if non_null_conditions else "1=1"
-                        
-                        # Build query dynamically - always include primary key if available
-                        if pk_columns and pk_columns[0] != 'RowNum':
-                            pk_columns_str = ', '.join([f"[{col}]" for col in pk_columns])
-                            query = f"""
-                            SELECT {pk_columns_str}, {target_columns_str}
-                            FROM [{schema}].[{table_name}]
-                            WHERE ({where_clause})
-                            ORDER BY {pk_columns_str}
-                            """
-                        else:
-                            # No reliable primary key, use ROW_NUMBER()
-                            query = f"""
-                            SELECT ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) as RowNum, {target_columns_str}
-                            FROM [{schema}].[{table_name}]
-                            WHERE ({where_clause})
-                            ORDER BY RowNum
-                            """
-                            pk_columns = ['RowNum']
+                        query, pk_columns = _build_encryption_scan_query(
+                            schema, table_name, tuple(pk_columns), tuple(columns_to_process)
+                        )
+                        pk_columns = list(pk_columns)
                         
-                        cursor = db_manager.connections[connection_id]['connection'].cursor()
+                        cursor = worker_connection().cursor()
                         
                         # **SAFE QUERY EXECUTION: Handle ODBC data type errors**
                         try:
@@ -1660,35 +2176,26 @@ def show_encryption_preparation():
                             cursor.close()
                             # Skip table silently if query execution fails (e.g., unsupported ODBC data types)
                             # st.write(f"  ⏭️ Skipping {schema}.{table_name} - unsupported data types")
-                            continue
+                            return None
                         
                         # Get column descriptions to understand what we actually got back
                         column_descriptions = [desc[0] for desc in cursor.description]
                         
-                        # Fetch data efficiently
+                        # Fetch data efficiently in large batches; pyodbc.Row is a sequence, so the rows
+                        # go straight into the DataFrame without per-row copies
+                        cursor.arraysize = 50000
                         all_rows = []
-                        row_count = 0
                         while True:
-                            row = cursor.fetchone()
-                            if row is None:
+                            batch = cursor.fetchmany(cursor.arraysize)
+                            if not batch:
                                 break
-                            
-                            # Convert pyodbc.Row to individual column values
-                            if hasattr(row, '__getitem__'):
-                                # pyodbc.Row object - extract individual values by index
-                                row_values = [row[i] for i in range(len(row))]
-                            else:
-                                # Single value, wrap in list
-                                row_values = [row]
-                            
-                            all_rows.append(row_values)
-                            row_count += 1
+                            all_rows.extend(batch)
                         
                         cursor.close()
                         
                         if not all_rows:
                             # st.write(f"  ⏭️ No data found in {schema}.{table_name}")
-                            continue
+                            return None
                         
                         # st.write(f"  📊 Found {len(all_rows):,} rows with PII data")
                         
@@ -1710,7 +2217,7 @@ def show_encryption_preparation():
                             df = pd.DataFrame(all_rows, columns=column_descriptions)
                         except Exception as df_error:
                             # st.write(f"  ⏭️ Skipping {schema}.{table_name} - data processing error")
-                            continue
+                            return None
                         
                         # st.write(f"  📊 Created DataFrame with {len(df):,} rows and {len(df.columns)} columns")
                         
@@ -1720,14 +2227,18 @@ def show_encryption_preparation():
                         
                         if not actual_target_columns:
                             st.write(f"  ⏭️ No target columns found in returned data for {schema}.{table_name}")
-                            continue
+                            return None
                         
                         # **VECTORIZED PROCESSING: Create primary key column**
                         if actual_pk_columns:
                             if len(actual_pk_columns) == 1:
                                 df['Primary_Key'] = df[actual_pk_columns[0]].astype(str)
                             else:
-                                df['Primary_Key'] = df[actual_pk_columns].astype(str).apply(lambda x: '|'.join(x), axis=1)
+                                # Vectorized join of the key parts instead of a per-row apply
+                                pk_parts = df[actual_pk_columns].astype(str)
+                                df['Primary_Key'] = pk_parts[actual_pk_columns[0]].str.cat(
+                                    [pk_parts[col] for col in actual_pk_columns[1:]], sep='|', na_rep=''
+                                )
                         else:
                             df['Primary_Key'] = df.index.astype(str)
                         
@@ -1738,18 +2249,13 @@ def show_encryption_preparation():
                         if len(available_name_cols) >= 2:  # If we have at least FirstName + LastName
                             # st.write(f"  🔗 Consolidating name fields: {', '.join(available_name_cols)}")
                             
-                            # Create FullName by concatenating available name parts
-                            name_parts = []
-                            for col in available_name_cols:
-                                # Only add non-null, non-empty values
-                                name_parts.append(df[col].fillna('').astype(str).replace('', pd.NA))
-                            
-                            # Combine name parts with space separator, removing NaN/empty parts
-                            df['FullName'] = name_parts[0].fillna('')
-                            for part in name_parts[1:]:
-                                df['FullName'] = df['FullName'] + ' ' + part.fillna('')
+                            # Create FullName by concatenating available name parts in one vectorized join
+                            name_parts = df[available_name_cols].fillna('').astype(str)
+                            df['FullName'] = name_parts[available_name_cols[0]].str.cat(
+                                [name_parts[col] for col in available_name_cols[1:]], sep=' '
+                            )
                             
-                            # Clean up extra spaces and empty entries
+                            # Clean up extra spaces (from missing parts) and empty entries
                             df['FullName'] = df['FullName'].str.strip().str.replace(r'\s+', ' ', regex=True)
                             df['FullName'] = df['FullName'].replace('', pd.NA)
                             
@@ -1761,74 +2267,143 @@ def show_encryption_preparation():
                         missing_columns = [col for col in actual_target_columns if col not in df.columns]
                         if missing_columns:
                             # st.write(f"  ⏭️ Skipping {schema}.{table_name} - missing required columns")
-                            continue
+                            return None
                         
                         # **MELT DataFrame to get one row per column value**
                         # Only melt the target columns (actual columns returned from DB)
                         if not actual_target_columns:
                             st.write(f"  ⏭️ No target columns to process for {schema}.{table_name}")
-                            continue
+                            return None
                         
-                        # **SAFE MELTING: Handle DataFrame melting with error protection**
+                        # **SAFE MELTING: Handle DataFrame reshaping with error protection**
+                        # Only Primary_Key is needed downstream, so it is the only id column replicated;
+                        # stack() reshapes row-wise and (on pandas 2.0) already skips null cells
                         try:
-                            melted_df = pd.melt(df, 
-                                              id_vars=actual_pk_columns + ['Primary_Key'], 
-                                              value_vars=actual_target_columns,
-                                              var_name='Column_Name', 
-                                              value_name='Name')
+                            wide_df = df.set_index('Primary_Key')[actual_target_columns]
+                            wide_df.columns.name = 'Column_Name'
+                            melted_df = wide_df.stack().reset_index(name='Name')
                         except Exception as melt_error:
                             # Skip table silently if melting fails - don't show error to user
                             # st.write(f"  ⏭️ Skipping {schema}.{table_name} - data structure incompatible")
-                            continue
+                            return None
                         
-                        # **FILTER: Remove null/empty values**
-                        melted_df = melted_df.dropna(subset=['Name'])
-                        melted_df = melted_df[melted_df['Name'].astype(str).str.strip() != '']
-                        melted_df = melted_df[~melted_df['Name'].astype(str).str.lower().isin(['null', 'none', ''])]
+                        # **FILTER: Remove null/empty values** in one row selection: one regex pass flags
+                        # blank/whitespace-only names and 'null'/'none' placeholders (any case)
+                        placeholder = melted_df['Name'].astype(str).str.fullmatch(r'\s*|(?i:null|none)', na=True)
+                        melted_df = melted_df[melted_df['Name'].notna().to_numpy() & ~placeholder.to_numpy(dtype=bool)]
                         
                         if melted_df.empty:
                             st.write(f"  ⏭️ No valid data after filtering in {schema}.{table_name}")
-                            continue
+                            return None
                         
-                        # **VECTORIZED: Add metadata columns**
-                        melted_df['Schema'] = f"{database_name}.{schema}.{table_name}"
+                        # **VECTORIZED: Add metadata columns** (constant per table: Schema and Priority are stored
+                        # as one-entry categoricals, i.e. a code per row instead of a string per row)
+                        constant_codes = np.zeros(len(melted_df), dtype=np.int8)
+                        melted_df['Schema'] = pd.Categorical.from_codes(constant_codes, [f"{database_name}.{schema}.{table_name}"])
                         melted_df['AI_Confidence'] = table.get('confidence', 0.0)
-                        melted_df['Priority'] = table.get('priority', 'MEDIUM')
-                        melted_df['Column_Type'] = melted_df['Column_Name'].apply(
-                            lambda col: 'NAME' if any(pattern in col.lower() 
-                                                     for pattern in ['name', 'firstname', 'lastname']) 
-                                                else 'PII'
-                        )
+                        melted_df['Priority'] = pd.Categorical.from_codes(constant_codes, [table.get('priority') or 'MEDIUM'])
+                        # Classify each target column once ('name' also covers firstname/lastname/fullname),
+                        # then map onto its rows as a two-value categorical
+                        column_types = {col: 'NAME' if 'name' in col.lower() else 'PII' for col in actual_target_columns}
+                        melted_df['Column_Type'] = pd.Categorical(melted_df['Column_Name'].map(column_types),
+                                                                  categories=['NAME', 'PII'])
                         
                         # **VECTORIZED: Generate encryption keys using apply - FAST VERSION**
                         if generate_keys:
                             st.write(f"  🔐 Generating {len(melted_df):,} encryption keys...")
-                            # Use vectorized string operations for much faster processing
-                            melted_df['Encryption_Key'] = 'ENC_' + melted_df['Name'].astype(str).apply(
-                                lambda x: hashlib.sha256(x.encode('utf-8')).hexdigest()[:32] if x and str(x).strip() else ""
-                            )
+                            # One bulk pass over the column instead of a per-row apply
+                            melted_df['Encryption_Key'] = generate_encryption_keys_bulk(melted_df['Name'])
                         else:
                             melted_df['Encryption_Key'] = ""
                         
                         # Select final columns in the required format
                         final_df = melted_df[['Name', 'Primary_Key', 'Schema', 'AI_Confidence', 'Encryption_Key', 'Column_Type', 'Priority']].rename(columns={'Primary_Key': 'Key'})
                         
-                        # Convert to list of dictionaries for consistency with existing code
-                        table_encryption_data = final_df.to_dict('records')
-                        all_encryption_data.extend(table_encryption_data)
-                        
-                        # st.write(f"  ✅ Processed {len(table_encryption_data):,} records from {schema}.{table_name}")
-                        total_rows_processed += len(table_encryption_data)
+                        # st.write(f"  ✅ Processed {len(final_df):,} records from {schema}.{table_name}")
+                        return final_df
                         
                     except Exception as table_error:
                         # st.write(f"  ⏭️ Skipped {schema}.{table_name}: {str(table_error)}")
-                        continue
-                    
-                    # Update progress
-                    progress_bar.progress((table_idx + 1) / total_tables)
+                        return None
+                
+                # Each worker reads over its own ODBC connection, since one SQL Server connection
+                # cannot stream several result sets at once; managers without that support stay sequential
+                can_open_workers = hasattr(db_manager, 'open_worker_connection')
+                worker_state = threading.local()
+                worker_connections = []
+                
+                def worker_connection():
+                    """The calling thread's connection, opened on first use"""
+                    if not can_open_workers:
+                        return db_manager.connections[connection_id]['connection']
+                    connection = getattr(worker_state, 'connection', None)
+                    if connection is None:
+                        connection = db_manager.open_worker_connection(connection_id)
+                        worker_state.connection = connection
+                        worker_connections.append(connection)
+                    return connection
+                
+                # Tables are independent and dominated by ODBC I/O, so scan them concurrently and
+                # collect the results in the original table order
+                table_results = [None] * total_tables
+                
+                # Skip tables the partition stats report as empty, and scan small tables first so
+                # progress moves steadily; tables without a known count keep their place at the end
+                scan_order = list(range(total_tables))
+                if row_counts is not None:
+                    table_row_counts = [
+                        row_counts.get((table.get('schema', database_name).lower(), table['table_name'].lower()))
+                        for table in tables_to_process
+                    ]
+                    scan_order = sorted((table_idx for table_idx in scan_order if table_row_counts[table_idx] != 0),
+                                        key=lambda table_idx: (table_row_counts[table_idx] is None,
+                                                               table_row_counts[table_idx] or 0))
+                tables_to_scan = len(scan_order)
+                
+                # Each progress update is a websocket delta; cap them at ~50 per scan
+                update_every = max(1, tables_to_scan // 50)
+                script_ctx = get_script_run_ctx()
+                try:
+                    with concurrent.futures.ThreadPoolExecutor(
+                        max_workers=min(8, max(tables_to_scan, 1)) if can_open_workers else 1,
+                        initializer=lambda: add_script_run_ctx(threading.current_thread(), script_ctx)
+                    ) as executor:
+                        futures = {executor.submit(process_table, tables_to_process[table_idx]): table_idx
+                                   for table_idx in scan_order}
+                        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                            table_idx = futures[future]
+                            table = tables_to_process[table_idx]
+                            table_results[table_idx] = future.result()
+                            
+                            if done % update_every and done != tables_to_scan:
+                                continue
+                            status_text.text(f"Processed table {done}/{tables_to_scan}: "
+                                             f"{table.get('schema', database_name)}.{table['table_name']}")
+                            progress_bar.progress(done / tables_to_scan)
+                finally:
+                    for connection in worker_connections:
+                        try:
+                            connection.close()
+                        except Exception:
+                            pass
+                
+                # Tables stay DataFrames until here, so the insert below works on one concatenated frame;
+                # the session keeps a list of dictionaries for consistency with existing code
+                table_frames = [final_df for final_df in table_results if final_df is not None and not final_df.empty]
+                # Give every table the same Schema/Priority categories so the concat stays categorical
+                for col in ('Schema', 'Priority'):
+                    categories = pd.unique(np.concatenate([final_df[col].cat.categories.to_numpy() for final_df in table_frames] or [[]]))
+                    for final_df in table_frames:
+                        final_df[col] = final_df[col].cat.set_categories(categories)
+                encryption_df = pd.concat(table_frames, ignore_index=True) if table_frames else pd.DataFrame(
+                    columns=['Name', 'Key', 'Schema', 'AI_Confidence', 'Encryption_Key', 'Column_Type', 'Priority'])
+                all_encryption_data = encryption_df.to_dict('records')
+                total_rows_processed = len(encryption_df)
                 
                 # Store results
                 st.session_state.encryption_preparation_results = all_encryption_data
+                st.session_state.encryption_results_df = encryption_df
+                st.session_state.pop('encryption_stats', None)  # recomputed from the new frame on first use
                 
                 # **SAVE TO RESULTS DATABASE - ROBUST BULK INSERT WITH DETAILED LOGGING**
                 if all_encryption_data:
@@ -1842,17 +2417,8 @@ def show_encryption_preparation():
                             # st.success(f"✅ Connected to Results database (Connection ID: {results_connection_id})")
                             
                             logger.info(f"Connected to Results database (Connection ID: {results_connection_id})")
-                            # st.write("🧹 **Step 2**: Clearing existing results for this database...")
-                            logger.info(f"Clearing existing results for database '{database_name}'")
                             
-                            # Always delete results before new insert
-                            # delete_count = results_cursor.execute("DELETE FROM dbo.identified_names_team_epsilon").rowcount
-                            # Clear existing results for this database to avoid duplicates
-                            delete_count = results_cursor.execute("DELETE FROM dbo.identified_names_team_epsilon WHERE source LIKE ?", (f"{database_name}.%",)).rowcount
-                            # st.info(f"🗑️ Cleared {delete_count} existing records for database '{database_name}'")
-                            logger.info(f"Cleared {delete_count} existing records for database '{database_name}'")
-                            
-                            # st.write("📋 **Step 3**: Preparing data for bulk insert...")
+                            # st.write("📋 **Step 2**: Preparing data for bulk insert...")
                             logger.info(f"Preparing {len(all_encryption_data):,} records for bulk insert")
                             
                             # **ULTRA-FAST WHOLE INSERT: Create pandas DataFrame and use bulk insert**
@@ -1860,112 +2426,121 @@ def show_encryption_preparation():
                             # st.write(f"  💾 Total records to process: {total_records:,}")
                             logger.info(f"Total records to process: {total_records:,}")
                             
-                            # Convert all data to DataFrame for fastest possible insert
-                            insert_data = []
-                            conversion_errors = 0
+                            # Convert all data to DataFrame for fastest possible insert: validate and convert
+                            # column-at-a-time (empty/None values become '', strings are truncated to avoid SQL errors)
+                            records_df = encryption_df
                             
-                            for i, record in enumerate(all_encryption_data):
-                                try:
-                                    # Validate and convert each record
-                                    converted_record = {
-                                        'name': str(record['Name'])[:255] if record['Name'] else '',  # Truncate to avoid SQL errors
-                                        'source': str(record['Schema'])[:500] if record['Schema'] else '',
-                                        'probability': float(record['AI_Confidence']) * 100 if record['AI_Confidence'] else 0.0,
-                                        'key': str(record['Key'])[:500] if record['Key'] else '',  # Increased from 100 to 500
-                                        'encrypt_key': str(record['Encryption_Key'])[:255] if record['Encryption_Key'] else ''
-                                    }
-                                    
-                                    # Additional validation
-                                    if not converted_record['name'].strip():
-                                        continue  # Skip empty names
-                                    
-                                    insert_data.append(converted_record)
-                                    
-                                    # Show progress for large datasets
-                                    # if i > 0 and i % 10000 == 0:
-                                        # st.write(f"    📊 Processed {i:,}/{total_records:,} records for conversion...")
-                                        
-                                except Exception as conversion_error:
-                                    conversion_errors += 1
-                                    if conversion_errors <= 5:  # Show first 5 conversion errors
-                                        st.warning(f"⚠️ Record conversion error #{conversion_errors}: {str(conversion_error)}")
-                                    continue  # Skip malformed records
+                            def text_column(values: pd.Series, width: int) -> pd.Series:
+                                values = values.astype(object).fillna('')
+                                return values.astype(str).str.slice(0, width).where(values.astype(bool), '')
+                            
+                            insert_df = pd.DataFrame({
+                                'name': text_column(records_df['Name'], 255),
+                                'source': text_column(records_df['Schema'], 500),
+                                'probability': pd.to_numeric(records_df['AI_Confidence'], errors='coerce').fillna(0.0) * 100,
+                                'key': text_column(records_df['Key'], 500),  # Increased from 100 to 500
+                                'encrypt_key': text_column(records_df['Encryption_Key'], 255)
+                            })
+                            
+                            # Additional validation: skip empty names
+                            insert_df = insert_df[insert_df['name'].str.strip() != '']
                             
-                            st.success(f"✅ Data preparation complete: {len(insert_data):,} valid records prepared ({conversion_errors} conversion errors)")
+                            st.success(f"✅ Data preparation complete: {len(insert_df):,} valid records prepared")
                             
-                            if insert_data:
-                                # Execute bulk database insert
+                            if not insert_df.empty:
+                                # Batches load into a session-scoped staging table, so the results table is only
+                                # locked for the final DELETE + INSERT ... SELECT swap instead of the whole load
+                                results_cursor.execute("IF OBJECT_ID('tempdb..#stg_names') IS NOT NULL DROP TABLE #stg_names")
+                                results_cursor.execute("""
+                                CREATE TABLE #stg_names (name nvarchar(255), source nvarchar(500), probability float,
+                                                         [key] nvarchar(500), encrypt_key nvarchar(255))
+                                """)
+                                
+                                # Execute bulk staging insert
                                 insert_sql = """
-                                INSERT INTO dbo.identified_names_team_epsilon (name, source, probability, [key], encrypt_key)
+                                INSERT INTO #stg_names (name, source, probability, [key], encrypt_key)
                                 VALUES (?, ?, ?, ?, ?)
                                 """
                                 
                                 # Prepare data as tuples for executemany
-                                insert_tuples = []
-                                for record in insert_data:
-                                    try:
-                                        tuple_data = (
-                                            record['name'],
-                                            record['source'], 
-                                            record['probability'],
-                                            record['key'],
-                                            record['encrypt_key']
-                                        )
-                                        insert_tuples.append(tuple_data)
-                                    except Exception:
-                                        continue  # Skip malformed tuples
+                                insert_tuples = list(insert_df.itertuples(index=False, name=None))
                                 
                                 # st.info(f"📊 Ready to insert {len(insert_tuples):,} records")
                                 
                                 if insert_tuples:
                                     # Process in batches for memory management
-                                    batch_size = 5000
+                                    batch_size = 20000
                                     insert_count = 0
                                     failed_batches = 0
                                     total_batches = len(insert_tuples) // batch_size + (1 if len(insert_tuples) % batch_size else 0)
                                     
+                                    # Use fast_executemany for reliable bulk insert; with the parameter types declared
+                                    # once (matching the truncation above) pyodbc skips per-batch type inference, which
+                                    # also keeps it from trying to describe the #temp table's parameters
+                                    results_cursor.fast_executemany = True
+                                    results_cursor.setinputsizes([
+                                        (pyodbc.SQL_WVARCHAR, 255, 0),
+                                        (pyodbc.SQL_WVARCHAR, 500, 0),
+                                        (pyodbc.SQL_FLOAT, 0, 0),
+                                        (pyodbc.SQL_WVARCHAR, 500, 0),
+                                        (pyodbc.SQL_WVARCHAR, 255, 0),
+                                    ])
+                                    
                                     # Create progress tracking
                                     batch_progress = st.progress(0)
                                     batch_status = st.empty()
+                                    batch_update_every = max(1, total_batches // 50)
+                                    insert_start = time.time()
                                     
                                     for batch_num in range(total_batches):
                                         start_idx = batch_num * batch_size
                                         end_idx = min((batch_num + 1) * batch_size, len(insert_tuples))
                                         batch_data = insert_tuples[start_idx:end_idx]
                                         
-                                        batch_status.text(f"Processing batch {batch_num + 1}/{total_batches}")
+                                        update_progress = batch_num % batch_update_every == 0 or batch_num == total_batches - 1
+                                        if update_progress:
+                                            batch_status.text(f"Processing batch {batch_num + 1}/{total_batches}")
                                         
                                         try:
-                                            # Execute batch insert with timing
-                                            batch_start = time.time()
-                                            
-                                            # Use fast_executemany for reliable bulk insert
-                                            results_cursor.fast_executemany = True
                                             results_cursor.executemany(insert_sql, batch_data)
                                             insert_count += len(batch_data)
                                             
-                                            batch_end = time.time()
-                                            batch_time = batch_end - batch_start
-                                            
                                             # Update progress
-                                            batch_progress.progress((batch_num + 1) / total_batches)
-                                            
-                                            # Show progress every 5 batches to reduce output
-                                            if (batch_num + 1) % 5 == 0 or batch_num == total_batches - 1:
-                                                st.write(f"    ✅ Batch {batch_num + 1}/{total_batches}: {len(batch_data):,} records in {batch_time:.2f}s (Total: {insert_count:,})")
+                                            if update_progress:
+                                                batch_progress.progress((batch_num + 1) / total_batches)
                                                 
                                         except Exception as batch_error:
                                             failed_batches += 1
                                             st.error(f"❌ Batch {batch_num + 1} failed: {str(batch_error)}")
                                             continue
                                     
+                                    st.write(f"    ✅ Inserted {insert_count:,} records in {total_batches} batches ({time.time() - insert_start:.2f}s)")
+                                    
                                     # Clear progress indicators
                                     batch_progress.empty()
                                     batch_status.empty()
                                     
-                                    # Commit the transaction
+                                    # Swap the staged rows in and commit the transaction
                                     try:
+                                        # st.write("🧹 **Step 3**: Replacing existing results for this database...")
+                                        logger.info(f"Clearing existing results for database '{database_name}'")
+                                        
+                                        # A fresh cursor on the same connection (the #temp table is per connection)
+                                        # without the staging insert's declared parameter types
+                                        swap_cursor = db_manager.connections[results_connection_id]['connection'].cursor()
+                                        
+                                        # Clear existing results for this database to avoid duplicates
+                                        delete_count = swap_cursor.execute("DELETE FROM dbo.identified_names_team_epsilon WHERE source LIKE ?", (f"{database_name}.%",)).rowcount
+                                        logger.info(f"Cleared {delete_count} existing records for database '{database_name}'")
+                                        
+                                        swap_cursor.execute("""
+                                        INSERT INTO dbo.identified_names_team_epsilon (name, source, probability, [key], encrypt_key)
+                                        SELECT name, source, probability, [key], encrypt_key FROM #stg_names
+                                        """)
+                                        swap_cursor.execute("DROP TABLE #stg_names")
+                                        swap_cursor.close()
                                         db_manager.connections[results_connection_id]['connection'].commit()
+                                        _cached_results_query.clear()
                                         # st.success(f"✅ Successfully saved {insert_count:,} records to database!")
                                         
                                         if failed_batches > 0:
@@ -2002,7 +2577,7 @@ def show_encryption_preparation():
                 #     st.info(f"💾 **Database Status:** Results saved to Results database for future reference")
                 
                 # Show breakdown by type
-                name_records = len([r for r in all_encryption_data if r['Column_Type'] == 'NAME'])
+                name_records = _encryption_stats()['name']
                 pii_records = len(all_encryption_data) - name_records
                 st.metric("🚨 NAME Records (Critical)", f"{name_records:,}")
                 st.metric("📄 Other PII Records", f"{pii_records:,}")
@@ -2018,18 +2593,16 @@ def show_encryption_preparation():
         results = st.session_state.encryption_preparation_results
         
         # Summary metrics
+        stats = _encryption_stats()
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Records", f"{len(results):,}")
+            st.metric("Total Records", f"{stats['total']:,}")
         with col2:
-            name_count = len([r for r in results if r['Column_Type'] == 'NAME'])
-            st.metric("🚨 NAME Records", f"{name_count:,}")
+            st.metric("🚨 NAME Records", f"{stats['name']:,}")
         with col3:
-            high_priority = len([r for r in results if r['Priority'] == 'HIGH'])
-            st.metric("🔴 High Priority", f"{high_priority:,}")
+            st.metric("🔴 High Priority", f"{stats['high_priority']:,}")
         with col4:
-            unique_tables = len(set([r['Schema'].split('.')[1] + '.' + r['Schema'].split('.')[2] for r in results]))
-            st.metric("📋 Tables", unique_tables)
+            st.metric("📋 Tables", stats['tables'])
         
         # Preview table
         st.subheader("🔍 Sample Encryption Records")
@@ -2057,28 +2630,17 @@ def show_encryption_preparation():
             
             # Format confidence properly (it's already a decimal)
             if '🎯 AI Confidence' in display_df.columns:
-                display_df['🎯 AI Confidence'] = display_df['🎯 AI Confidence'].apply(lambda x: f"{x:.2f}" if pd.notnull(x) else "N/A")
+                display_df['🎯 AI Confidence'] = _format_decimal(display_df['🎯 AI Confidence'])
             
             # Truncate long values for display
             if '🔐 Encryption Key' in display_df.columns:
-                display_df['🔐 Encryption Key'] = display_df['🔐 Encryption Key'].apply(lambda x: f"{str(x)[:15]}..." if pd.notnull(x) and len(str(x)) > 15 else str(x))
+                display_df['🔐 Encryption Key'] = _truncate_text(display_df['🔐 Encryption Key'], 15)
             
             if '📍 Schema Location' in display_df.columns:
                 display_df['📍 Schema Location'] = display_df['📍 Schema Location'].apply(lambda x: '.'.join(str(x).split('.')[-2:]) if '.' in str(x) else str(x))
             
             # Color-code priority and type
-            def style_priority(val):
-                if val == 'HIGH':
-                    return 'background-color: #ffcdd2; color: #d32f2f; font-weight: bold;'
-                elif val == 'MEDIUM':
-                    return 'background-color: #fff3e0; color: #f57c00; font-weight: bold;'
-                elif val == 'NAME':
-                    return 'background-color: #ffebee; color: #c62828; font-weight: bold;'
-                else:
-                    return 'background-color: #e8f5e8; color: #2e7d32; font-weight: bold;'
-            
-            # Apply styling
-            styled_df = display_df.style.applymap(style_priority, subset=['⭐ Priority', '📊 Type'])
+            styled_df = display_df.style.apply(style_priority_column, subset=['⭐ Priority', '📊 Type'])
             
             st.dataframe(
                 styled_df, 
@@ -2101,7 +2663,7 @@ def show_encryption_preparation():
         # Download option
         if st.button("💾 Download Full Encryption Table (CSV)"):
             # Convert to CSV
-            df_full = pd.DataFrame(results)
+            df_full = _encryption_results_frame()
             csv = df_full.to_csv(index=False)
             st.download_button(
                 label="📥 Download encryption-table.csv",
@@ -2140,45 +2702,45 @@ def show_results_display():
     st.success(f"✅ **Analysis Complete - {len(results):,} encryption records ready**")
     
     # Summary metrics
+    stats = _encryption_stats()
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Records", f"{len(results):,}")
+        st.metric("Total Records", f"{stats['total']:,}")
     with col2:
-        name_records = len([r for r in results if r['Column_Type'] == 'NAME'])
-        st.metric("🚨 NAME Records", f"{name_records:,}")
+        st.metric("🚨 NAME Records", f"{stats['name']:,}")
     with col3:
-        high_priority = len([r for r in results if r['Priority'] == 'HIGH'])
-        st.metric("🔴 High Priority", f"{high_priority:,}")
+        st.metric("🔴 High Priority", f"{stats['high_priority']:,}")
     with col4:
-        unique_tables = len(set([r['Schema'].split('.')[1] + '.' + r['Schema'].split('.')[2] for r in results]))
-        st.metric("📋 Tables Processed", unique_tables)
+        st.metric("📋 Tables Processed", stats['tables'])
     
     # Detailed breakdown
     st.subheader("🔍 Encryption Records Breakdown")
     
-    # Group by table
+    # Group by table, accumulating each table's summary counts in the same single pass
     table_groups = {}
+    table_summaries = {}
     for record in results:
         schema_parts = record['Schema'].split('.')
         if len(schema_parts) >= 3:
             table_key = f"{schema_parts[1]}.{schema_parts[2]}"
-            if table_key not in table_groups:
-                table_groups[table_key] = []
-            table_groups[table_key].append(record)
+            table_groups.setdefault(table_key, []).append(record)
+            summary = table_summaries.setdefault(table_key, {'name_count': 0, 'confidence_sum': 0.0, 'columns': set()})
+            summary['name_count'] += record['Column_Type'] == 'NAME'
+            summary['confidence_sum'] += record['AI_Confidence']
+            summary['columns'].add(schema_parts[-1])
     
     # Display by table
     for table_name, table_records in table_groups.items():
+        summary = table_summaries[table_name]
         with st.expander(f"📋 **{table_name}** ({len(table_records)} records)", expanded=False):
             # Show summary for this table
-            name_count = len([r for r in table_records if r['Column_Type'] == 'NAME'])
             col1, col2 = st.columns(2)
             with col1:
                 st.metric("Total Records", len(table_records))
-                st.metric("NAME Records", name_count)
+                st.metric("NAME Records", summary['name_count'])
             with col2:
-                columns = set([r['Schema'].split('.')[-1] for r in table_records])
-                st.metric("Columns", len(columns))
-                avg_confidence = sum([r['AI_Confidence'] for r in table_records]) / len(table_records)
+                st.metric("Columns", len(summary['columns']))
+                avg_confidence = summary['confidence_sum'] / len(table_records)
                 st.metric("Avg AI Confidence", f"{avg_confidence:.2f}")
             
             # Show sample records
@@ -2202,25 +2764,14 @@ def show_results_display():
                 
                 # Format confidence properly (it's already a decimal)
                 if '🎯 AI Confidence' in display_df.columns:
-                    display_df['🎯 AI Confidence'] = display_df['🎯 AI Confidence'].apply(lambda x: f"{x:.2f}" if pd.notnull(x) else "N/A")
+                    display_df['🎯 AI Confidence'] = _format_decimal(display_df['🎯 AI Confidence'])
                 
                 # Truncate long encryption keys for display
                 if '🔐 Encryption Key' in display_df.columns:
-                    display_df['🔐 Encryption Key'] = display_df['🔐 Encryption Key'].apply(lambda x: f"{str(x)[:15]}..." if pd.notnull(x) and len(str(x)) > 15 else str(x))
-                
-                # Color-code priority and type
-                def style_priority(val):
-                    if val == 'HIGH':
-                        return 'background-color: #ffcdd2; color: #d32f2f; font-weight: bold;'
-                    elif val == 'MEDIUM':
-                        return 'background-color: #fff3e0; color: #f57c00; font-weight: bold;'
-                    elif val == 'NAME':
-                        return 'background-color: #ffebee; color: #c62828; font-weight: bold;'
-                    else:
-                        return 'background-color: #e8f5e8; color: #2e7d32; font-weight: bold;'
+                    display_df['🔐 Encryption Key'] = _truncate_text(display_df['🔐 Encryption Key'], 15)
                 
-                # Apply styling and display
-                styled_df = display_df.style.applymap(style_priority, subset=['⭐ Priority', '📊 Type'])
+                # Color-code priority and type, then display
+                styled_df = display_df.style.apply(style_priority_column, subset=['⭐ Priority', '📊 Type'])
                 
                 st.dataframe(
                     styled_df, 
@@ -2242,8 +2793,7 @@ def show_results_display():
     
     with col1:
         if st.button("📥 Download Full Results (CSV)"):
-            import pandas as pd
-            df = pd.DataFrame(results)
+            df = _encryption_results_frame()
             csv = df.to_csv(index=False)
             st.download_button(
                 label="📥 Download CSV File",
@@ -2258,14 +2808,13 @@ def show_results_display():
             summary_data = {
                 'database': database_name,
                 'total_records': len(results),
-                'name_records': len([r for r in results if r['Column_Type'] == 'NAME']),
+                'name_records': stats['name'],
                 'tables_processed': len(table_groups),
-                'high_priority_records': len([r for r in results if r['Priority'] == 'HIGH']),
+                'high_priority_records': stats['high_priority'],
                 'generated_at': datetime.now().isoformat()
             }
             
-            import json
-            report_json = json.dumps(summary_data, indent=2)
+            report_json = _json_bytes(summary_data)
             st.download_button(
                 label="📥 Download Summary Report",
                 data=report_json,
@@ -2306,6 +2855,7 @@ def show_upload_regulations():
             try:
                 # Extract text
                 with st.spinner("� Reading PDF..."):
+                    pdf_hash = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
                     pdf_text = read_pdf_text(uploaded_file)
                     
                     if not pdf_text.strip():
@@ -2314,7 +2864,7 @@ def show_upload_regulations():
                 
                 # Process with AI
                 with st.spinner("🤖 Analyzing with AI..."):
-                    regulation_data = get_personal_data_definition(pdf_text)
+                    regulation_data = get_personal_data_definition(pdf_text, pdf_hash)
                     
                     if not regulation_data:
                         st.error("❌ Failed to process document with AI. Please try again.")
@@ -2332,19 +2882,17 @@ def show_upload_regulations():
                     with col1:
                         pretty_print = st.checkbox("Pretty Format", value=True)
                     
-                    if pretty_print:
-                        json_str = json.dumps(regulation_data, indent=2)
-                    else:
-                        json_str = json.dumps(regulation_data)
+                    # Serialize once: the bytes go to the download as-is, the text to the display
+                    json_bytes = _json_bytes(regulation_data, pretty=pretty_print)
                     
                     # Display JSON
-                    st.code(json_str, language='json')
+                    st.code(json_bytes.decode('utf-8'), language='json')
                     
                     # Simple download
                     filename = uploaded_file.name.replace('.pdf', '_regulation.json')
                     st.download_button(
                         label="💾 Download JSON",
-                        data=json_str,
+                        data=json_bytes,
                         file_name=filename,
                         mime="application/json",
                         use_container_width=True
@@ -2383,11 +2931,11 @@ def show_upload_regulations():
             st.session_state.current_page = "5. Check Results Table"
             st.rerun()
 
-def show_check_results_table():
-    """New page to check and search the identified_names_team_epsilon table"""
-    st.header("🔍 Check Results Table")
-    st.markdown("Search and browse the identified PII names from the results database.")
-    
+# A fragment: typing a name, moving the slider or searching reruns only this panel,
+# not the statistics and recent additions below it
+@st.fragment
+def _results_search_panel():
+    """Name search inputs and results for the Check Results Table page"""
     # Input field for name search
     search_name = st.text_input("🔎 Enter name to search for:", placeholder="e.g., Robert D. Junior")
     
@@ -2420,62 +2968,31 @@ def show_check_results_table():
                 results = search_similar_names(search_name, similarity_threshold)
                 st.subheader(f"Similar names to: '{search_name}' (threshold: {similarity_threshold})")
             
-            if results:
-                # Convert to DataFrame for enhanced display
-                df = pd.DataFrame(results)
+            if not results.empty:
+                df = results
                 
                 # Show count with enhanced styling
-                st.markdown(f"""
-                <div style='background: linear-gradient(90deg, #4CAF50 0%, #45a049 100%); 
-                            padding: 15px; border-radius: 10px; text-align: center; margin: 10px 0;'>
-                    <h3 style='color: white; margin: 0; font-weight: bold;'>
-                        ✅ Found {len(results)} matching record{'s' if len(results) != 1 else ''}
-                    </h3>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(_FOUND_BANNER_HTML.format(count=len(results), plural='s' if len(results) != 1 else ''),
+                            unsafe_allow_html=True)
                 
                 # Add similarity score column if doing similar search
                 if similar_search and 'similarity_score' in df.columns:
                     df = df.sort_values('similarity_score', ascending=False)
                 
-                # Enhance column names for better display
-                column_mapping = {
-                    'id': 'ID',
-                    'name': '👤 Name',
-                    'source': '📍 Source',
-                    'probability': '📊 Probability',
-                    'key': '🔑 Key',
-                    'encrypt_key': '🔐 Encryption Key',
-                    'similarity_score': '🎯 Similarity Score'
-                }
-                
                 # Rename columns for better display
-                display_df = df.rename(columns=column_mapping)
-                
-                # Format probability and similarity columns properly
-                if '📊 Probability' in display_df.columns:
-                    display_df['📊 Probability'] = display_df['📊 Probability'].apply(lambda x: f"{x:.2f}" if pd.notnull(x) else "N/A")
+                display_df = df.rename(columns=_RESULTS_COLUMN_MAPPING)
                 
-                if '🎯 Similarity Score' in display_df.columns:
-                    display_df['🎯 Similarity Score'] = display_df['🎯 Similarity Score'].apply(lambda x: f"{x:.2f}" if pd.notnull(x) else "N/A")
+                # Probability and similarity stay numeric; the column config formats them client-side
                 
                 # Truncate long encryption keys for display
                 if '🔐 Encryption Key' in display_df.columns:
-                    display_df['🔐 Encryption Key'] = display_df['🔐 Encryption Key'].apply(lambda x: f"{str(x)[:20]}..." if pd.notnull(x) and len(str(x)) > 20 else str(x))
+                    display_df['🔐 Encryption Key'] = _truncate_text(display_df['🔐 Encryption Key'], 20)
                 
                 # Display the enhanced results table with column configuration
                 st.dataframe(
                     display_df, 
                     use_container_width=True,
-                    column_config={
-                        "ID": st.column_config.NumberColumn("ID", width="small"),
-                        "👤 Name": st.column_config.TextColumn("👤 Name", width="medium"),
-                        "📍 Source": st.column_config.TextColumn("📍 Source", width="large"),
-                        "📊 Probability": st.column_config.TextColumn("📊 Probability", width="small"),
-                        "🔑 Key": st.column_config.TextColumn("🔑 Key", width="medium"),
-                        "🔐 Encryption Key": st.column_config.TextColumn("🔐 Encryption Key", width="medium"),
-                        "🎯 Similarity Score": st.column_config.TextColumn("🎯 Similarity Score", width="small"),
-                    },
+                    column_config=_RESULTS_COLUMN_CONFIG,
                     hide_index=True
                 )
                 
@@ -2493,6 +3010,13 @@ def show_check_results_table():
                 
         except Exception as e:
             st.error(f"Error searching database: {str(e)}")
+
+def show_check_results_table():
+    """New page to check and search the identified_names_team_epsilon table"""
+    st.header("🔍 Check Results Table")
+    st.markdown("Search and browse the identified PII names from the results database.")
+    
+    _results_search_panel()
     
     # Show some statistics about the table
     st.markdown("---")
@@ -2510,31 +3034,17 @@ def show_check_results_table():
                 st.metric("Unique Sources", stats.get('unique_sources', 0))
                 
             # Show recent additions if any
-            recent_records = get_recent_records(limit=5)
-            if recent_records:
+            recent_df = get_recent_records(limit=5)
+            if not recent_df.empty:
                 st.subheader("🕒 Recent Additions")
-                recent_df = pd.DataFrame(recent_records)
                 
                 # Enhanced column names
-                column_mapping = {
-                    'name': '👤 Name',
-                    'source': '📍 Source',
-                    'probability': '📊 Probability'
-                }
-                recent_df = recent_df.rename(columns=column_mapping)
-                
-                # Format probability properly (it's already in percentage)
-                if '📊 Probability' in recent_df.columns:
-                    recent_df['📊 Probability'] = recent_df['📊 Probability'].apply(lambda x: f"{x:.2f}" if pd.notnull(x) else "N/A")
+                recent_df = recent_df.rename(columns=_RESULTS_COLUMN_MAPPING)
                 
                 st.dataframe(
                     recent_df, 
                     use_container_width=True,
-                    column_config={
-                        "👤 Name": st.column_config.TextColumn("👤 Name", width="medium"),
-                        "📍 Source": st.column_config.TextColumn("📍 Source", width="large"),
-                        "📊 Probability": st.column_config.TextColumn("📊 Probability", width="small"),
-                    },
+                    column_config=_RECENT_COLUMN_CONFIG,
                     hide_index=True
                 )
         else:
@@ -2548,184 +3058,163 @@ def show_check_results_table():
         st.session_state.current_page = "Dashboard"
         st.rerun()
 
+# Whitespace runs and the trailing name suffixes that vary between sources (Jr, Jr., Senior, Sr, III, ...)
+_WS_RE = re.compile(r'\s+')
+_SUFFIX_RE = re.compile(r' (?:jr|junior|sr|senior|iii|ii|iv)$')
+
 def normalize_name(name: str) -> str:
     """Normalize a name for better matching by removing periods, extra spaces, etc."""
     if not name:
         return ""
     
-    # Convert to lowercase and strip
-    normalized = name.lower().strip()
+    # Lowercase, strip, remove periods and collapse whitespace
+    normalized = _WS_RE.sub(' ', name.lower().strip().replace('.', ''))
     
-    # Remove periods
-    normalized = normalized.replace('.', '')
-    
-    # Replace multiple spaces with single space
-    normalized = re.sub(r'\s+', ' ', normalized)
-    
-    # Remove common suffixes that might vary (Jr, Jr., Senior, Sr, Sr., etc.)
+    # Remove common suffixes that might vary
     # This makes "Robert D Junior" match "Robert D. Junior" 
-    suffixes = [' jr', ' junior', ' sr', ' senior', ' iii', ' ii', ' iv']
-    for suffix in suffixes:
-        if normalized.endswith(suffix):
-            normalized = normalized[:-len(suffix)].strip()
-            break
-    
-    return normalized
+    return _SUFFIX_RE.sub('', normalized).strip()
+
+def normalize_series(names: pd.Series) -> pd.Series:
+    """normalize_name applied to a whole column with vectorized string methods"""
+    normalized = (names.fillna('').astype(str).str.lower().str.strip()
+                  .str.replace('.', '', regex=False)
+                  .str.replace(_WS_RE, ' ', regex=True))
+    return normalized.str.replace(_SUFFIX_RE, '', regex=True).str.strip()
+
+_RESULTS_SELECT = """
+SELECT id, name, source, probability, [key], encrypt_key
+FROM [dbo].[identified_names_team_epsilon]
+"""
+
+# Results-table reads are cached per query and parameters, so slider changes and button
+# clicks don't reconnect and re-query; saving new results clears it. Names are normalized
+# here too, once per fetch rather than on every search.
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_results_query(_db_manager, query: str, params: tuple = ()) -> pd.DataFrame:
+    connection_id = _db_manager.connect_to_database("Results")
+    df = _db_manager.execute_query(connection_id, query, list(params) or None)
+    if not df.empty and 'name' in df.columns:
+        df['_norm_name'] = normalize_series(df['name'])
+    return df
 
-def search_exact_names(search_name: str) -> List[Dict]:
+def search_exact_names(search_name: str) -> pd.DataFrame:
     """Search for exact matches in the identified_names_team_epsilon table"""
     try:
-        # Connect to the Results database
-        connection_id = st.session_state.db_manager.connect_to_database("Results")
+        search_name_normalized = normalize_name(search_name)
         
-        # Query the table directly
-        query = """
-        SELECT id, name, source, probability, [key], encrypt_key
-        FROM [dbo].[identified_names_team_epsilon]
-        """
+        # Let the server narrow the table to rows containing the first normalized token;
+        # every exact match contains it, and normalize_name below has the final say
+        query, params = _RESULTS_SELECT, ()
+        if search_name_normalized:
+            first_token = search_name_normalized.split(' ', 1)[0]
+            query += "WHERE LOWER(REPLACE(name, '.', '')) LIKE ?"
+            params = ('%' + re.sub(r'([\[%_])', r'[\1]', first_token) + '%',)
         
-        df = st.session_state.db_manager.execute_query(connection_id, query)
+        df = _cached_results_query(st.session_state.db_manager, query, params)
         
         if df.empty:
-            return []
-        
-        # Convert DataFrame to list of dictionaries
-        results = df.to_dict('records')
+            return df
         
         # Filter for exact matches (case-insensitive with normalization)
-        exact_matches = []
-        search_name_normalized = normalize_name(search_name)
+        matches = df[df['_norm_name'] == search_name_normalized]
         
-        for result in results:
-            result_name_normalized = normalize_name(result.get('name', ''))
-            if result_name_normalized == search_name_normalized:
-                exact_matches.append({
-                    'id': result.get('id'),
-                    'name': result.get('name'),
-                    'source': result.get('source'),
-                    'probability': result.get('probability'),
-                    'key': result.get('key'),
-                    'encrypt_key': result.get('encrypt_key')
-                })
-        
-        return exact_matches
+        return matches[['id', 'name', 'source', 'probability', 'key', 'encrypt_key']]
     except Exception as e:
         st.error(f"Error in exact search: {str(e)}")
-        return []
+        return pd.DataFrame()
 
-def search_similar_names(search_name: str, threshold: float = 0.6) -> List[Dict]:
+def search_similar_names(search_name: str, threshold: float = 0.6) -> pd.DataFrame:
     """Search for similar names using fuzzy matching"""
     try:
-        # Connect to the Results database
-        connection_id = st.session_state.db_manager.connect_to_database("Results")
-        
-        # Query the table directly
-        query = """
-        SELECT id, name, source, probability, [key], encrypt_key
-        FROM [dbo].[identified_names_team_epsilon]
-        """
-        
-        df = st.session_state.db_manager.execute_query(connection_id, query)
+        # Any SQL prefilter would drop legitimate fuzzy matches (e.g. 'Jon' vs 'John'), so score the whole table
+        df = _cached_results_query(st.session_state.db_manager, _RESULTS_SELECT)
         
         if df.empty:
-            return []
-        
-        # Convert DataFrame to list of dictionaries
-        results = df.to_dict('records')
+            return df
         
         # Find similar matches using difflib with normalization
-        similar_matches = []
         search_name_normalized = normalize_name(search_name)
-        
-        for result in results:
-            name_normalized = normalize_name(result.get('name', ''))
-            if name_normalized:
-                # Calculate similarity ratio on normalized names
-                similarity = difflib.SequenceMatcher(None, search_name_normalized, name_normalized).ratio()
-                
-                if similarity >= threshold:
-                    similar_matches.append({
-                        'id': result.get('id'),
-                        'name': result.get('name'),
-                        'source': result.get('source'),
-                        'probability': result.get('probability'),
-                        'key': result.get('key'),
-                        'encrypt_key': result.get('encrypt_key'),
-                        'similarity_score': round(similarity, 3)
-                    })
-        
-        return similar_matches
+        matcher = difflib.SequenceMatcher(None, search_name_normalized)
+        normalized = df['_norm_name']
+        
+        # Names repeat across tables: score each distinct normalized name once. ratio() can't
+        # exceed 2*min(len)/(sum of lens), so that bound drops most lengths in one vectorized step
+        distinct_names = pd.Series(normalized.unique())
+        name_lengths = distinct_names.str.len()
+        search_length = len(search_name_normalized)
+        length_bound = 2 * np.minimum(name_lengths, search_length) / (name_lengths + search_length)
+        candidates = distinct_names[(name_lengths > 0) & (length_bound >= threshold)]
+        
+        similarity_by_name = {}
+        for name_normalized in candidates:
+            # Calculate similarity ratio on normalized names; the character-count bound
+            # skips the full ratio for names that cannot reach the threshold
+            matcher.set_seq2(name_normalized)
+            if matcher.quick_ratio() >= threshold:
+                similarity_by_name[name_normalized] = matcher.ratio()
+        
+        # Names without a score (filtered out above) map to NaN and never pass the threshold
+        scores = normalized.map(similarity_by_name)
+        matches = df.loc[scores >= threshold, ['id', 'name', 'source', 'probability', 'key', 'encrypt_key']]
+        
+        return matches.assign(similarity_score=scores[scores >= threshold].round(3))
     except Exception as e:
         st.error(f"Error in similarity search: {str(e)}")
-        return []
+        return pd.DataFrame()
 
 def get_results_table_stats() -> Dict:
     """Get statistics about the results table"""
     try:
-        # Connect to the Results database
-        connection_id = st.session_state.db_manager.connect_to_database("Results")
-        
-        # Query the table directly
+        # Aggregate on the server instead of pulling every row
         query = """
-        SELECT id, name, source, probability, [key], encrypt_key
+        SELECT COUNT(*) AS total_records,
+               COUNT(DISTINCT NULLIF(LOWER(LTRIM(RTRIM(name))), '')) AS unique_names,
+               COUNT(DISTINCT NULLIF(source, '')) AS unique_sources
         FROM [dbo].[identified_names_team_epsilon]
         """
         
-        df = st.session_state.db_manager.execute_query(connection_id, query)
+        df = _cached_results_query(st.session_state.db_manager, query)
         
-        if df.empty:
+        if df.empty or not df.iloc[0]['total_records']:
             return {}
         
-        # Convert DataFrame to list of dictionaries
-        results = df.to_dict('records')
-        
-        unique_names = set()
-        unique_sources = set()
-        
-        for result in results:
-            if result.get('name'):
-                unique_names.add(result['name'].lower().strip())
-            if result.get('source'):
-                unique_sources.add(result['source'])
-        
+        row = df.iloc[0]
         return {
-            'total_records': len(results),
-            'unique_names': len(unique_names),
-            'unique_sources': len(unique_sources)
+            'total_records': int(row['total_records']),
+            'unique_names': int(row['unique_names']),
+            'unique_sources': int(row['unique_sources'])
         }
     except Exception as e:
         st.error(f"Error getting table stats: {str(e)}")
         return {}
 
-def get_recent_records(limit: int = 5) -> List[Dict]:
+def get_recent_records(limit: int = 5) -> pd.DataFrame:
     """Get recent records from the results table"""
     try:
-        # Connect to the Results database
-        connection_id = st.session_state.db_manager.connect_to_database("Results")
-        
-        # Query the table directly with limit
-        query = f"""
-        SELECT TOP {limit} id, name, source, probability, [key], encrypt_key
+        # Only the newest rows leave the server; the row limit is a parameter, not interpolated
+        query = """
+        SELECT TOP (?) name, source, probability
         FROM [dbo].[identified_names_team_epsilon]
         ORDER BY id DESC
         """
         
-        df = st.session_state.db_manager.execute_query(connection_id, query)
+        df = _cached_results_query(st.session_state.db_manager, query, (int(limit),))
         
-        if df.empty:
-            return []
-        
-        # Convert DataFrame to list of dictionaries
-        results = df.to_dict('records')
-        
-        return [{
-            'name': result.get('name'),
-            'source': result.get('source'),
-            'probability': result.get('probability')
-        } for result in results]
+        return df[['name', 'source', 'probability']] if not df.empty else df
     except Exception as e:
         st.error(f"Error getting recent records: {str(e)}")
-        return []
+        return pd.DataFrame()
+
+# Page routing table (insertion order is the navigation order)
+_PAGES = {
+    "Dashboard": show_dashboard,
+    "1. Connect to Database": show_connect_database,
+    "2. AI Discovery": show_ai_discovery,
+    "3. Encryption Preparation": show_encryption_preparation,
+    "4. Results Display": show_results_display,
+    "5. Check Results Table": show_check_results_table,
+    "6. Upload Regulations": show_upload_regulations
+}
 
 if __name__ == "__main__":
     main()
@@ -5,6 +5,7 @@ Test script for the enhanced AI Assistant with batch processing and compliance f
 
 import asyncio
 import logging
+from collections import Counter
 from ai_assistant import AIAssistant, TableRecommendation
 
 # Set up logging
@@ -114,16 +115,12 @@ def create_sample_tables():
     tables.extend(low_risk_tables)
     tables.extend(dbo_tables)
     
-    # Add many more tables to test batch processing
-    for i in range(50):
-        tables.append({
-            'table': f'TestTable{i}',
-            'schema': 'Test',
-            'columns': [
-                {'column': 'ID'}, {'column': 'Data'}, {'column': 'CreatedDate'}
-            ],
-            'row_count': 100
-        })
+    # Add many more tables to test batch processing (the analyzer only reads the column dicts)
+    test_columns = ({'column': 'ID'}, {'column': 'Data'}, {'column': 'CreatedDate'})
+    tables.extend(
+        {'table': f'TestTable{i}', 'schema': 'Test', 'columns': list(test_columns), 'row_count': 100}
+        for i in range(50)
+    )
     
     return tables
 
@@ -165,19 +162,17 @@ async def test_ai_assistant():
             print(f"    💭 Reasoning: {rec.reasoning.split('|')[0].strip()}{compliance_info}")
             print()
         
-        # Show statistics
-        high_priority = [r for r in recommendations if r.priority == 'HIGH']
-        medium_priority = [r for r in recommendations if r.priority == 'MEDIUM']
-        low_priority = [r for r in recommendations if r.priority == 'LOW']
+        # Show statistics (one pass over the recommendations)
+        priority_counts = Counter(r.priority for r in recommendations)
         
         print(f"📊 Priority Summary:")
-        print(f"   🔴 HIGH Priority: {len(high_priority)} tables")
-        print(f"   🟡 MEDIUM Priority: {len(medium_priority)} tables") 
-        print(f"   🟢 LOW Priority: {len(low_priority)} tables")
+        print(f"   🔴 HIGH Priority: {priority_counts['HIGH']} tables")
+        print(f"   🟡 MEDIUM Priority: {priority_counts['MEDIUM']} tables") 
+        print(f"   🟢 LOW Priority: {priority_counts['LOW']} tables")
         
         # Check for critical name tables
-        name_tables = [r for r in recommendations if any('NAME' in pii_type for pii_type in r.estimated_pii_types)]
-        print(f"   👤 Tables with Name Columns: {len(name_tables)} (requiring encryption)")
+        name_table_count = sum(1 for r in recommendations if any('NAME' in pii_type for pii_type in r.estimated_pii_types))
+        print(f"   👤 Tables with Name Columns: {name_table_count} (requiring encryption)")
         
     except Exception as e:
         print(f"❌ Error during analysis: {str(e)}")
@@ -199,16 +194,21 @@ async def test_pii_decision():
         ('PHONE', '555-***-****', {'table': 'Contact', 'column': 'Phone'})
     ]
     
-    for pii_type, sample, context in test_cases:
-        try:
-            decision = await assistant.suggest_pii_action(pii_type, sample, context)
-            print(f"📝 {pii_type}: {decision.action} (confidence: {decision.confidence:.2f})")
-            print(f"   💭 Reasoning: {decision.reasoning}")
-            if decision.encryption_key_hint:
-                print(f"   🔐 Key hint: {decision.encryption_key_hint}")
-            print()
-        except Exception as e:
-            print(f"❌ Error testing {pii_type}: {str(e)}")
+    # The cases are independent API calls, so run them concurrently
+    decisions = await asyncio.gather(
+        *(assistant.suggest_pii_action(pii_type, sample, context) for pii_type, sample, context in test_cases),
+        return_exceptions=True
+    )
+    
+    for (pii_type, sample, context), decision in zip(test_cases, decisions):
+        if isinstance(decision, Exception):
+            print(f"❌ Error testing {pii_type}: {str(decision)}")
+            continue
+        print(f"📝 {pii_type}: {decision.action} (confidence: {decision.confidence:.2f})")
+        print(f"   💭 Reasoning: {decision.reasoning}")
+        if decision.encryption_key_hint:
+            print(f"   🔐 Key hint: {decision.encryption_key_hint}")
+        print()
 
 if __name__ == "__main__":
     # Run the tests
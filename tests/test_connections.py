@@ -3,115 +3,159 @@ Database Connection Test Script
 Tests connections to all configured databases with fallback options
 """
 
-from real_database_manager import RealDatabaseManager
-from vscode_sql_manager import VSCodeSQLManager
-from database_manager import DatabaseManager
 from config import DATABASE_PROFILES
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cache
+from typing import List
+import importlib
+import importlib.util
+import io
 import logging
+import sys
+
+@dataclass
+class DBTestResult:
+    """Outcome of testing one database profile with one manager"""
+    db: str
+    status: str
+    tables: int = 0
+    schemas: int = 0
+    error: str = ''
+    details: List[str] = field(default_factory=list)
+
+def _test_one_db(db_manager, db_name) -> DBTestResult:
+    """Connect to one profile, list and sample its tables, and disconnect.
+    Progress lines are collected on the result rather than printed, so concurrent runs don't interleave."""
+    lines = []
+    
+    try:
+        schema_info = None
+        
+        # Test connection
+        connection_id = db_manager.connect_to_database(db_name)
+        lines.append(f"    ✅ Connected successfully")
+        
+        # Test getting tables
+        tables = db_manager.get_tables(connection_id)
+        lines.append(f"    📋 Found {len(tables)} tables")
+        
+        # Test getting schema info if available
+        try:
+            schema_info = db_manager.get_database_schema_info(connection_id)
+            if schema_info:
+                lines.append(f"    🏗️ Schemas: {schema_info.get('total_schemas', 0)}")
+                lines.append(f"    📊 Total tables: {schema_info.get('total_tables', 0)}")
+        except AttributeError:
+            lines.append(f"    ℹ️ Schema info not available for this connection type")
+        
+        # Test a few tables for column information
+        if tables:
+            sample_tables = tables[:2]  # Test first 2 tables
+            if hasattr(db_manager, 'get_multiple_table_columns'):
+                # One metadata round-trip for all sampled tables
+                try:
+                    columns_by_table = db_manager.get_multiple_table_columns(connection_id, sample_tables)
+                    for table_key, columns in columns_by_table.items():
+                        lines.append(f"      • {table_key}: {len(columns)} columns")
+                except Exception as e:
+                    lines.append(f"      ⚠️ Could not get columns: {str(e)}")
+            else:
+                for table in sample_tables:
+                    try:
+                        columns = db_manager.get_table_columns(
+                            connection_id, table['schema'], table['table']
+                        )
+                        lines.append(f"      • {table['schema']}.{table['table']}: {len(columns)} columns")
+                    except Exception as e:
+                        lines.append(f"      ⚠️ Could not get columns for {table['schema']}.{table['table']}: {str(e)}")
+        
+        # Test sample data
+        if tables:
+            try:
+                first_table = tables[0]
+                sample_data = db_manager.sample_table_data(
+                    connection_id, first_table['schema'], first_table['table'], 5
+                )
+                lines.append(f"      📄 Sample data: {len(sample_data)} rows, {len(sample_data.columns)} columns")
+            except Exception as e:
+                lines.append(f"      ⚠️ Could not get sample data: {str(e)}")
+        
+        # Disconnect
+        db_manager.disconnect(connection_id)
+        lines.append(f"    🔌 Disconnected")
+        
+        return DBTestResult(
+            db=db_name,
+            status='SUCCESS',
+            tables=len(tables),
+            schemas=schema_info.get('total_schemas', 0) if isinstance(schema_info, dict) else 0,
+            details=lines
+        )
+    
+    except Exception as e:
+        lines.append(f"    ❌ Connection failed: {str(e)}")
+        return DBTestResult(db=db_name, status='FAILED', error=str(e), details=lines)
 
 def test_database_connections():
     """Test database connections with multiple connection types"""
     print("🔗 Testing Database Connections")
     print("=" * 40)
     
-    # Test different connection types
+    # Test different connection types; each manager module is imported only when its turn comes,
+    # so a missing driver fails that manager alone rather than the whole script
     managers_to_test = [
-        ("ODBC Direct Connection", RealDatabaseManager),
-        ("VS Code SQL Extension", VSCodeSQLManager),  
-        ("Demo Mode", DatabaseManager)
+        ("ODBC Direct Connection", "real_database_manager", "RealDatabaseManager"),
+        ("VS Code SQL Extension", "vscode_sql_manager", "VSCodeSQLManager"),
+        ("Demo Mode", "database_manager", "DatabaseManager")
     ]
     
     successful_manager = None
     
-    for manager_name, manager_class in managers_to_test:
+    for manager_name, module_name, class_name in managers_to_test:
         print(f"\n🧪 Testing {manager_name}...")
         
         try:
+            manager_class = getattr(importlib.import_module(module_name), class_name)
             db_manager = manager_class()
-            results = {}
             
-            for db_name in DATABASE_PROFILES.keys():
-                print(f"  📊 Testing {db_name}...")
-                
-                try:
-                    # Test connection
-                    connection_id = db_manager.connect_to_database(db_name)
-                    print(f"    ✅ Connected successfully")
-                    
-                    # Test getting tables
-                    tables = db_manager.get_tables(connection_id)
-                    print(f"    📋 Found {len(tables)} tables")
-                    
-                    # Test getting schema info if available
-                    try:
-                        schema_info = db_manager.get_database_schema_info(connection_id)
-                        if schema_info:
-                            print(f"    🏗️ Schemas: {schema_info.get('total_schemas', 0)}")
-                            print(f"    📊 Total tables: {schema_info.get('total_tables', 0)}")
-                    except AttributeError:
-                        print(f"    ℹ️ Schema info not available for this connection type")
-                    
-                    # Test a few tables for column information
-                    if tables:
-                        sample_tables = tables[:2]  # Test first 2 tables
-                        for table in sample_tables:
-                            try:
-                                columns = db_manager.get_table_columns(
-                                    connection_id, table['schema'], table['table']
-                                )
-                                print(f"      • {table['schema']}.{table['table']}: {len(columns)} columns")
-                            except Exception as e:
-                                print(f"      ⚠️ Could not get columns for {table['schema']}.{table['table']}: {str(e)}")
-                    
-                    # Test sample data
-                    if tables:
-                        try:
-                            first_table = tables[0]
-                            sample_data = db_manager.sample_table_data(
-                                connection_id, first_table['schema'], first_table['table'], 5
-                            )
-                            print(f"      📄 Sample data: {len(sample_data)} rows, {len(sample_data.columns)} columns")
-                        except Exception as e:
-                            print(f"      ⚠️ Could not get sample data: {str(e)}")
-                    
-                    # Disconnect
-                    db_manager.disconnect(connection_id)
-                    print(f"    🔌 Disconnected")
-                    
-                    results[db_name] = {
-                        'status': 'SUCCESS',
-                        'tables': len(tables),
-                        'schemas': schema_info.get('total_schemas', 0) if isinstance(schema_info, dict) else 0
-                    }
-                    
-                except Exception as e:
-                    print(f"    ❌ Connection failed: {str(e)}")
-                    results[db_name] = {
-                        'status': 'FAILED',
-                        'error': str(e)
-                    }
+            # Profiles are independent, so test them concurrently (map keeps profile order)
+            with ThreadPoolExecutor(max_workers=min(8, len(DATABASE_PROFILES)) or 1) as executor:
+                results = {
+                    result.db: result
+                    for result in executor.map(lambda name: _test_one_db(db_manager, name), DATABASE_PROFILES)
+                }
+            
+            # Render the per-profile details and the summary as one report
+            report = io.StringIO()
+            for result in results.values():
+                print(f"  📊 Testing {result.db}...", file=report)
+                for line in result.details:
+                    print(line, file=report)
             
             # Summary for this manager
-            successful = [db for db, result in results.items() if result['status'] == 'SUCCESS']
-            failed = [db for db, result in results.items() if result['status'] == 'FAILED']
+            successful = [result for result in results.values() if result.status == 'SUCCESS']
+            failed = [result for result in results.values() if result.status == 'FAILED']
             
-            print(f"\n  📈 {manager_name} Summary:")
-            print(f"  ✅ Successful: {len(successful)}/{len(results)}")
+            print(f"\n  📈 {manager_name} Summary:", file=report)
+            print(f"  ✅ Successful: {len(successful)}/{len(results)}", file=report)
             
             if len(successful) == len(results):
-                print(f"  🎉 All connections successful with {manager_name}!")
+                print(f"  🎉 All connections successful with {manager_name}!", file=report)
+                sys.stdout.write(report.getvalue())
                 successful_manager = manager_name
                 return results, successful_manager
             elif successful:
-                print(f"  ⚠️ Partial success with {manager_name}")
-                for db in successful:
-                    result = results[db]
-                    print(f"    • {db}: {result['tables']} tables, {result['schemas']} schemas")
+                print(f"  ⚠️ Partial success with {manager_name}", file=report)
+                for result in successful:
+                    print(f"    • {result.db}: {result.tables} tables, {result.schemas} schemas", file=report)
                 
-                for db in failed:
-                    print(f"    ❌ {db}: {results[db]['error']}")
+                for result in failed:
+                    print(f"    ❌ {result.db}: {result.error}", file=report)
             else:
-                print(f"  ❌ No successful connections with {manager_name}")
+                print(f"  ❌ No successful connections with {manager_name}", file=report)
+            
+            sys.stdout.write(report.getvalue())
                 
         except Exception as e:
             print(f"  💥 {manager_name} initialization failed: {str(e)}")
@@ -119,39 +163,42 @@ def test_database_connections():
     
     return {}, None
 
+@cache
+def _sqlserver_drivers():
+    """SQL Server ODBC drivers known to the driver manager (enumerated once per process)"""
+    import pyodbc
+    return [d for d in pyodbc.drivers() if 'SQL Server' in d]
+
 def check_system_requirements():
     """Check system requirements for database connections"""
     print("\n🔍 System Requirements Check")
     print("-" * 30)
     
-    # Check pyodbc
+    # Check pyodbc (imported for real, since listing drivers needs the module)
     try:
-        import pyodbc
-        drivers = [d for d in pyodbc.drivers() if 'SQL Server' in d]
-        print("✅ pyodbc installed")
-        if drivers:
-            print(f"✅ SQL Server drivers found: {len(drivers)}")
-            for driver in drivers:
-                print(f"   • {driver}")
+        drivers = _sqlserver_drivers() if importlib.util.find_spec("pyodbc") is not None else None
+    except ImportError as e:
+        # pyodbc is installed but its ODBC driver manager library could not be loaded
+        print(f"❌ pyodbc could not be loaded: {e}")
+    else:
+        if drivers is None:
+            print("❌ pyodbc not installed")
         else:
-            print("⚠️ No SQL Server ODBC drivers found")
-            print("   Install Microsoft ODBC Driver for SQL Server")
-    except ImportError:
-        print("❌ pyodbc not installed")
-    
-    # Check pandas
-    try:
-        import pandas
-        print("✅ pandas installed")
-    except ImportError:
-        print("❌ pandas not installed")
+            print("✅ pyodbc installed")
+            if drivers:
+                print(f"✅ SQL Server drivers found: {len(drivers)}")
+                for driver in drivers:
+                    print(f"   • {driver}")
+            else:
+                print("⚠️ No SQL Server ODBC drivers found")
+                print("   Install Microsoft ODBC Driver for SQL Server")
     
-    # Check other requirements
-    try:
-        import streamlit
-        print("✅ streamlit installed")
-    except ImportError:
-        print("❌ streamlit not installed")
+    # Check pandas and streamlit by locating them, without importing
+    for package in ("pandas", "streamlit"):
+        if importlib.util.find_spec(package) is not None:
+            print(f"✅ {package} installed")
+        else:
+            print(f"❌ {package} not installed")
 
 if __name__ == "__main__":
     try:
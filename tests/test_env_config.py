@@ -4,6 +4,63 @@ Environment Configuration Test
 Tests that .env file is being loaded correctly across all modules
 """
 
+import importlib
+import importlib.util
+import sys
+
+# Configuration dump printed by test_env_config ({cfg} is env_config, {db}/{scan} its config dicts)
+_CONFIG_REPORT = """\
+🤖 AI Configuration:
+   API Key Configured: {api_key_configured}
+   Model: {cfg.ai_model_name}
+   Max Tokens: {cfg.ai_max_tokens}
+   Temperature: {cfg.ai_temperature}
+   AI Enabled: {ai_enabled}
+
+🗄️ Database Configuration:
+   Connection Mode: {cfg.connection_mode}
+   Server: {db[server]}
+   Username: {db[username]}
+   Port: {db[port]}
+   Default Database: {db[database]}
+
+🔍 Scanning Configuration:
+   Sample Size: {scan[sample_size]}
+   Max Rows: {scan[max_rows]}
+   Confidence Threshold: {scan[confidence_threshold]}
+   Max Concurrent: {scan[max_concurrent]}
+
+🔐 Encryption Configuration:
+   Master Key File: {cfg.master_key_file}
+   Iterations: {cfg.key_derivation_iterations}
+   Encryption Enabled: {cfg.enable_encryption}
+   Data Masking Enabled: {cfg.enable_data_masking}
+
+💾 Results Configuration:
+   Database Path: {cfg.results_db_path}
+   Auto Backup: {cfg.auto_backup}
+   Retention Days: {cfg.backup_retention_days}
+
+🌐 Streamlit Configuration:
+   Host: {cfg.streamlit_host}
+   Port: {cfg.streamlit_port}
+   Page Title: {cfg.page_title}
+   Page Icon: {cfg.page_icon}
+   Layout: {cfg.layout}
+
+⚖️ Compliance Configuration:
+   GDPR Enabled: {cfg.enable_gdpr_compliance}
+   CCPA Enabled: {cfg.enable_ccpa_compliance}
+   HIPAA Enabled: {cfg.enable_hipaa_compliance}
+   Data Retention: {cfg.data_retention_period} days
+
+🔧 Development Configuration:
+   Debug Mode: {cfg.debug_mode}
+   Cache Results: {cfg.cache_results}
+   Mock AI: {cfg.mock_ai_responses}
+
+"""
+
 def test_env_config():
     """Test environment configuration loading"""
     print("🧪 Testing Environment Configuration")
@@ -15,72 +72,14 @@ def test_env_config():
         print("✅ Environment configuration module loaded successfully")
         print()
         
-        # Test AI configuration
-        print("🤖 AI Configuration:")
-        print(f"   API Key Configured: {'Yes' if env_config.anthropic_api_key else 'No'}")
-        print(f"   Model: {env_config.ai_model_name}")
-        print(f"   Max Tokens: {env_config.ai_max_tokens}")
-        print(f"   Temperature: {env_config.ai_temperature}")
-        print(f"   AI Enabled: {is_ai_enabled()}")
-        print()
-        
-        # Test database configuration
-        print("🗄️ Database Configuration:")
-        db_config = get_db_config()
-        print(f"   Connection Mode: {env_config.connection_mode}")
-        print(f"   Server: {db_config['server']}")
-        print(f"   Username: {db_config['username']}")
-        print(f"   Port: {db_config['port']}")
-        print(f"   Default Database: {db_config['database']}")
-        print()
-        
-        # Test scanning configuration
-        print("🔍 Scanning Configuration:")
-        scan_config = get_scan_config()
-        print(f"   Sample Size: {scan_config['sample_size']}")
-        print(f"   Max Rows: {scan_config['max_rows']}")
-        print(f"   Confidence Threshold: {scan_config['confidence_threshold']}")
-        print(f"   Max Concurrent: {scan_config['max_concurrent']}")
-        print()
-        
-        # Test encryption configuration
-        print("🔐 Encryption Configuration:")
-        print(f"   Master Key File: {env_config.master_key_file}")
-        print(f"   Iterations: {env_config.key_derivation_iterations}")
-        print(f"   Encryption Enabled: {env_config.enable_encryption}")
-        print(f"   Data Masking Enabled: {env_config.enable_data_masking}")
-        print()
-        
-        # Test results configuration
-        print("💾 Results Configuration:")
-        print(f"   Database Path: {env_config.results_db_path}")
-        print(f"   Auto Backup: {env_config.auto_backup}")
-        print(f"   Retention Days: {env_config.backup_retention_days}")
-        print()
-        
-        # Test Streamlit configuration
-        print("🌐 Streamlit Configuration:")
-        print(f"   Host: {env_config.streamlit_host}")
-        print(f"   Port: {env_config.streamlit_port}")
-        print(f"   Page Title: {env_config.page_title}")
-        print(f"   Page Icon: {env_config.page_icon}")
-        print(f"   Layout: {env_config.layout}")
-        print()
-        
-        # Test compliance configuration
-        print("⚖️ Compliance Configuration:")
-        print(f"   GDPR Enabled: {env_config.enable_gdpr_compliance}")
-        print(f"   CCPA Enabled: {env_config.enable_ccpa_compliance}")
-        print(f"   HIPAA Enabled: {env_config.enable_hipaa_compliance}")
-        print(f"   Data Retention: {env_config.data_retention_period} days")
-        print()
-        
-        # Test development configuration
-        print("🔧 Development Configuration:")
-        print(f"   Debug Mode: {env_config.debug_mode}")
-        print(f"   Cache Results: {env_config.cache_results}")
-        print(f"   Mock AI: {env_config.mock_ai_responses}")
-        print()
+        # One template for the whole dump: the values are read by format() and written in one go
+        sys.stdout.write(_CONFIG_REPORT.format(
+            cfg=env_config,
+            db=get_db_config(),
+            scan=get_scan_config(),
+            api_key_configured='Yes' if env_config.anthropic_api_key else 'No',
+            ai_enabled=is_ai_enabled()
+        ))
         
         print("✅ All environment configuration tests passed!")
         return True
@@ -95,29 +94,23 @@ def test_module_integration():
     print("=" * 50)
     
     try:
-        # Test AI Assistant
-        print("🤖 Testing AI Assistant integration...")
-        from ai_assistant import AIAssistant
-        ai_assistant = AIAssistant()
-        print(f"   ✅ AI Assistant initialized with env config")
-        
-        # Test Encryption Manager
-        print("🔐 Testing Encryption Manager integration...")
-        from encryption_manager import EncryptionManager
-        encryption_manager = EncryptionManager()
-        print(f"   ✅ Encryption Manager initialized with env config")
-        
-        # Test Results Manager
-        print("💾 Testing Results Manager integration...")
-        from results_manager import ResultsManager
-        results_manager = ResultsManager()
-        print(f"   ✅ Results Manager initialized with env config")
-        
-        # Test Multi-Database Manager
-        print("🗄️ Testing Multi-Database Manager integration...")
-        from multi_database_manager import MultiDatabaseManager
-        multi_db_manager = MultiDatabaseManager()
-        print(f"   ✅ Multi-Database Manager initialized with env config")
+        # Skip a module only when its optional third-party dependency is missing (checked
+        # without importing it); a missing project module still fails the import below
+        integrations = [
+            ("🤖", "AI Assistant", "ai_assistant", "AIAssistant", "anthropic"),
+            ("🔐", "Encryption Manager", "encryption_manager", "EncryptionManager", "cryptography"),
+            ("💾", "Results Manager", "results_manager", "ResultsManager", None),
+            ("🗄️", "Multi-Database Manager", "multi_database_manager", "MultiDatabaseManager", "pyodbc"),
+        ]
+        
+        for icon, label, module_name, class_name, dependency in integrations:
+            print(f"{icon} Testing {label} integration...")
+            if dependency and importlib.util.find_spec(dependency) is None:
+                print(f"   ⏭️ {dependency} not installed, skipping")
+                continue
+            manager_class = getattr(importlib.import_module(module_name), class_name)
+            manager_class()
+            print(f"   ✅ {label} initialized with env config")
         
         print("\n✅ All module integration tests passed!")
         return True
@@ -1,23 +1,39 @@
 from openai import OpenAI
+from functools import cache
 import os
 
 openai_api = os.getenv('open_ai_api')
 model = "gpt-4o-mini"
 
 data_dir = "../data"
-regulations_dir = [os.path.join(data_dir, entry) for entry in os.listdir(data_dir)if os.path.isdir(os.path.join(data_dir, entry))]
 regulations_file = "../data/regulation.json"
 
+@cache
+def regulations_dirs():
+    # Listed on first use rather than at import; scandir entries know their type without an extra stat
+    return [entry.path for entry in os.scandir(data_dir) if entry.is_dir()]
+
 def make_prompt(system_message, user_message):
     return [
         {"role": "system", "content": system_message},
         {"role": "user", "content": user_message}
     ]
 
+_client = None
+
+def _get_client():
+    # One client per process, so its HTTP connection pool is reused across calls
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=openai_api)
+    return _client
+
 def ask_ai(prompt, standard_output=None):
-    client = OpenAI(api_key=openai_api)
+    client = _get_client()
     if standard_output:
-        completion = client.chat.completions.create(model=model,messages=prompt,temperature=0, response_format={'type': 'list'})
-    completion = client.chat.completions.create(model=model,messages=prompt,temperature=0)
+        # JSON mode; the prompt itself must ask for JSON
+        completion = client.chat.completions.create(model=model,messages=prompt,temperature=0, response_format={'type': 'json_object'})
+    else:
+        completion = client.chat.completions.create(model=model,messages=prompt,temperature=0)
     result = completion.choices[0].message.content
     return result